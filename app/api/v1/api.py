@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, registration, accounts, clients, embargos, movimientos
+from app.api.v1.endpoints import auth, users, registration, accounts, clients, embargos, movimientos, admin, catalogos
 from app.api.v1.endpoints.transferencias import router as transferencias_router
 
 api_router = APIRouter()
@@ -10,4 +10,6 @@ api_router.include_router(clients.router, prefix="/clients", tags=["Clientes"])
 api_router.include_router(accounts.router, prefix="/account", tags=["Cuentas"])
 api_router.include_router(transferencias_router, prefix="/transferencias", tags=["Transferencias"])
 api_router.include_router(embargos.router, prefix="/embargos", tags=["Embargos"])
-api_router.include_router(movimientos.router, prefix="/movements", tags=["Movimientos"])
\ No newline at end of file
+api_router.include_router(movimientos.router, prefix="/movements", tags=["Movimientos"])
+api_router.include_router(catalogos.router, prefix="/catalogos", tags=["Catálogos"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
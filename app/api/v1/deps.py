@@ -1,22 +1,52 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, Optional, Union
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlmodel import Session
-from app.core.config import SECRET_KEY, ALGORITHM
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import SECRET_KEY, ALGORITHM, DB_ASYNC
+from app.db.session import (
+    get_session, get_async_session, get_db_session, get_read_session, get_async_read_session, run_service
+)
 from app.models.user import Usuario
 from app.schemas.token import TokenData
 from app.models.user import Usuario # CAMBIAR User por Usuario
-from sqlmodel import select
+from app.services.user_cache import obtener_usuario_cacheado, cargar_usuario
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+# Sesión según el modo configurado (DB_ASYNC); usar con los servicios *_async
+DbSessionDep = Annotated[Union[Session, AsyncSession], Depends(get_db_session)]
 TokenDep = Annotated[str, Depends(oauth2_scheme)]
+# "X-Read-Your-Writes: true" lleva las lecturas al primario: para quien
+# acaba de escribir y no puede esperar el retraso de la réplica
+ReadYourWritesDep = Annotated[Optional[str], Header(alias="X-Read-Your-Writes", max_length=5)]
 
-def get_current_user(
-    session: SessionDep,
+
+def _leer_del_primario(valor: Optional[str]) -> bool:
+    return valor is not None and valor.lower() in ("1", "true", "yes")
+
+
+def _get_read_session(read_your_writes: ReadYourWritesDep = None):
+    yield from get_read_session(primario=_leer_del_primario(read_your_writes))
+
+
+async def _get_async_read_session(read_your_writes: ReadYourWritesDep = None):
+    async for session in get_async_read_session(primario=_leer_del_primario(read_your_writes)):
+        yield session
+
+
+# Listados e informes: réplica de lectura (o primario), transacción de solo lectura
+get_db_read_session = _get_async_read_session if DB_ASYNC else _get_read_session
+ReadSessionDep = Annotated[Union[Session, AsyncSession], Depends(get_db_read_session)]
+# Cabecera opcional de los endpoints que mueven dinero (ver app/api/v1/idempotencia.py)
+IdempotencyKeyDep = Annotated[Optional[str], Header(alias="Idempotency-Key", max_length=100)]
+
+
+async def get_current_user(
+    session: DbSessionDep,
     token: TokenDep
 ) -> Usuario:
     credentials_exception = HTTPException(
@@ -34,10 +64,41 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    # Buscar en la base de datos por el campo Usuario
-    user = session.exec(select(Usuario).where(Usuario.Usuario == token_data.username)).first()
+    # Buscar primero en la caché; solo si no está se consulta t_usuario
+    user = obtener_usuario_cacheado(token_data.username)
+    if user is None:
+        user = await run_service(session, cargar_usuario, token_data.username)
     if user is None:
         raise credentials_exception
+
+    if user.Estado == "I":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="El usuario está inactivo. Contacte al administrador.",
+        )
     return user
 
-CurrentUser = Annotated[Usuario, Depends(get_current_user)]
\ No newline at end of file
+CurrentUser = Annotated[Usuario, Depends(get_current_user)]
+
+
+async def get_current_admin(current_user: CurrentUser) -> Usuario:
+    if current_user.Rol != "A":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operación reservada a administradores.",
+        )
+    return current_user
+
+AdminUser = Annotated[Usuario, Depends(get_current_admin)]
+
+
+async def get_current_staff(current_user: CurrentUser) -> Usuario:
+    """Administradores y empleados (ventanilla)."""
+    if current_user.Rol not in ("A", "E"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operación reservada al personal del banco.",
+        )
+    return current_user
+
+StaffUser = Annotated[Usuario, Depends(get_current_staff)]
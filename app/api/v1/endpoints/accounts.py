@@ -6,81 +6,117 @@ from typing import Optional, List
 
 
 # Importaciones de dependencias (asume que existen)
-from app.api.v1.deps import SessionDep 
+from app.api.v1.deps import CurrentUser, DbSessionDep, IdempotencyKeyDep, ReadSessionDep
+from app.models.user import Usuario
+from app.api.v1.idempotencia import ejecutar_idempotente
 from app.schemas.account import CuentaCreationData, CuentaDetailsDTO, CuentaEstadoUpdate 
 from app.schemas.transaction import DepositoRequest, RetiroRequest, TransaccionDetailsDTO
 from app.services import account_service 
 from app.schemas.util import APIResponse 
+from app.core.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.core.pagination import CursorInvalido
+from app.core.responses import respuesta_lista
 router = APIRouter()                     
 
+
+async def _verificar_titular(session, user: Usuario, nro_cta: str, codigo: str) -> None:
+    """El personal (A, E) opera cualquier cuenta; un cliente, solo las suyas."""
+    if user.Rol in ("A", "E"):
+        return
+    if not await account_service.es_titular_cuenta_async(session, nro_cta, user.CodUsu):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=APIResponse(
+                mensaje="La cuenta no pertenece al usuario.",
+                codigo=codigo,
+                status_code=status.HTTP_403_FORBIDDEN
+            ).model_dump()
+        )
+
+
 @router.post(
     "/deposito",
     response_model=APIResponse,
     status_code=status.HTTP_200_OK,
     summary="Realiza un depósito de dinero con validación de monto y embargo."
 )
-def depositar_dinero(
+async def depositar_dinero(
     *,
-    session: SessionDep,
-    datos_deposito: DepositoRequest
+    session: DbSessionDep,
+    user: CurrentUser,
+    datos_deposito: DepositoRequest,
+    idempotency_key: IdempotencyKeyDep = None
 ):
-    try:
-        limite = 2000.00
+    """
+    Con Idempotency-Key, un reintento con la misma clave devuelve la
+    respuesta guardada sin volver a depositar. El personal (A, E) deposita
+    en cualquier cuenta; un cliente, solo en las suyas.
+    """
+    await _verificar_titular(session, user, datos_deposito.Cuenta, "DEP-403")
+
+    async def operacion():
+        try:
+            limite = 2000.00
         
-        # --- 1. Lógica CRÍTICA de Autorización (VERIFICADA) ---
-        if datos_deposito.Monto > limite and datos_deposito.Moneda == "PEN":
-            if not datos_deposito.Autorizacion:
+            # --- 1. Lógica CRÍTICA de Autorización (VERIFICADA) ---
+            if (datos_deposito.Monto > limite
+                    and account_service.normalizar_moneda(datos_deposito.Moneda) == account_service.MONEDA_SOLES):
+                if not datos_deposito.Autorizacion:
+                    raise HTTPException(
+                        status_code=status.HTTP_403_FORBIDDEN, 
+                        detail=APIResponse(
+                            mensaje=f"Depósito de S/{datos_deposito.Monto} excede el límite. Se requiere autorización.",
+                            codigo="AUTH-REQ",
+                            status_code=status.HTTP_403_FORBIDDEN
+                        ).model_dump()
+                    )
+        
+            # --- 2. LLAMADA AL SERVICIO CORREGIDA ---
+            try:
+                resultado_sp = await account_service.registrar_deposito_async(
+                    session=session, datos=datos_deposito, cod_usu=user.CodUsu
+                )
+            except ValueError as ve:
+                # Manejo de Errores de Negocio devueltos por el Servicio/SP
+                error_message = str(ve)
                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN, 
+                    status_code=status.HTTP_400_BAD_REQUEST,
                     detail=APIResponse(
-                        mensaje=f"Depósito de S/{datos_deposito.Monto} excede el límite. Se requiere autorización.",
-                        codigo="AUTH-REQ",
-                        status_code=status.HTTP_403_FORBIDDEN
+                        mensaje=error_message,
+                        codigo="DEP-400",
+                        status_code=status.HTTP_400_BAD_REQUEST
                     ).model_dump()
                 )
-        
-        # --- 2. LLAMADA AL SERVICIO CORREGIDA ---
-        try:
-            # CORRECCIÓN: Usar account_service.insertar_deposito_sp
-            resultado_sp = account_service.insertar_deposito_sp( 
-                session=session, datos=datos_deposito
+            
+            # 3. Respuesta de Éxito (Usando los datos REALES del SP)
+            return APIResponse(
+                mensaje=resultado_sp["MensajeSP"],
+                codigo=resultado_sp["NroTransaccion"],
+                status_code=status.HTTP_200_OK,
+                result=[{
+                    "NuevoSaldoDisponible": resultado_sp["NuevoSaldoDisponible"],
+                    "NuevoSaldoEmbargado": resultado_sp["NuevoSaldoEmbargado"]
+                }]
             )
-        except ValueError as ve:
-            # Manejo de Errores de Negocio devueltos por el Servicio/SP
-            error_message = str(ve)
+    
+        except HTTPException as h_e:
+            raise h_e 
+        
+        except Exception as e:
+            import traceback; traceback.print_exc() 
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=APIResponse(
-                    mensaje=error_message,
-                    codigo="DEP-400",
-                    status_code=status.HTTP_400_BAD_REQUEST
+                    mensaje="Ocurrió un error interno del servidor durante el depósito.",
+                    codigo="SYS-500",
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
                 ).model_dump()
             )
-            
-        # 3. Respuesta de Éxito (Usando los datos REALES del SP)
-        return APIResponse(
-            mensaje=resultado_sp["MensajeSP"],
-            codigo=resultado_sp["NroTransaccion"],
-            status_code=status.HTTP_200_OK,
-            result={
-                "NuevoSaldoDisponible": resultado_sp["NuevoSaldoDisponible"],
-                "NuevoSaldoEmbargado": resultado_sp["NuevoSaldoEmbargado"]
-            }
-        )
-    
-    except HTTPException as h_e:
-        raise h_e 
-        
-    except Exception as e:
-        import traceback; traceback.print_exc() 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=APIResponse(
-                mensaje="Ocurrió un error interno del servidor durante el depósito.",
-                codigo="SYS-500",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-            ).model_dump()
-        )
+
+    return await ejecutar_idempotente(
+        session, "deposito", user.CodUsu, idempotency_key, datos_deposito, operacion
+    )
+
 
 @router.post(
     "/retiro",
@@ -88,70 +124,84 @@ def depositar_dinero(
     status_code=status.HTTP_200_OK,
     summary="Realiza un retiro de dinero con validaciones de embargo, sobregiro y saldo."
 )
-def retirar_dinero(
+async def retirar_dinero(
     *,
-    session: SessionDep,
-    datos_retiro: RetiroRequest
+    session: DbSessionDep,
+    user: CurrentUser,
+    datos_retiro: RetiroRequest,
+    idempotency_key: IdempotencyKeyDep = None
 ):
-    try:
-        # 1. LLAMADA AL SERVICIO CORREGIDA
+    """
+    Con Idempotency-Key, un reintento con la misma clave devuelve la
+    respuesta guardada sin volver a retirar. El personal (A, E) retira de
+    cualquier cuenta; un cliente, solo de las suyas.
+    """
+    await _verificar_titular(session, user, datos_retiro.Cuenta, "RET-403")
+
+    async def operacion():
         try:
-            # CORRECCIÓN: Usar account_service.insertar_retiro_sp
-            resultado_sp = account_service.insertar_retiro_sp( 
-                session=session, datos=datos_retiro
-            )
-        except ValueError as ve:
-            # --- CORRECCIÓN DE ERROR 500: Lanza HTTPException aquí ---
-            error_message = str(ve)
+            # 1. LLAMADA AL SERVICIO CORREGIDA
+            try:
+                resultado_sp = await account_service.registrar_retiro_async(
+                    session=session, datos=datos_retiro, cod_usu=user.CodUsu
+                )
+            except ValueError as ve:
+                # --- CORRECCIÓN DE ERROR 500: Lanza HTTPException aquí ---
+                error_message = str(ve)
             
-            # Patrón para devolver 403 (Embargo/Plazo) o 400 (Saldo Insuficiente)
-            if "embargo" in error_message.lower() or "plazo" in error_message.lower():
-                error_code = status.HTTP_403_FORBIDDEN # Para errores que prohíben la acción
-            else:
-                error_code = status.HTTP_400_BAD_REQUEST # Para errores de datos o insuficiencia
+                # Patrón para devolver 403 (Embargo/Plazo) o 400 (Saldo Insuficiente)
+                if "embargo" in error_message.lower() or "plazo" in error_message.lower():
+                    error_code = status.HTTP_403_FORBIDDEN # Para errores que prohíben la acción
+                else:
+                    error_code = status.HTTP_400_BAD_REQUEST # Para errores de datos o insuficiencia
 
+                raise HTTPException(
+                    status_code=error_code,
+                    detail=APIResponse(
+                        mensaje=error_message,
+                        codigo="RET-FAIL",
+                        status_code=error_code
+                    ).model_dump()
+                )
+            
+            # 2. Respuesta de Éxito
+            return APIResponse(
+                mensaje=resultado_sp["MensajeSP"],
+                codigo=resultado_sp["NroTransaccion"],
+                status_code=status.HTTP_200_OK,
+                result=[{
+                    "NuevoSaldoDisponible": resultado_sp["NuevoSaldoDisponible"],
+                    "NuevoSaldoEmbargado": resultado_sp["NuevoSaldoEmbargado"]
+                }]
+            )
+    
+        except HTTPException as h_e:
+            raise h_e # Propaga los errores 403/400 que acabamos de lanzar
+        
+        except Exception as e:
+            import traceback; traceback.print_exc() 
             raise HTTPException(
-                status_code=error_code,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=APIResponse(
-                    mensaje=error_message,
-                    codigo="RET-FAIL",
-                    status_code=error_code
+                    mensaje="Ocurrió un error interno del servidor durante el retiro.",
+                    codigo="SYS-500",
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
                 ).model_dump()
             )
-            
-        # 2. Respuesta de Éxito
-        return APIResponse(
-            mensaje=resultado_sp["MensajeSP"],
-            codigo=resultado_sp["NroTransaccion"],
-            status_code=status.HTTP_200_OK,
-            result={
-                "NuevoSaldoDisponible": resultado_sp["NuevoSaldoDisponible"],
-                "NuevoSaldoEmbargado": resultado_sp["NuevoSaldoEmbargado"]
-            }
-        )
-    
-    except HTTPException as h_e:
-        raise h_e # Propaga los errores 403/400 que acabamos de lanzar
-        
-    except Exception as e:
-        import traceback; traceback.print_exc() 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=APIResponse(
-                mensaje="Ocurrió un error interno del servidor durante el retiro.",
-                codigo="SYS-500",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-            ).model_dump()
-        )
+
+    return await ejecutar_idempotente(
+        session, "retiro", user.CodUsu, idempotency_key, datos_retiro, operacion
+    )
+
 
 @router.post(
     "/crearCuentasBancarias",
     response_model=APIResponse,  # Indica el esquema de respuesta estándar
     status_code=status.HTTP_201_CREATED
 ) 
-def crear_nueva_cuenta(
+async def crear_nueva_cuenta(
     *,
-    session: SessionDep,
+    session: DbSessionDep,
     datos_cuenta: CuentaCreationData
 ):
     """
@@ -160,7 +210,7 @@ def crear_nueva_cuenta(
     """
     try:
         # 1. Llamada al servicio
-        resultado_sp = account_service.insertar_nueva_cuenta_sp(
+        resultado_sp = await account_service.insertar_nueva_cuenta_sp_async(
             session=session, datos=datos_cuenta
         )
         
@@ -207,30 +257,65 @@ def crear_nueva_cuenta(
     status_code=status.HTTP_200_OK,
     summary="Lista las cuentas bancarias por usuario o todas (Administrador)."
 )
-def listar_cuentas(
+async def listar_cuentas(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     # Recibe el código de usuario como parámetro de consulta (query parameter) opcional
     cod_usu: Optional[str]=Query(
         default=None,
         max_length=10,
         description="Código del usuario a filtrar. Si es nulo o vacío, lista todas las cuentas."
+    ),
+    limite: int = Query(
+        default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX,
+        description="Cuentas por página (solo para el listado completo)."
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Valor de 'cursor_siguiente' de la página anterior."
     )
 ):
     """
     Recupera las cuentas bancarias. Puede filtrar por código de usuario.
+    Sin cod_usu el listado completo se pagina por NroCta.
     """
     try:
+        # Listado completo: paginado por cursor para acotar memoria y latencia
+        if not cod_usu:
+            try:
+                pagina, siguiente = await account_service.listar_cuentas_pagina_async(
+                    session=session, limite=limite, cursor=cursor
+                )
+            except CursorInvalido as ci:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=APIResponse(
+                        mensaje=str(ci),
+                        codigo="LIST-400",
+                        status_code=status.HTTP_400_BAD_REQUEST
+                    ).model_dump()
+                )
+
+            return respuesta_lista(
+                CuentaDetailsDTO,
+                mensaje=f"Consulta exitosa. Se devolvieron {len(pagina)} cuentas.",
+                codigo="LIST-OK",
+                status_code=status.HTTP_200_OK,
+                result=pagina,
+                cursor_siguiente=siguiente
+            )
+
         # Llama al servicio, pasando el parámetro de consulta directamente.
         # La limpieza de p_cod_usu = '' a None se maneja dentro del servicio/SP.
-        lista_cuentas_dto: List[CuentaDetailsDTO] = listar_cuentas_sp(
+        lista_cuentas_dto: List[CuentaDetailsDTO] = await account_service.listar_cuentas_sp_async(
             session=session,
             cod_usu_input=cod_usu
         )
         
         # 1. Verifica si la lista está vacía (posiblemente porque el usuario no tiene cuentas)
         if not lista_cuentas_dto and cod_usu is not None and cod_usu != '':
-            return APIResponse(
+            return respuesta_lista(
+                CuentaDetailsDTO,
                 mensaje=f"No se encontraron cuentas para el usuario: {cod_usu}.",
                 codigo="LIST-OK-EMPTY",
                 status_code=status.HTTP_200_OK,
@@ -238,13 +323,17 @@ def listar_cuentas(
             )
 
         # 2. Respuesta de Éxito (Status HTTP 200)
-        return APIResponse(
+        return respuesta_lista(
+            CuentaDetailsDTO,
             mensaje=f"Consulta exitosa. Se encontraron {len(lista_cuentas_dto)} cuentas.",
             codigo="LIST-OK",
             status_code=status.HTTP_200_OK,
             result=lista_cuentas_dto  # Aquí va la lista de DTOs mapeados
         )
     
+    except HTTPException as h_e:
+        raise h_e
+
     except Exception as e:
         # 3. Manejo de Errores Internos
         print("🔴 OCURRIÓ UN ERROR INESPERADO AL LISTAR CUENTAS:", e)
@@ -267,9 +356,9 @@ def listar_cuentas(
     status_code=status.HTTP_200_OK,  # 200 OK es común para actualizaciones exitosas
     summary="Actualiza el estado de una cuenta bancaria (Bloquear/Activar)."
 )
-def actualizar_estado(
+async def actualizar_estado(
     *,
-    session: SessionDep,
+    session: DbSessionDep,
     datos_actualizacion: CuentaEstadoUpdate  # Recibe el cuerpo JSON
 ):
     """
@@ -277,7 +366,7 @@ def actualizar_estado(
     """
     try:
         # 1. Llamada al servicio
-        resultado_sp = actualizar_estado_cuenta_sp(
+        resultado_sp = await account_service.actualizar_estado_cuenta_sp_async(
             session=session, datos=datos_actualizacion
         )
         
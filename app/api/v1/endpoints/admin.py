@@ -0,0 +1,178 @@
+# app/api/v1/endpoints/admin.py
+
+from fastapi import APIRouter, HTTPException, Query, status
+import traceback
+from datetime import date
+from typing import Optional
+
+from app.api.v1.deps import AdminUser, DbSessionDep
+from app.core import password_pool
+from app.db.session import engine, async_engine, read_engine, async_read_engine, sp_engine, async_sp_engine
+from app.db.pool_stats import pool_snapshot
+from app.db.procedures import procedure_snapshot
+from app.services import catalogos_service, resumen_service
+from app.core.cache import CACHES
+from app.schemas.util import APIResponse
+
+router = APIRouter()
+
+
+# ============================================================
+# 1. ESTADÍSTICAS DEL POOL DE CONEXIONES
+# ============================================================
+@router.get(
+    "/pool",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Ocupación y tiempos de espera del pool de conexiones (por worker)."
+)
+async def estadisticas_pool(admin: AdminUser):
+    """
+    Devuelve, por engine, conexiones en uso, overflow, histograma de espera
+    en checkout (segundos) y fallos de checkout. Los valores son del worker
+    que atiende la petición.
+    """
+    engines = []
+    for e in (engine, async_engine, read_engine, async_read_engine, sp_engine, async_sp_engine):
+        if e is not None and e not in engines:
+            engines.append(e)
+
+    return APIResponse(
+        mensaje="Estadísticas del pool de conexiones.",
+        codigo="POOL-OK",
+        status_code=status.HTTP_200_OK,
+        result=[pool_snapshot(e) for e in engines]
+    )
+
+
+# ============================================================
+# 2. ESTADÍSTICAS DE CACHÉS EN MEMORIA
+# ============================================================
+@router.get(
+    "/cache",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Aciertos/fallos de las cachés en memoria (por worker)."
+)
+async def estadisticas_cache(admin: AdminUser):
+    return APIResponse(
+        mensaje="Estadísticas de cachés en memoria.",
+        codigo="CACHE-OK",
+        status_code=status.HTTP_200_OK,
+        result=[c.stats() for c in CACHES.values()]
+    )
+
+
+# ============================================================
+# 3. POOL DE BCRYPT
+# ============================================================
+@router.get(
+    "/hash-pool",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Operaciones de contraseña en curso, rechazos y duración (por worker)."
+)
+async def estadisticas_hash_pool(admin: AdminUser):
+    return APIResponse(
+        mensaje="Estadísticas del pool de bcrypt.",
+        codigo="HASH-OK",
+        status_code=status.HTTP_200_OK,
+        result=[password_pool.estadisticas()]
+    )
+
+
+# ============================================================
+# 4. PROCEDIMIENTOS ALMACENADOS
+# ============================================================
+@router.get(
+    "/procedures",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Llamadas, errores y latencia por procedimiento almacenado (por worker)."
+)
+async def estadisticas_procedimientos(admin: AdminUser):
+    return APIResponse(
+        mensaje="Estadísticas de procedimientos almacenados.",
+        codigo="SP-OK",
+        status_code=status.HTTP_200_OK,
+        result=procedure_snapshot()
+    )
+
+
+# ============================================================
+# 5. CATÁLOGOS EN MEMORIA
+# ============================================================
+@router.post(
+    "/catalogos/recargar",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Vuelve a leer estados, tipos de cuenta, tipos de movimiento y ubigeo (por worker)."
+)
+async def recargar_catalogos(admin: AdminUser, session: DbSessionDep):
+    """
+    Publica una instantánea nueva de los catálogos sin reiniciar. Solo
+    afecta al worker que atiende la petición; el resto la recarga al
+    reiniciarse o con su propia llamada.
+    """
+    try:
+        catalogos = await catalogos_service.cargar_catalogos_async(session)
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL RECARGAR LOS CATÁLOGOS:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
+
+    return APIResponse(
+        mensaje="Catálogos recargados.",
+        codigo="CAT-OK",
+        status_code=status.HTTP_200_OK,
+        result=[catalogos.resumen()]
+    )
+
+
+# ============================================================
+# 6. RECONSTRUCCIÓN DEL RESUMEN DIARIO
+# ============================================================
+@router.post(
+    "/resumen/reconstruir",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Recalcula t_resumen_diario de un día desde t_movimientos."
+)
+async def reconstruir_resumen(
+    admin: AdminUser,
+    session: DbSessionDep,
+    fecha: Optional[date] = Query(None, description="Día a recalcular (por defecto, hoy).")
+):
+    """
+    Corrige el resumen de un día con movimientos que no escribió la
+    aplicación (procedimientos almacenados, cargas directas en la BD).
+    """
+    try:
+        resultado = await resumen_service.reconstruir_resumen_async(session, fecha or date.today())
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL RECONSTRUIR EL RESUMEN DIARIO:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
+
+    return APIResponse(
+        mensaje="Resumen diario reconstruido.",
+        codigo="RES-OK",
+        status_code=status.HTTP_200_OK,
+        result=[resultado]
+    )
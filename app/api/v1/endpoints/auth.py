@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Annotated
-from app.api.v1.deps import SessionDep
+from app.api.v1.deps import DbSessionDep
+from app.core.password_pool import HashPoolSaturado
 from app.core.security import create_access_token
 from app.schemas.token import Token
 from app.services import user_service
@@ -9,8 +10,8 @@ from app.services import user_service
 router = APIRouter()
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
-    session: SessionDep, 
+async def login_for_access_token(
+    session: DbSessionDep, 
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ):
     """
@@ -22,11 +23,19 @@ def login_for_access_token(
     print(f"Intentando autenticar al usuario: {form_data.username}")
 
     # Llamamos al servicio que maneja la lógica completa del login.
-    user, result_data = user_service.authenticate_user_with_sp(
-        session=session, 
-        username=form_data.username, 
-        password=form_data.password
-    )
+    try:
+        user, result_data = await user_service.authenticate_user_with_sp_async(
+            session=session, 
+            username=form_data.username, 
+            password=form_data.password
+        )
+    except HashPoolSaturado as e:
+        # Tormenta de logins: se rechaza en lugar de encolar sin límite
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
 
     # -----------------------------------------------------------
     # Manejo de errores especiales devueltos desde user_service
@@ -0,0 +1,136 @@
+# app/api/v1/endpoints/catalogos.py
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+import traceback
+from typing import Any, Optional, Sequence
+
+from app.api.v1.deps import ReadSessionDep
+from app.core.config import CATALOGOS_MAX_AGE
+from app.core.responses import respuesta_lista
+from app.models.common import Estado, TipoCuenta, TipoMovimiento, Ubigeo
+from app.schemas.catalogos import NivelUbigeo, UbigeoSugerencia
+from app.schemas.util import APIResponse
+from app.services import catalogos_service
+from app.services.catalogos_service import Catalogos
+
+router = APIRouter()
+
+
+def _respuesta_catalogo(request: Request, catalogos: Catalogos, tipo: Any, filas: Sequence[Any], nombre: str) -> Response:
+    """
+    Catálogo con Cache-Control de larga duración y ETag = versión de la
+    instantánea; si el cliente ya tiene esa versión se responde 304.
+    """
+    etag = f'"{catalogos.version}"'
+    cabeceras = {"Cache-Control": f"public, max-age={CATALOGOS_MAX_AGE}", "ETag": etag}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+
+    respuesta = respuesta_lista(
+        tipo,
+        mensaje=f"Catálogo de {nombre}: {len(filas)} registros.",
+        codigo="CAT-OK",
+        status_code=status.HTTP_200_OK,
+        result=list(filas)
+    )
+    respuesta.headers.update(cabeceras)
+    return respuesta
+
+
+async def _catalogos(session) -> Catalogos:
+    try:
+        return await catalogos_service.obtener_catalogos_async(session)
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL CARGAR LOS CATÁLOGOS:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
+
+
+# ============================================================
+#   1. Estados
+# ============================================================
+@router.get(
+    "/estados",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Catálogo de estados (t_estado)."
+)
+async def listar_estados(request: Request, session: ReadSessionDep):
+    catalogos = await _catalogos(session)
+    return _respuesta_catalogo(request, catalogos, Estado, catalogos.estados, "estados")
+
+
+# ============================================================
+#   2. Tipos de cuenta
+# ============================================================
+@router.get(
+    "/tipos-cuenta",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Catálogo de tipos de cuenta (t_tipocuentas)."
+)
+async def listar_tipos_cuenta(request: Request, session: ReadSessionDep):
+    catalogos = await _catalogos(session)
+    return _respuesta_catalogo(request, catalogos, TipoCuenta, catalogos.tipos_cuenta, "tipos de cuenta")
+
+
+# ============================================================
+#   3. Tipos de movimiento
+# ============================================================
+@router.get(
+    "/tipos-movimiento",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Catálogo de tipos de movimiento (t_tipomovi)."
+)
+async def listar_tipos_movimiento(request: Request, session: ReadSessionDep):
+    catalogos = await _catalogos(session)
+    return _respuesta_catalogo(request, catalogos, TipoMovimiento, catalogos.tipos_movimiento, "tipos de movimiento")
+
+
+# ============================================================
+#   4. Ubigeo
+# ============================================================
+@router.get(
+    "/ubigeos",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Catálogo de ubigeos (t_ubigeo)."
+)
+async def listar_ubigeos(request: Request, session: ReadSessionDep):
+    catalogos = await _catalogos(session)
+    return _respuesta_catalogo(request, catalogos, Ubigeo, catalogos.ubigeos, "ubigeos")
+
+
+# ============================================================
+#   5. Autocompletado de ubigeo (índice de prefijos en memoria)
+# ============================================================
+@router.get(
+    "/ubigeos/buscar",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Autocompletado de departamento, provincia y distrito por prefijo (sin tildes)."
+)
+async def buscar_ubigeos(
+    request: Request,
+    session: ReadSessionDep,
+    q: str = Query(..., min_length=1, max_length=50, description="Texto escrito hasta ahora, ej: 'lur'."),
+    nivel: Optional[NivelUbigeo] = Query(default=None, description="Restringe a un nivel; sin él, los tres."),
+    limite: int = Query(default=20, ge=1, le=100, description="Máximo de sugerencias."),
+):
+    """
+    Busca en el índice construido con el catálogo; cada pulsación se
+    resuelve en memoria, sin consultar t_ubigeo.
+    """
+    catalogos = await _catalogos(session)
+    sugerencias = catalogos.buscar_ubigeo(q, nivel, limite)
+    return _respuesta_catalogo(request, catalogos, UbigeoSugerencia, sugerencias, "ubigeos")
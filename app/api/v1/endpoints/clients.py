@@ -5,13 +5,17 @@ import traceback
 from typing import Optional, List
 
 # --- Importaciones de dependencias ---
-from app.api.v1.deps import SessionDep  
+from app.api.v1.deps import StaffUser, ReadSessionDep
 # (Asumo que tu schema APIResponse está aquí)
 from app.schemas.util import APIResponse 
 # (Asumo que tu schema ClientePublic está aquí)
 from app.schemas.clients import ClientePublic
 # (Importamos el servicio de cliente que creamos)
 from app.services import clients_service 
+from app.services.clients_service import CampoBusqueda
+from app.core.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.core.pagination import CursorInvalido
+from app.core.responses import respuesta_lista
 
 router = APIRouter()
 
@@ -22,30 +26,65 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
     summary="Lista los clientes por usuario o todos (Administrador)."
 )
-def listar_clientes(
+async def listar_clientes(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     # Recibe el 'cod_usu' como parámetro de consulta (query parameter)
     cod_usu: Optional[str]=Query(
         default=None,
         max_length=10,
         description="Código del usuario a filtrar. Si es nulo o vacío, lista todos los clientes."
+    ),
+    limite: int = Query(
+        default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX,
+        description="Clientes por página (solo para el listado completo)."
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Valor de 'cursor_siguiente' de la página anterior."
     )
 ):
     """
     Recupera los clientes. Puede filtrar por código de usuario.
+    Sin cod_usu el listado completo se pagina por CodCliente.
     """
     try:
+        # 0. Listado completo: paginado por cursor
+        if cod_usu is None or cod_usu.strip() == '':
+            try:
+                pagina, siguiente = await clients_service.listar_clientes_pagina_async(
+                    session=session, limite=limite, cursor=cursor
+                )
+            except CursorInvalido as ci:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=APIResponse(
+                        mensaje=str(ci),
+                        codigo="LIST-400",
+                        status_code=status.HTTP_400_BAD_REQUEST
+                    ).model_dump()
+                )
+
+            return respuesta_lista(
+                ClientePublic,
+                mensaje=f"Consulta exitosa. Se devolvieron {len(pagina)} clientes.",
+                codigo="LIST-OK",
+                status_code=status.HTTP_200_OK,
+                result=pagina,
+                cursor_siguiente=siguiente
+            )
+
         # 1. Llama al servicio
         #    La lógica de limpiar '' a None ya está en el servicio.
-        lista_clientes_dto: List[ClientePublic] = clients_service.listar_clientes_sp(
+        lista_clientes_dto: List[ClientePublic] = await clients_service.listar_clientes_sp_async(
             session=session,
             cod_usu_input=cod_usu
         )
         
         # 2. Verifica si la lista está vacía (si se filtró y no se encontró)
         if not lista_clientes_dto and cod_usu is not None and cod_usu.strip() != '':
-            return APIResponse(
+            return respuesta_lista(
+                ClientePublic,
                 mensaje=f"No se encontraron clientes para el usuario: {cod_usu}.",
                 codigo="LIST-OK-EMPTY",
                 status_code=status.HTTP_200_OK,
@@ -53,13 +92,17 @@ def listar_clientes(
             )
 
         # 3. Respuesta de Éxito (Status HTTP 200)
-        return APIResponse(
+        return respuesta_lista(
+            ClientePublic,
             mensaje=f"Consulta exitosa. Se encontraron {len(lista_clientes_dto)} clientes.",
             codigo="LIST-OK",
             status_code=status.HTTP_200_OK,
             result=lista_clientes_dto  # <-- Aquí va la lista de clientes
         )
     
+    except HTTPException as h_e:
+        raise h_e
+
     except Exception as e:
         # 4. Manejo de Errores Internos
         print("🔴 OCURRIÓ UN ERROR INESPERADO AL LISTAR CLIENTES:", e)
@@ -74,3 +117,64 @@ def listar_clientes(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             ).model_dump()
         )
+
+
+@router.get(
+    "/buscar",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Busca clientes por DNI, apellidos, nombres o email (exacto o por prefijo)."
+)
+async def buscar_clientes(
+    *,
+    session: ReadSessionDep,
+    staff: StaffUser,
+    q: str = Query(..., min_length=1, max_length=100, pattern=r"\S", description="DNI, apellido, nombre o email (o su inicio)."),
+    campo: Optional[CampoBusqueda] = Query(
+        default=None,
+        description="Campo donde buscar. Si se omite: dígitos → dni, con '@' → email, si no → apellidos."
+    ),
+    exacto: bool = Query(default=False, description="Coincidencia exacta en lugar de prefijo."),
+    limite: int = Query(default=20, ge=1, le=PAGE_SIZE_MAX, description="Clientes por página."),
+    cursor: Optional[str] = Query(default=None, description="Valor de 'cursor_siguiente' de la página anterior."),
+):
+    """
+    Búsqueda para ventanilla (administradores y empleados). Cada página
+    recorre el índice de la columna buscada; no se lee t_cliente completo.
+    """
+    try:
+        pagina, siguiente = await clients_service.buscar_clientes_async(
+            session, q.strip(), campo, exacto, limite, cursor
+        )
+
+        return respuesta_lista(
+            ClientePublic,
+            mensaje=f"Búsqueda exitosa. Se devolvieron {len(pagina)} clientes.",
+            codigo="LIST-OK",
+            status_code=status.HTTP_200_OK,
+            result=pagina,
+            cursor_siguiente=siguiente
+        )
+
+    except CursorInvalido as ci:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=APIResponse(
+                mensaje=str(ci),
+                codigo="LIST-400",
+                status_code=status.HTTP_400_BAD_REQUEST
+            ).model_dump()
+        )
+
+    except Exception as e:
+        print("🔴 OCURRIÓ UN ERROR INESPERADO AL BUSCAR CLIENTES:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor durante la consulta.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
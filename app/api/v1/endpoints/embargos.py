@@ -5,7 +5,8 @@ import traceback
 from typing import Dict, Any, List
 
 # --- Dependencias ---
-from app.api.v1.deps import SessionDep
+from app.api.v1.deps import DbSessionDep, StaffUser, ReadSessionDep
+from app.core.responses import respuesta_lista
 from app.schemas.util import APIResponse
 from app.schemas.embargos import EmbargoCreate
 from app.services import embargos_service
@@ -22,16 +23,16 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Registra un nuevo embargo (total o parcial) en una cuenta."
 )
-def registrar_embargo(
+async def registrar_embargo(
     *,
-    session: SessionDep,
+    session: DbSessionDep,
     datos_embargo: EmbargoCreate,
 ):
     """
     Registra un embargo utilizando el SP sp_RegistrarEmbargo.
     """
     try:
-        resultado_sp: Dict[str, Any] = embargos_service.registrar_embargo_sp(
+        resultado_sp: Dict[str, Any] = await embargos_service.registrar_embargo_sp_async(
             session=session,
             datos_embargo=datos_embargo,
         )
@@ -83,20 +84,21 @@ def registrar_embargo(
     status_code=status.HTTP_200_OK,
     summary="Lista todos los embargos asociados a una cuenta."
 )
-def listar_embargos_por_cuenta(
+async def listar_embargos_por_cuenta(
     nrocta: str,
-    session: SessionDep
+    session: ReadSessionDep
 ):
     """
     Lista los embargos asociados a un número de cuenta usando el SP sp_ListarEmbargosPorCuenta.
     """
     try:
-        lista = embargos_service.listar_embargos_por_cuenta_sp(
+        lista = await embargos_service.listar_embargos_por_cuenta_sp_async(
             session=session,
             nrocta=nrocta
         )
 
-        return APIResponse(
+        return respuesta_lista(
+            Dict[str, Any],
             mensaje="Embargos listados correctamente.",
             codigo="OK",
             status_code=status.HTTP_200_OK,
@@ -132,3 +134,65 @@ def listar_embargos_por_cuenta(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             ).model_dump()
         )
+
+
+# ============================================================
+# 3. LEVANTAR EMBARGO
+# ============================================================
+@router.post(
+    "/levantarEmbargo/{id_embargo}",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Levanta un embargo activo y libera el saldo retenido (admin o empleado)."
+)
+async def levantar_embargo(
+    id_embargo: int,
+    session: DbSessionDep,
+    staff: StaffUser
+):
+    """
+    Deja el embargo en estado 'I' y actualiza MontoEmbargado/EmbargoTotal
+    de la cuenta en la misma transacción.
+    """
+    try:
+        resultado = await embargos_service.levantar_embargo_async(
+            session=session,
+            id_embargo=id_embargo
+        )
+
+        return APIResponse(
+            mensaje=resultado["MensajeSP"],
+            codigo=str(resultado["IdEmbargo"]),
+            status_code=status.HTTP_200_OK,
+            result=[resultado]
+        )
+
+    except ValueError as ve:
+        error_message = str(ve)
+        error_code = (
+            status.HTTP_404_NOT_FOUND
+            if "no existe" in error_message.lower()
+            else status.HTTP_400_BAD_REQUEST
+        )
+
+        raise HTTPException(
+            status_code=error_code,
+            detail=APIResponse(
+                mensaje=error_message,
+                codigo="EMBARGO-ERR",
+                status_code=error_code
+            ).model_dump()
+        )
+
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL LEVANTAR EMBARGO:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
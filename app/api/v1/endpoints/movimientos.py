@@ -1,14 +1,19 @@
 # app/api/v1/endpoints/movimientos.py
 
 from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
 import traceback
-from typing import List
+from datetime import date
+from typing import List, Literal, Optional
 
 # Importaciones internas
-from app.api.v1.deps import SessionDep
+from app.api.v1.deps import AdminUser, CurrentUser, ReadSessionDep
+from app.core.config import DB_ASYNC, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.core.pagination import CursorInvalido
+from app.core.responses import respuesta_lista
 from app.schemas.util import APIResponse
-from app.schemas.movimientos import MovimientoDelDia
-from app.services import movimientos_service
+from app.schemas.movimientos import MovimientoDelDia, MovimientoHistorial, ResumenDelDia
+from app.services import account_service, movimientos_service, resumen_service
 
 
 router = APIRouter()
@@ -23,9 +28,9 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
     summary="Lista los movimientos del día (Admin ve todo, Usuario ve lo suyo)."
 )
-def listar_movimientos_del_dia(
+async def listar_movimientos_del_dia(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     Cod_usu: str = Query(..., description="Código del usuario que consulta."),
     rol: str = Query(..., max_length=1, description="Rol del usuario (A=Admin, C=Cliente)."),
 ):
@@ -35,13 +40,14 @@ def listar_movimientos_del_dia(
     Rol C: Cliente → solo ve sus propios movimientos
     """
     try:
-        lista = movimientos_service.listar_movimientos_del_dia_sp(
+        lista = await movimientos_service.listar_movimientos_del_dia_sp_async(
             session=session,
             cod_usu=Cod_usu,
             rol=rol
         )
 
-        return APIResponse(
+        return respuesta_lista(
+            MovimientoDelDia,
             mensaje=f"Consulta exitosa. Se encontraron {len(lista)} movimientos.",
             codigo="LIST-OK",
             status_code=status.HTTP_200_OK,
@@ -62,6 +68,54 @@ def listar_movimientos_del_dia(
         )
 
 
+# ============================================================
+#   1.1 Resumen del día (t_resumen_diario, sin recorrer movimientos)
+# ============================================================
+@router.get(
+    "/getResumenDelDia",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Cantidad y total de los movimientos del día por tipo (Admin: todo el banco; Usuario: sus cuentas)."
+)
+async def obtener_resumen_del_dia(
+    *,
+    session: ReadSessionDep,
+    user: CurrentUser,
+):
+    """
+    Lee los totales ya acumulados al registrar cada movimiento: el coste no
+    depende de cuántos movimientos lleve el día. Usuario y rol salen del
+    token, no de la petición.
+    """
+    try:
+        resumen = await resumen_service.obtener_resumen_del_dia_async(
+            session=session,
+            cod_usu=user.CodUsu,
+            rol=user.Rol
+        )
+
+        return respuesta_lista(
+            ResumenDelDia,
+            mensaje="Resumen de movimientos del día.",
+            codigo="RES-OK",
+            status_code=status.HTTP_200_OK,
+            result=resumen
+        )
+
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL OBTENER EL RESUMEN DEL DÍA:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
+
+
 # ============================================================
 #   2. Últimos 20 movimientos (NUEVO SP)
 # ============================================================
@@ -71,9 +125,9 @@ def listar_movimientos_del_dia(
     status_code=status.HTTP_200_OK,
     summary="Obtiene los últimos 20 movimientos de una cuenta bancaria."
 )
-def listar_ultimos_movimientos(
+async def listar_ultimos_movimientos(
     *,
-    session: SessionDep,
+    session: ReadSessionDep,
     nro_cuenta: str = Query(..., description="Número de cuenta. Ejemplo: CA-1088340")
 ):
     """
@@ -81,20 +135,22 @@ def listar_ultimos_movimientos(
     ordenados desde el más reciente al más antiguo.
     """
     try:
-        lista = movimientos_service.listar_ultimos_movimientos_sp(
+        lista = await movimientos_service.listar_ultimos_movimientos_sp_async(
             session=session,
             nro_cuenta=nro_cuenta
         )
 
         if not lista:
-            return APIResponse(
+            return respuesta_lista(
+                MovimientoDelDia,
                 mensaje="No se encontraron movimientos para esta cuenta.",
                 codigo="MOV-404",
                 status_code=status.HTTP_200_OK,
                 result=[]
             )
 
-        return APIResponse(
+        return respuesta_lista(
+            MovimientoDelDia,
             mensaje=f"Consulta exitosa. Se encontraron {len(lista)} movimientos.",
             codigo="MOV-OK",
             status_code=status.HTTP_200_OK,
@@ -113,3 +169,131 @@ def listar_ultimos_movimientos(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             ).model_dump()
         )
+
+
+# ============================================================
+#   3. Historial paginado por cuenta
+# ============================================================
+@router.get(
+    "/historial",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Historial de movimientos de una cuenta, paginado y con filtros de fecha y tipo."
+)
+async def listar_historial(
+    *,
+    session: ReadSessionDep,
+    user: CurrentUser,
+    nro_cuenta: str = Query(..., max_length=20, description="Número de cuenta."),
+    fecha_desde: Optional[date] = Query(default=None, description="Fech_Ope mínima (inclusive)."),
+    fecha_hasta: Optional[date] = Query(default=None, description="Fech_Ope máxima (inclusive)."),
+    tipo_mov: Optional[str] = Query(default=None, max_length=2, description="Código de TipoMov."),
+    limite: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="Movimientos por página."),
+    cursor: Optional[str] = Query(default=None, description="Valor de 'cursor_siguiente' de la página anterior."),
+):
+    """
+    Recorre el historial completo de la cuenta, del más reciente al más
+    antiguo, sin el tope de 20 de sp_GetLastMovements. El personal del
+    banco (A, E) ve cualquier cuenta; el cliente, solo las suyas.
+    """
+    if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=APIResponse(
+                mensaje="fecha_desde no puede ser posterior a fecha_hasta.",
+                codigo="MOV-400",
+                status_code=status.HTTP_400_BAD_REQUEST
+            ).model_dump()
+        )
+
+    if user.Rol not in ("A", "E") and not await account_service.es_titular_cuenta_async(
+        session, nro_cuenta, user.CodUsu
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=APIResponse(
+                mensaje="La cuenta no pertenece al usuario.",
+                codigo="MOV-403",
+                status_code=status.HTTP_403_FORBIDDEN
+            ).model_dump()
+        )
+
+    try:
+        pagina, siguiente = await movimientos_service.listar_historial_async(
+            session, nro_cuenta, limite, cursor, fecha_desde, fecha_hasta, tipo_mov
+        )
+
+        return respuesta_lista(
+            MovimientoHistorial,
+            mensaje=f"Consulta exitosa. Se devolvieron {len(pagina)} movimientos.",
+            codigo="MOV-OK",
+            status_code=status.HTTP_200_OK,
+            result=pagina,
+            cursor_siguiente=siguiente
+        )
+
+    except CursorInvalido as ci:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=APIResponse(
+                mensaje=str(ci),
+                codigo="MOV-400",
+                status_code=status.HTTP_400_BAD_REQUEST
+            ).model_dump()
+        )
+
+    except Exception as e:
+        print("🔴 ERROR INESPERADO AL LISTAR EL HISTORIAL:", e)
+        traceback.print_exc()
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=APIResponse(
+                mensaje="Ocurrió un error interno del servidor.",
+                codigo="SYS-500",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            ).model_dump()
+        )
+
+
+# ============================================================
+#   4. Exportación completa (NDJSON / CSV en streaming)
+# ============================================================
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    summary="Exporta movimientos por cuenta y/o rango de fechas en NDJSON o CSV (streaming)."
+)
+async def exportar_movimientos(
+    *,
+    admin: AdminUser,
+    nro_cuenta: Optional[str] = Query(default=None, max_length=20, description="Filtra por número de cuenta."),
+    fecha_desde: Optional[date] = Query(default=None, description="Fech_Ope mínima (inclusive)."),
+    fecha_hasta: Optional[date] = Query(default=None, description="Fech_Ope máxima (inclusive)."),
+    formato: Literal["ndjson", "csv"] = Query(default="ndjson", description="Formato de salida."),
+):
+    """
+    Envía los movimientos de t_movimientos ordenados por cuenta y número de
+    operación a medida que se leen de la BD, sin cargar el resultado en
+    memoria. Pensado para auditoría y operaciones (solo administradores).
+    """
+    if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=APIResponse(
+                mensaje="fecha_desde no puede ser posterior a fecha_hasta.",
+                codigo="EXP-400",
+                status_code=status.HTTP_400_BAD_REQUEST
+            ).model_dump()
+        )
+
+    generador = (
+        movimientos_service.exportar_movimientos_async if DB_ASYNC
+        else movimientos_service.exportar_movimientos
+    )
+
+    return StreamingResponse(
+        generador(nro_cuenta, fecha_desde, fecha_hasta, formato),
+        media_type="text/csv" if formato == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="movimientos.{formato}"'},
+    )
@@ -3,20 +3,22 @@ from fastapi import APIRouter, HTTPException
 import traceback # Útil para depurar errores inesperados
 
 # Importamos las dependencias que preparan la sesión de BD
-from app.api.v1.deps import SessionDep
+from app.api.v1.deps import DbSessionDep
 
 # Importamos el schema que valida los datos de entrada
 from app.schemas.registration import FullClientRegistration
 
 # ¡LA IMPORTACIÓN CLAVE! Importamos nuestro módulo de servicios
 from app.services import registration_service
+from app.core.password_pool import HashPoolSaturado
+from app.services.catalogos_service import DatoReferenciaInvalido
 
 router = APIRouter()
 
 @router.post("/", status_code=201) 
-def register_full_client(
+async def register_full_client(
     *,
-    session: SessionDep,
+    session: DbSessionDep,
     registration_data: FullClientRegistration
 ):
     """
@@ -29,7 +31,7 @@ def register_full_client(
         # ==================================================================
         # Le pasamos la sesión de la base de datos y los datos de registro
         # que ya fueron validados por FastAPI.
-        new_ids = registration_service.register_client_with_sp(
+        new_ids = await registration_service.register_client_with_sp_async(
             session=session, reg_data=registration_data
         )
         # ==================================================================
@@ -37,11 +39,18 @@ def register_full_client(
         # Si el servicio termina sin errores, devolvemos una respuesta de éxito.
         return {"message": "Cliente y usuario registrados con éxito", "generated_ids": new_ids}
     
+    except DatoReferenciaInvalido as dr:
+        # Código que no existe en su catálogo (ej: CodUbigeo): dato erróneo, no conflicto
+        raise HTTPException(status_code=400, detail=str(dr))
+
     except ValueError as ve:
         # Capturamos los errores de negocio que devuelve el SP (ej: DNI duplicado)
         # 409 Conflict es el código ideal para este tipo de error.
         raise HTTPException(status_code=409, detail=str(ve))
     
+    except HashPoolSaturado as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    
     except Exception as e:
         # Capturamos cualquier otro error inesperado que no sea un ValueError
         print("🔴 OCURRIÓ UN ERROR INESPERADO EN EL ENDPOINT DE REGISTRO:")
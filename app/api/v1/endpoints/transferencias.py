@@ -1,16 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemas.transferencias_schema import TransferenciaRequest, TransferenciaResponse
-from app.services.transferencias_service import TransferenciaService
+from typing import Annotated, List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from app.api.v1.deps import CurrentUser, DbSessionDep, IdempotencyKeyDep, StaffUser
+from app.api.v1.idempotencia import ejecutar_idempotente
+from app.core.config import TRANSFER_BATCH_CHUNK, TRANSFER_BATCH_MAX_ITEMS
+from app.schemas.transferencias_schema import (
+    TransferenciaRequest,
+    TransferenciaResponse,
+    TransferenciaBatchResponse,
+)
+from app.services import account_service
+from app.services.transferencias_service import ErrorBD, TransferenciaService
 
 router = APIRouter(
     tags=["Transferencias"]
 )
 
 @router.post("/", response_model=TransferenciaResponse)
-def realizar_transferencia(payload: TransferenciaRequest):
+async def realizar_transferencia(
+    session: DbSessionDep,
+    user: CurrentUser,
+    payload: TransferenciaRequest,
+    idempotency_key: IdempotencyKeyDep = None,
+):
+    """
+    Transfiere desde una cuenta del usuario (el personal, desde cualquiera);
+    el movimiento se registra a nombre del usuario del token.
+
+    Con Idempotency-Key, un reintento con la misma clave devuelve la
+    respuesta guardada sin volver a transferir.
+    """
+    if user.Rol not in ("A", "E") and not await account_service.es_titular_cuenta_async(
+        session, payload.cuenta_origen, user.CodUsu
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="La cuenta de origen no pertenece al usuario."
+        )
+    payload = payload.model_copy(update={"cod_usuario": user.CodUsu})
+
+    async def operacion():
+        try:
+            resultado = await TransferenciaService.realizar_transferencia_async(session, payload)
+        except ErrorBD:
+            raise   # sin guardar: el reintento debe ejecutarse
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return TransferenciaResponse.model_validate(resultado)
+
     try:
-        resultado = TransferenciaService.realizar_transferencia(payload)
-        return resultado
+        return await ejecutar_idempotente(
+            session, "transferencia", user.CodUsu, idempotency_key, payload, operacion
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/batch", response_model=TransferenciaBatchResponse)
+async def realizar_transferencias_batch(
+    session: DbSessionDep,
+    user: StaffUser,
+    payload: Annotated[List[TransferenciaRequest], Body(min_length=1, max_length=TRANSFER_BATCH_MAX_ITEMS)],
+    chunk: int = Query(
+        default=TRANSFER_BATCH_CHUNK, ge=1, le=5000,
+        description="Transferencias por transacción."
+    ),
+):
+    """
+    Procesa una lista de transferencias (p.ej. un archivo de pagos) en bloques
+    de `chunk` por transacción. Devuelve el resultado de cada una por su
+    posición (`indice`) en la lista recibida.
+
+    Solo personal del banco (A, E). Los movimientos se registran a nombre
+    de quien envía el lote: se ignora el cod_usuario de cada transferencia.
+    """
+    items = [item.model_copy(update={"cod_usuario": user.CodUsu}) for item in payload]
+    try:
+        return await TransferenciaService.realizar_transferencias_batch_async(
+            session, items, chunk
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,7 +1,7 @@
 # app/api/v1/endpoints/users.py
 
 from fastapi import APIRouter, HTTPException
-from app.api.v1.deps import SessionDep, CurrentUser
+from app.api.v1.deps import DbSessionDep, CurrentUser, ReadSessionDep
 from app.schemas.user import (
     UsuarioCreate,
     UsuarioPublic,
@@ -9,6 +9,7 @@ from app.schemas.user import (
     StaffRegistrationData # <--- CLASE DE REGISTRO INTERNO AÑADIDA
 )
 from app.services import user_service
+from app.core.password_pool import HashPoolSaturado
 
 router = APIRouter()
 
@@ -18,13 +19,15 @@ router = APIRouter()
 # ============================================================
 
 @router.post("/register-internal", response_model=dict, status_code=201)
-def register_staff(session: SessionDep, user_in: StaffRegistrationData):
+async def register_staff(session: DbSessionDep, user_in: StaffRegistrationData):
     """
     Registra un nuevo usuario interno (Administrador o Empleado).
     """
     try:
         # Llamamos al servicio para manejar la lógica de registro y el SP
-        return user_service.register_staff_sp(session=session, user_data=user_in)
+        return await user_service.register_staff_sp_async(session=session, user_data=user_in)
+    except HashPoolSaturado as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         # 400 Bad Request si el usuario ya existe o hay un error de datos.
         raise HTTPException(status_code=400, detail=str(e))
@@ -44,7 +47,7 @@ def register_staff(session: SessionDep, user_in: StaffRegistrationData):
 # ============================================================
 
 @router.get("/me", response_model=UsuarioPublic)
-def read_users_me(current_user: CurrentUser):
+async def read_users_me(current_user: CurrentUser):
     return current_user
 
 
@@ -54,13 +57,15 @@ def read_users_me(current_user: CurrentUser):
 # ============================================================
 
 @router.patch("/update/{codusu}", response_model=dict)
-def update_user(codusu: str, data: UsuarioUpdate, session: SessionDep):
+async def update_user(codusu: str, data: UsuarioUpdate, session: DbSessionDep):
     try:
-        return user_service.update_user(
+        return await user_service.update_user_async(
             session=session,
             codusu=codusu,
             data=data
         )
+    except HashPoolSaturado as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -71,9 +76,9 @@ def update_user(codusu: str, data: UsuarioUpdate, session: SessionDep):
 # ============================================================
 
 @router.get("/admins", response_model=list[dict])
-def listar_administradores(session: SessionDep):
+async def listar_administradores(session: ReadSessionDep):
     try:
-        return user_service.listar_administradores(session)
+        return await user_service.listar_administradores_async(session)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -84,9 +89,9 @@ def listar_administradores(session: SessionDep):
 # ============================================================
 
 @router.get("/employees", response_model=list[dict])
-def listar_empleados(session: SessionDep):
+async def listar_empleados(session: ReadSessionDep):
     try:
-        return user_service.listar_empleados(session)
+        return await user_service.listar_empleados_async(session)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
@@ -95,12 +100,12 @@ def listar_empleados(session: SessionDep):
 # ============================================================
 
 @router.patch("/inactivate/{codusu}", response_model=dict)
-def inactivar_usuario(codusu: str, session: SessionDep):
+async def inactivar_usuario(codusu: str, session: DbSessionDep):
     """
     Inactiva un usuario utilizando el SP sp_InactivarUsuario.
     """
     try:
-        return user_service.inactivar_usuario_sp(session=session, codusu=codusu)
+        return await user_service.inactivar_usuario_sp_async(session=session, codusu=codusu)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
\ No newline at end of file
@@ -0,0 +1,116 @@
+# app/api/v1/idempotencia.py
+"""
+Aplicación de Idempotency-Key en los endpoints que mueven dinero.
+
+    return await ejecutar_idempotente(session, "deposito", user.CodUsu, idempotency_key, datos, operacion)
+
+`operacion` es el cuerpo original del endpoint. Se guarda (y se repite
+tal cual en los reintentos) su respuesta de éxito o su HTTPException 4xx;
+un 5xx u otra excepción libera la clave para que el reintento se ejecute.
+Las claves son por usuario (CodUsu del token), nunca globales.
+"""
+
+import json
+import logging
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.session import run_service
+from app.schemas.util import APIResponse
+from app.services import idempotencia_service
+from app.services.idempotencia_service import RespuestaGuardada
+
+logger = logging.getLogger(__name__)
+
+
+def _json(contenido: Any) -> str:
+    # Mismo formato que JSONResponse de Starlette
+    return json.dumps(jsonable_encoder(contenido), ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _repetir(guardada: RespuestaGuardada, hash_: str) -> Response:
+    if guardada.hash_peticion != hash_:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=APIResponse(
+                mensaje="La Idempotency-Key ya se usó con otros datos.",
+                codigo="IDEM-422",
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            ).model_dump()
+        )
+    if guardada.status_code is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=APIResponse(
+                mensaje="Hay una operación en curso con esta Idempotency-Key.",
+                codigo="IDEM-409",
+                status_code=status.HTTP_409_CONFLICT
+            ).model_dump(),
+            headers={"Retry-After": "1"}
+        )
+    return Response(
+        content=guardada.cuerpo,
+        status_code=guardada.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+async def ejecutar_idempotente(
+    session: Union[Session, AsyncSession],
+    endpoint: str,
+    cod_usu: str,
+    clave: Optional[str],
+    payload: Any,
+    operacion: Callable[[], Awaitable[Any]],
+    status_code: int = status.HTTP_200_OK,
+) -> Any:
+    if not clave:
+        return await operacion()
+
+    hash_ = idempotencia_service.hash_peticion(payload)
+    guardada = idempotencia_service.respuesta_en_cache(endpoint, cod_usu, clave)
+    if guardada is None:
+        guardada = await run_service(session, idempotencia_service.reservar, endpoint, cod_usu, clave, hash_)
+    if guardada is not None:
+        return _repetir(guardada, hash_)
+
+    try:
+        resultado = await operacion()
+    except HTTPException as e:
+        if e.status_code < 500:
+            await _guardar(session, endpoint, cod_usu, clave, hash_, e.status_code, _json({"detail": e.detail}))
+        else:
+            await _liberar(session, endpoint, cod_usu, clave)
+        raise
+    except Exception:
+        await _liberar(session, endpoint, cod_usu, clave)
+        raise
+
+    cuerpo = _json(resultado)
+    await _guardar(session, endpoint, cod_usu, clave, hash_, status_code, cuerpo)
+    return Response(content=cuerpo, status_code=status_code, media_type="application/json")
+
+
+async def _guardar(
+    session, endpoint: str, cod_usu: str, clave: str, hash_: str, status_code: int, cuerpo: str
+) -> None:
+    # La operación ya se hizo: un fallo aquí no debe convertirla en error.
+    # La clave queda "en curso" (409 en los reintentos) hasta IDEMPOTENCY_LEASE.
+    try:
+        await run_service(
+            session, idempotencia_service.completar, endpoint, cod_usu, clave, hash_, status_code, cuerpo
+        )
+    except Exception:
+        logger.exception("No se pudo guardar la respuesta de la Idempotency-Key %s/%s/%s", endpoint, cod_usu, clave)
+
+
+async def _liberar(session, endpoint: str, cod_usu: str, clave: str) -> None:
+    try:
+        await run_service(session, idempotencia_service.liberar, endpoint, cod_usu, clave)
+    except Exception:
+        logger.exception("No se pudo liberar la Idempotency-Key %s/%s/%s", endpoint, cod_usu, clave)
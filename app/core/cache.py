@@ -0,0 +1,85 @@
+# app/core/cache.py
+"""
+Caché en memoria acotada (LRU) con expiración por TTL y contadores de
+aciertos/fallos. Thread-safe; local a cada proceso/worker.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.metrics import Counter
+
+_MISSING = object()
+
+# Todas las cachés del proceso por nombre (ver /admin/cache y /metrics)
+CACHES: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float, nombre: str = "cache"):
+        self.nombre = nombre
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = Counter()
+        CACHES[nombre] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        ahora = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expira, valor = item
+                if expira > ahora:
+                    self._data.move_to_end(key)
+                    self.hits.inc()
+                    return valor
+                del self._data[key]
+        self.misses.inc()
+        return default
+
+    def set(self, key: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expira, valor)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions.inc()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicado: Callable[[Hashable, Any], bool]) -> int:
+        """Elimina las entradas que cumplan predicado(key, valor). O(n), para operaciones poco frecuentes."""
+        with self._lock:
+            claves = [k for k, (_, v) in self._data.items() if predicado(k, v)]
+            for k in claves:
+                del self._data[k]
+        return len(claves)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        hits, misses = self.hits.value, self.misses.value
+        return {
+            "nombre": self.nombre,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "evictions": self.evictions.value,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
@@ -3,6 +3,11 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _env_bool(name: str, default: str = 'false') -> bool:
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes')
+
+
 # Database Config
 DB_USERNAME = os.getenv('USER_DB')
 DB_PASSWORD = os.getenv('PASSWORD_DB')
@@ -10,7 +15,83 @@ DB_HOST = os.getenv('HOST_DB')
 DB_NAME = os.getenv('NAME_DB')
 PORT = os.getenv('PORT_DB')
 # DATABASE_URL = f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{PORT}/{DB_NAME}?ssl=true"
-DATABASE_URL = f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{PORT}/{DB_NAME}"
+DATABASE_URL = os.getenv('DATABASE_URL') or f"mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{PORT}/{DB_NAME}"
+
+# Async Database Config (opcional: DB_ASYNC=true activa el engine asíncrono)
+DB_ASYNC = _env_bool('DB_ASYNC')
+ASYNC_DB_DRIVER = os.getenv('ASYNC_DB_DRIVER', 'aiomysql')  # aiomysql | asyncmy
+ASYNC_DATABASE_URL = f"mysql+{ASYNC_DB_DRIVER}://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{PORT}/{DB_NAME}"
+
+# Réplica de lectura (opcional): listados e informes (ReadSessionDep) leen
+# de aquí. Sin ella se lee del primario. La URL async se deriva de la
+# síncrona si no se indica.
+READ_DATABASE_URL = os.getenv('READ_DATABASE_URL') or None
+ASYNC_READ_DATABASE_URL = os.getenv('ASYNC_READ_DATABASE_URL') or (
+    READ_DATABASE_URL.replace('mysql+pymysql://', f'mysql+{ASYNC_DB_DRIVER}://', 1)
+    if READ_DATABASE_URL else None
+)
+
+# Pool de conexiones (por worker). Recycle < wait_timeout del servidor y
+# pre-ping evitan que la primera petición tras un periodo ocioso falle por
+# una conexión TLS muerta.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', 'true')
+
+# Reintentos ante deadlock / lock wait timeout (transferencias y demás escrituras)
+DB_RETRY_MAX = int(os.getenv('DB_RETRY_MAX', 5))
+DB_RETRY_BACKOFF_BASE_MS = float(os.getenv('DB_RETRY_BACKOFF_BASE_MS', 10))
+DB_RETRY_BACKOFF_MAX_MS = float(os.getenv('DB_RETRY_BACKOFF_MAX_MS', 200))
+
+# Transferencias en lote: transferencias por transacción
+TRANSFER_BATCH_CHUNK = int(os.getenv('TRANSFER_BATCH_CHUNK', 500))
+TRANSFER_BATCH_MAX_ITEMS = int(os.getenv('TRANSFER_BATCH_MAX_ITEMS', 10000))
+
+# Caché de usuarios autenticados (get_current_user). La invalidación es por
+# worker: en los demás, un usuario inactivado o con otro rol sigue entrando
+# con los datos anteriores hasta USER_CACHE_TTL segundos (mantenerlo corto)
+USER_CACHE_MAXSIZE = int(os.getenv('USER_CACHE_MAXSIZE', 10000))
+USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', 30))
+
+# Pool de procesos para bcrypt (login, registro, cambio de contraseña)
+HASH_POOL_ENABLED = _env_bool('HASH_POOL_ENABLED', 'true')
+HASH_POOL_WORKERS = int(os.getenv('HASH_POOL_WORKERS', os.cpu_count() or 2))   # tope de hashes en paralelo
+HASH_POOL_QUEUE_LIMIT = int(os.getenv('HASH_POOL_QUEUE_LIMIT', 64))            # en espera; más → 503
+HASH_POOL_TIMEOUT = float(os.getenv('HASH_POOL_TIMEOUT', 10))
+
+# Procedimientos almacenados: CALL + SELECT de las variables OUT en un solo
+# round trip (activa CLIENT.MULTI_STATEMENTS en las conexiones MySQL)
+DB_SP_MULTI_STATEMENTS = _env_bool('DB_SP_MULTI_STATEMENTS', 'true')
+
+# Paginación por cursor (keyset) de los listados
+PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 100))
+PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 1000))
+
+# Exportación de movimientos: filas leídas del cursor de servidor por bloque
+EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', 1000))
+
+# Resumen diario: fragmentos del total del banco (no cambiar con datos cargados)
+RESUMEN_SHARDS = int(os.getenv('RESUMEN_SHARDS', 16))
+
+# Catálogos (t_estado, t_tipocuentas, t_tipomovi, t_ubigeo): max-age de sus endpoints
+CATALOGOS_MAX_AGE = int(os.getenv('CATALOGOS_MAX_AGE', 86400))
+
+# Idempotency-Key (depósitos, retiros, transferencias): vigencia de la clave
+# y respuestas guardadas en memoria por worker (respaldadas en t_idempotencia)
+IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', 86400))
+# Segundos que una reserva sin respuesta (worker caído a mitad de la
+# operación) bloquea la clave antes de poder reutilizarse
+IDEMPOTENCY_LEASE = float(os.getenv('IDEMPOTENCY_LEASE', 300))
+IDEMPOTENCY_CACHE_MAXSIZE = int(os.getenv('IDEMPOTENCY_CACHE_MAXSIZE', 10000))
+
+# GET /metrics (formato Prometheus). Si se define, exige "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv('METRICS_TOKEN') or None
+
+# Cabeceras X-DB-Statements / X-DB-Rows / X-DB-Time-Ms en cada respuesta
+# (sentencias, filas y tiempo de BD de la petición). Solo para depuración.
+DEBUG_DB_HEADERS = _env_bool('DEBUG_DB_HEADERS')
 
 
 # JWT Config
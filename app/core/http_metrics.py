@@ -0,0 +1,101 @@
+# app/core/http_metrics.py
+"""
+Métricas HTTP por ruta: peticiones por código de estado, latencia, tiempo
+de BD y sentencias SQL de cada petición (histogramas). Las agrupa por la plantilla de la
+ruta ("/api/v1/movements/historial/{nro_cuenta}"), no por la URL, para que
+el número de series no crezca con los parámetros.
+
+Middleware ASGI puro: por petición, dos perf_counter, una ContextVar y
+unas pocas sumas bajo lock. Con DEBUG_DB_HEADERS añade además a cada
+respuesta el consumo de BD de la petición (X-DB-Statements, X-DB-Rows,
+X-DB-Time-Ms); en respuestas en streaming refleja lo ejecutado antes de
+enviar las cabeceras.
+"""
+
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from app.core.config import DEBUG_DB_HEADERS
+from app.core.metrics import Counter, Gauge, Histogram
+from app.db.query_stats import ConsumoBD, consumo_actual, iniciar_consumo, terminar_consumo
+
+SIN_RUTA = "sin_ruta"   # 404 y rutas no encontradas: una sola serie
+
+BUCKETS_SENTENCIAS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+class MetricasRuta:
+    def __init__(self):
+        self.duracion = Histogram()
+        self.tiempo_bd = Histogram()
+        self.sentencias = Histogram(BUCKETS_SENTENCIAS)
+        self.por_status: Dict[int, Counter] = {}
+
+
+# Por (método, plantilla de ruta)
+RUTAS: Dict[Tuple[str, str], MetricasRuta] = {}
+_rutas_lock = threading.Lock()
+
+peticiones_en_curso = Gauge()
+
+
+def _metricas(metodo: str, ruta: str, status_code: int) -> Tuple[MetricasRuta, Counter]:
+    clave = (metodo, ruta)
+    metricas = RUTAS.get(clave)
+    contador = metricas.por_status.get(status_code) if metricas else None
+    if contador is None:
+        with _rutas_lock:
+            metricas = RUTAS.setdefault(clave, MetricasRuta())
+            contador = metricas.por_status.setdefault(status_code, Counter())
+    return metricas, contador
+
+
+def registrar_peticion(metodo: str, ruta: str, status_code: int, duracion: float, consumo: ConsumoBD) -> None:
+    metricas, contador = _metricas(metodo, ruta, status_code)
+    contador.inc()
+    metricas.duracion.observe(duracion)
+    metricas.tiempo_bd.observe(consumo.segundos)
+    metricas.sentencias.observe(consumo.sentencias)
+
+
+def cabeceras_consumo(consumo: ConsumoBD) -> List[Tuple[bytes, bytes]]:
+    return [
+        (b"x-db-statements", str(consumo.sentencias).encode()),
+        (b"x-db-rows", str(consumo.filas).encode()),
+        (b"x-db-time-ms", f"{consumo.segundos * 1000.0:.3f}".encode()),
+    ]
+
+
+class MetricasMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500   # si la app falla antes de responder
+        token = iniciar_consumo()
+        consumo = consumo_actual()
+
+        async def send_con_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if DEBUG_DB_HEADERS:
+                    message = {**message, "headers": [*message.get("headers", []), *cabeceras_consumo(consumo)]}
+            await send(message)
+
+        peticiones_en_curso.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            duracion = time.perf_counter() - inicio
+            peticiones_en_curso.dec()
+            terminar_consumo(token)
+            # FastAPI deja en scope["route"] la ruta que atendió la petición
+            ruta = getattr(scope.get("route"), "path", None) or SIN_RUTA
+            registrar_peticion(scope["method"], ruta, status_code, duracion, consumo)
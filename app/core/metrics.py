@@ -0,0 +1,84 @@
+# app/core/metrics.py
+"""
+Primitivas de métricas en proceso (sin dependencias externas).
+Pensadas para el camino caliente: un lock y unas pocas sumas por observación.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence
+
+# Buckets en segundos, de 0.5 ms a 10 s.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Histograma de buckets fijos (acumulativos al exportar)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        acumulado = 0
+        buckets: Dict[str, int] = {}
+        for limite, n in zip(self.buckets, counts):
+            acumulado += n
+            buckets[str(limite)] = acumulado
+        acumulado += counts[-1]
+        buckets["+Inf"] = acumulado
+        return {"buckets": buckets, "count": acumulado, "sum": round(total, 6)}
+
+
+class Counter:
+    """Contador monotónico thread-safe."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """Valor que sube y baja (peticiones en curso...)."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> int:
+        return self._value
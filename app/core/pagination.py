@@ -0,0 +1,44 @@
+# app/core/pagination.py
+"""
+Cursores opacos para la paginación keyset de los listados.
+
+El cursor guarda la clave ordenada de la última fila entregada; la
+siguiente página es `WHERE clave > :ultima ORDER BY clave LIMIT n`, que
+usa el índice y cuesta lo mismo en la primera página que en la última.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class CursorInvalido(ValueError):
+    """El cursor recibido no se pudo decodificar o es de otro listado."""
+
+
+def codificar_cursor(tipo: str, clave: Sequence[Any]) -> str:
+    datos = json.dumps({"t": tipo, "k": list(clave)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(tipo: str, cursor: str, longitud: int = 1) -> List[Any]:
+    """Clave de la última fila; CursorInvalido si el cursor no es de este listado."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        if datos["t"] != tipo or not isinstance(datos["k"], list) or len(datos["k"]) != longitud:
+            raise ValueError
+        return datos["k"]
+    except Exception:
+        raise CursorInvalido("Cursor de paginación inválido.")
+
+
+def cortar_pagina(filas: List[T], limite: int) -> Tuple[List[T], bool]:
+    """Las consultas piden limite+1 filas: la sobrante indica que hay otra página."""
+    return filas[:limite], len(filas) > limite
+
+
+def cursor_siguiente(tipo: str, hay_mas: bool, ultima: Optional[Sequence[Any]]) -> Optional[str]:
+    return codificar_cursor(tipo, ultima) if hay_mas and ultima is not None else None
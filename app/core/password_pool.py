@@ -0,0 +1,165 @@
+# app/core/password_pool.py
+"""
+Pool de procesos dedicado a bcrypt.
+
+bcrypt consume ~100-300 ms de CPU por llamada; ejecutado en los hilos de
+la petición, una ráfaga de logins deja sin hilos (y sin GIL) al resto de
+endpoints. Aquí el trabajo va a HASH_POOL_WORKERS procesos (uno por core)
+y como mucho HASH_POOL_QUEUE_LIMIT peticiones más esperan turno: el resto
+se rechaza al instante con HashPoolSaturado (→ 503) en lugar de encolarse.
+
+Un resultado que no llega en HASH_POOL_TIMEOUT o un pool roto (un proceso
+hijo murió) también salen como HashPoolSaturado: no son un fallo de
+credenciales y el cliente debe reintentar, no ver un 401.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import (
+    HASH_POOL_WORKERS,
+    HASH_POOL_QUEUE_LIMIT,
+    HASH_POOL_TIMEOUT,
+)
+from app.core.metrics import Counter, Histogram
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class HashPoolSaturado(Exception):
+    """Se superó el límite de operaciones de contraseña en curso."""
+
+
+# --- Funciones que corren en los procesos hijos ---
+
+def _verificar(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hashear(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+# --- Estado del pool (proceso padre) ---
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_en_curso = 0
+_en_curso_lock = threading.Lock()
+
+duracion_hash = Histogram()   # segundos desde el envío hasta el resultado
+rechazos = Counter()
+fallos = Counter()            # timeouts y pool roto
+
+_ERRORES_POOL = (TimeoutError, FuturesTimeoutError, asyncio.TimeoutError, BrokenProcessPool)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: no heredar hilos ni conexiones del servidor
+                _executor = ProcessPoolExecutor(
+                    max_workers=HASH_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _enviar(fn, *args) -> Future:
+    global _en_curso
+    with _en_curso_lock:
+        if _en_curso >= HASH_POOL_WORKERS + HASH_POOL_QUEUE_LIMIT:
+            rechazos.inc()
+            raise HashPoolSaturado("Servicio de autenticación saturado. Intente nuevamente.")
+        _en_curso += 1
+
+    inicio = time.perf_counter()
+
+    def _terminar(_):
+        global _en_curso
+        duracion_hash.observe(time.perf_counter() - inicio)
+        with _en_curso_lock:
+            _en_curso -= 1
+
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        _terminar(None)
+        raise
+    future.add_done_callback(_terminar)
+    return future
+
+
+def _no_disponible(e: BaseException) -> HashPoolSaturado:
+    fallos.inc()
+    if isinstance(e, BrokenProcessPool):
+        # El siguiente envío arranca un pool nuevo
+        detener()
+        return HashPoolSaturado("Servicio de autenticación no disponible. Intente nuevamente.")
+    return HashPoolSaturado("Servicio de autenticación saturado. Intente nuevamente.")
+
+
+def _ejecutar(fn, *args):
+    try:
+        return _enviar(fn, *args).result(timeout=HASH_POOL_TIMEOUT)
+    except _ERRORES_POOL as e:
+        raise _no_disponible(e) from e
+
+
+async def _ejecutar_async(fn, *args):
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(_enviar(fn, *args)), HASH_POOL_TIMEOUT)
+    except _ERRORES_POOL as e:
+        raise _no_disponible(e) from e
+
+
+def verificar(plain_password: str, hashed_password: str) -> bool:
+    return _ejecutar(_verificar, plain_password, hashed_password)
+
+
+def hashear(password: str) -> str:
+    return _ejecutar(_hashear, password)
+
+
+async def verificar_async(plain_password: str, hashed_password: str) -> bool:
+    return await _ejecutar_async(_verificar, plain_password, hashed_password)
+
+
+async def hashear_async(password: str) -> str:
+    return await _ejecutar_async(_hashear, password)
+
+
+def iniciar() -> None:
+    """Arranca los procesos (evita pagar el spawn en el primer login)."""
+    executor = _get_executor()
+    for f in [executor.submit(_hashear, "warmup") for _ in range(HASH_POOL_WORKERS)]:
+        f.result()
+
+
+def detener() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def estadisticas() -> dict:
+    return {
+        "workers": HASH_POOL_WORKERS,
+        "queue_limit": HASH_POOL_QUEUE_LIMIT,
+        "en_curso": _en_curso,
+        "rechazos": rechazos.value,
+        "fallos": fallos.value,
+        "duracion_seconds": duracion_hash.snapshot(),
+    }
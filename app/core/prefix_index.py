@@ -0,0 +1,62 @@
+# app/core/prefix_index.py
+"""
+Índice de prefijos en memoria para autocompletado.
+
+Las claves se normalizan (minúsculas, sin tildes ni diéresis) y se guardan
+ordenadas; un prefijo es un rango contiguo de esa lista, que se localiza
+con bisect en O(log n) y se recorre solo hasta `limite` resultados.
+"""
+
+import unicodedata
+from bisect import bisect_left
+from typing import Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def normalizar(texto: str) -> str:
+    """'Áncash' -> 'ancash', 'Cañete' -> 'canete': se escriba como se escriba, coincide."""
+    descompuesto = unicodedata.normalize("NFD", texto.casefold())
+    return " ".join("".join(c for c in descompuesto if not unicodedata.combining(c)).split())
+
+
+class IndicePrefijos(Generic[T]):
+    """
+    Cada valor se indexa por el texto completo y por el inicio de cada
+    palabra ('San Juan de Lurigancho' responde a 'san', 'juan', 'lurig'...).
+    Inmutable una vez construido.
+    """
+
+    def __init__(self, entradas: Iterable[Tuple[str, T]]):
+        pares: List[Tuple[str, int, T]] = []
+        for orden, (texto, valor) in enumerate(entradas):
+            if not texto:
+                continue
+            palabras = normalizar(texto).split(" ")
+            for i in range(len(palabras)):
+                pares.append((" ".join(palabras[i:]), orden, valor))
+        pares.sort(key=lambda p: (p[0], p[1]))
+        self._claves = [p[0] for p in pares]
+        self._entradas = [(p[1], p[2]) for p in pares]
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def buscar(self, prefijo: str, limite: int = 20) -> List[T]:
+        """Valores cuyo texto (o alguna de sus palabras) empieza por `prefijo`, sin repetir."""
+        prefijo = normalizar(prefijo)
+        if not prefijo or limite <= 0:
+            return []
+
+        vistos = set()
+        resultado: List[T] = []
+        i = bisect_left(self._claves, prefijo)
+        while i < len(self._claves) and self._claves[i].startswith(prefijo):
+            orden, valor = self._entradas[i]
+            if orden not in vistos:
+                vistos.add(orden)
+                resultado.append(valor)
+                if len(resultado) >= limite:
+                    break
+            i += 1
+        return resultado
@@ -0,0 +1,139 @@
+# app/core/prometheus.py
+"""
+Exposición de las métricas del proceso en formato de texto de Prometheus
+(GET /metrics). No mantiene estado propio: lee los contadores que ya
+actualizan el middleware HTTP, el ejecutor de SP, el pool de bcrypt, los
+pools de conexiones, los reintentos y las cachés.
+
+Los valores son del worker que responde; con varios workers cada uno se
+raspa por separado (o se agregan en Prometheus).
+"""
+
+from typing import Dict, List, Optional
+
+from app.core import password_pool
+from app.core.cache import CACHES
+from app.core.http_metrics import RUTAS, peticiones_en_curso
+from app.db import retry
+from app.db.pool_stats import pool_snapshot
+from app.db.procedures import PROCEDURE_STATS
+from app.db.session import engine, async_engine, read_engine, async_read_engine, sp_engine, async_sp_engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _etiquetas(labels: Optional[Dict[str, object]]) -> str:
+    if not labels:
+        return ""
+    partes = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        partes.append(f'{k}="{v}"')
+    return "{" + ",".join(partes) + "}"
+
+
+class _Salida:
+    """Agrupa las muestras por familia: el formato exige que sean contiguas."""
+
+    def __init__(self):
+        self._familias: Dict[str, List[str]] = {}   # en orden de aparición
+
+    def _familia(self, nombre: str, tipo: str, ayuda: str) -> List[str]:
+        lineas = self._familias.get(nombre)
+        if lineas is None:
+            lineas = self._familias[nombre] = [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+        return lineas
+
+    def valor(self, nombre: str, tipo: str, ayuda: str, valor: float, labels=None) -> None:
+        self._familia(nombre, tipo, ayuda).append(f"{nombre}{_etiquetas(labels)} {valor}")
+
+    def histograma(self, nombre: str, ayuda: str, snapshot: Dict, labels=None) -> None:
+        """`snapshot` es el de Histogram.snapshot() (buckets ya acumulados)."""
+        lineas = self._familia(nombre, "histogram", ayuda)
+        labels = labels or {}
+        for limite, n in snapshot["buckets"].items():
+            lineas.append(f"{nombre}_bucket{_etiquetas({**labels, 'le': limite})} {n}")
+        lineas.append(f"{nombre}_sum{_etiquetas(labels)} {snapshot['sum']}")
+        lineas.append(f"{nombre}_count{_etiquetas(labels)} {snapshot['count']}")
+
+    def texto(self) -> str:
+        return "\n".join(l for lineas in self._familias.values() for l in lineas) + "\n"
+
+
+def _http(out: _Salida) -> None:
+    out.valor("http_requests_in_progress", "gauge", "Peticiones HTTP en curso.", peticiones_en_curso.value)
+    for (metodo, ruta), m in sorted(RUTAS.items()):
+        base = {"method": metodo, "route": ruta}
+        for status_code, contador in sorted(m.por_status.items()):
+            out.valor("http_requests_total", "counter", "Peticiones HTTP por ruta y código de estado.",
+                      contador.value, {**base, "status": status_code})
+        out.histograma("http_request_duration_seconds", "Latencia de las peticiones HTTP por ruta.",
+                       m.duracion.snapshot(), base)
+        out.histograma("http_request_db_seconds", "Tiempo en la BD por petición HTTP, por ruta.",
+                       m.tiempo_bd.snapshot(), base)
+        out.histograma("http_request_db_statements", "Sentencias SQL por petición HTTP, por ruta.",
+                       m.sentencias.snapshot(), base)
+
+
+def _procedimientos(out: _Salida) -> None:
+    for s in sorted(PROCEDURE_STATS.values(), key=lambda s: s.nombre):
+        out.valor("db_procedure_calls_total", "counter", "Llamadas por procedimiento almacenado.",
+                  s.llamadas.value, {"procedure": s.nombre})
+        out.valor("db_procedure_errors_total", "counter", "Errores por procedimiento almacenado.",
+                  s.errores.value, {"procedure": s.nombre})
+        out.histograma("db_procedure_duration_seconds", "Latencia por procedimiento almacenado.",
+                       s.latencia.snapshot(), {"procedure": s.nombre})
+
+
+def _bcrypt(out: _Salida) -> None:
+    stats = password_pool.estadisticas()
+    out.valor("bcrypt_in_progress", "gauge", "Operaciones bcrypt en curso o en cola.", stats["en_curso"])
+    out.valor("bcrypt_rejected_total", "counter", "Operaciones bcrypt rechazadas por saturación.", stats["rechazos"])
+    out.valor("bcrypt_failed_total", "counter", "Operaciones bcrypt sin resultado (timeout o pool roto).", stats["fallos"])
+    out.histograma("bcrypt_duration_seconds", "Duración de hash/verificación bcrypt (incluye cola).",
+                   stats["duracion_seconds"])
+
+
+def _pools(out: _Salida) -> None:
+    engines = []
+    for e in (engine, async_engine, read_engine, async_read_engine, sp_engine, async_sp_engine):
+        if e is not None and e not in engines:
+            engines.append(e)
+    for s in (pool_snapshot(e) for e in engines):
+        pool = {"pool": s.get("nombre", s["pool"])}
+        if "size" in s:
+            out.valor("db_pool_size", "gauge", "Conexiones base del pool.", s["size"], pool)
+            out.valor("db_pool_max_overflow", "gauge", "Conexiones extra permitidas.", s["max_overflow"], pool)
+            out.valor("db_pool_checked_out", "gauge", "Conexiones en uso.", s["checked_out"], pool)
+            out.valor("db_pool_overflow", "gauge", "Conexiones extra abiertas (negativo: huecos del pool base).",
+                      s["overflow"], pool)
+        if "checkout_wait_seconds" in s:
+            out.valor("db_pool_checkout_timeouts_total", "counter", "Checkouts que agotaron pool_timeout.",
+                      s["checkout_timeouts"], pool)
+            out.valor("db_pool_checkout_errors_total", "counter", "Checkouts fallidos por otros errores.",
+                      s["checkout_errors"], pool)
+            out.histograma("db_pool_checkout_wait_seconds", "Espera para obtener una conexión del pool.",
+                           s["checkout_wait_seconds"], pool)
+
+
+def _reintentos_y_caches(out: _Salida) -> None:
+    out.valor("db_retries_total", "counter", "Reintentos por deadlock o lock wait timeout.",
+              retry.reintentos_totales.value)
+    out.valor("db_retries_exhausted_total", "counter", "Operaciones que agotaron los reintentos.",
+              retry.reintentos_agotados.value)
+    for nombre, cache in sorted(CACHES.items()):
+        labels = {"cache": nombre}
+        out.valor("cache_hits_total", "counter", "Aciertos de la caché en memoria.", cache.hits.value, labels)
+        out.valor("cache_misses_total", "counter", "Fallos de la caché en memoria.", cache.misses.value, labels)
+        out.valor("cache_evictions_total", "counter", "Entradas expulsadas por tamaño.", cache.evictions.value, labels)
+        out.valor("cache_size", "gauge", "Entradas en la caché.", len(cache), labels)
+
+
+def exponer() -> str:
+    out = _Salida()
+    _http(out)
+    _procedimientos(out)
+    _bcrypt(out)
+    _pools(out)
+    _reintentos_y_caches(out)
+    return out.texto()
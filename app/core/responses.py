@@ -0,0 +1,61 @@
+# app/core/responses.py
+"""
+Respuesta rápida para los listados con el sobre APIResponse.
+
+Si el endpoint devuelve APIResponse(result=[...]), FastAPI vuelve a volcar
+cada DTO a dict, valida el sobre contra response_model, lo serializa a
+tipos JSON y por último json.dumps lo convierte en texto: cuatro pasadas
+en Python por fila. Los DTO de los servicios ya están validados, así que
+aquí se serializan una sola vez con un TypeAdapter de pydantic (en Rust),
+cacheado por tipo de fila, y se devuelve la Response ya construida.
+
+El JSON es el mismo que genera response_model=APIResponse (by_alias=True,
+mismo orden de claves), que se mantiene en el decorador para la
+documentación OpenAPI.
+"""
+
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+
+@lru_cache(maxsize=None)
+def adaptador_respuesta(tipo_fila: Any) -> TypeAdapter:
+    """TypeAdapter del sobre APIResponse con `result: List[tipo_fila]`."""
+    Sobre = TypedDict("Sobre", {
+        "mensaje": str,
+        "codigo": Optional[str],
+        "status_code": int,
+        "result": Optional[List[tipo_fila]],
+        "cursor_siguiente": Optional[str],
+    })
+    return TypeAdapter(Sobre)
+
+
+def respuesta_lista(
+    tipo_fila: Any,
+    *,
+    mensaje: str,
+    codigo: Optional[str],
+    status_code: int,
+    result: Optional[List[Any]],
+    cursor_siguiente: Optional[str] = None,
+) -> Response:
+    """
+    Equivalente a devolver APIResponse(...) con filas de tipo `tipo_fila`
+    (un DTO o Dict[str, Any]), sin la validación ni el volcado de FastAPI.
+    """
+    cuerpo = adaptador_respuesta(tipo_fila).dump_json(
+        {
+            "mensaje": mensaje,
+            "codigo": codigo,
+            "status_code": status_code,
+            "result": result,
+            "cursor_siguiente": cursor_siguiente,
+        },
+        by_alias=True,
+    )
+    return Response(content=cuerpo, status_code=status_code, media_type="application/json")
@@ -2,16 +2,35 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from starlette.concurrency import run_in_threadpool
+from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, HASH_POOL_ENABLED
+from app.core import password_pool
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt se ejecuta en el pool de procesos (app/core/password_pool.py);
+# con HASH_POOL_ENABLED=false vuelve a ejecutarse en línea.
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if HASH_POOL_ENABLED:
+        return password_pool.verificar(plain_password, hashed_password)
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
+    if HASH_POOL_ENABLED:
+        return password_pool.hashear(password)
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    if HASH_POOL_ENABLED:
+        return await password_pool.verificar_async(plain_password, hashed_password)
+    return await run_in_threadpool(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    if HASH_POOL_ENABLED:
+        return await password_pool.hashear_async(password)
+    return await run_in_threadpool(pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -20,4 +39,4 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
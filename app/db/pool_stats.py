@@ -0,0 +1,80 @@
+# app/db/pool_stats.py
+"""
+Estadísticas del pool de conexiones: tiempo de espera en checkout
+(histograma), fallos de checkout y ocupación actual del QueuePool.
+"""
+
+import time
+from typing import Dict, Any, Type
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.metrics import Counter, Histogram
+
+
+class PoolStats:
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = Counter()
+        self.checkout_errors = Counter()
+
+
+# Un PoolStats por engine ("primary", "async", ...)
+POOL_STATS: Dict[str, PoolStats] = {}
+
+
+def instrumented_pool_class(nombre: str, base: Type[QueuePool] = QueuePool) -> Type[QueuePool]:
+    """
+    Devuelve una subclase de `base` que mide cada checkout. Se usa como
+    `poolclass` de create_engine; `Pool.recreate()` conserva la clase y,
+    por tanto, las estadísticas.
+    """
+    stats = POOL_STATS.setdefault(nombre, PoolStats(nombre))
+
+    class InstrumentedPool(base):
+        _stats = stats
+
+        def _do_get(self):
+            inicio = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except sa_exc.TimeoutError:
+                self._stats.checkout_timeouts.inc()
+                raise
+            except Exception:
+                self._stats.checkout_errors.inc()
+                raise
+            self._stats.checkout_wait.observe(time.perf_counter() - inicio)
+            return conn
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def pool_snapshot(engine) -> Dict[str, Any]:
+    """Ocupación actual + estadísticas acumuladas del pool de `engine` (sync o async)."""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    pool: Pool = sync_engine.pool
+    stats: PoolStats = getattr(pool, "_stats", None)
+
+    snapshot: Dict[str, Any] = {"pool": pool.__class__.__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    if stats is not None:
+        snapshot.update({
+            "nombre": stats.nombre,
+            "checkout_wait_seconds": stats.checkout_wait.snapshot(),
+            "checkout_timeouts": stats.checkout_timeouts.value,
+            "checkout_errors": stats.checkout_errors.value,
+        })
+    return snapshot
@@ -0,0 +1,229 @@
+# app/db/procedures.py
+"""
+Ejecutor común de procedimientos almacenados.
+
+Los SP con parámetros OUT necesitan leer variables de sesión (@p_Out_...)
+tras el CALL. Con DB_SP_MULTI_STATEMENTS el CALL y el SELECT de las
+variables viajan en un único round trip por un cursor DBAPI del engine de
+procedimientos (app/db/session.sp_engine, el único con
+CLIENT.MULTI_STATEMENTS). Ese lote va en autocommit, fuera de la
+transacción de la sesión: solo lo usan las llamadas `autonomo=True` (SP
+que solo leen o que confirman ellos mismos). El resto envía CALL y SELECT
+como dos sentencias por la sesión. Una consulta `previa` (un SELECT que el
+servicio necesita junto con el SP, p.ej. el estado de bloqueo del login)
+viaja en el mismo lote.
+
+Cada llamada registra número de ejecuciones, errores y un histograma de
+latencia por procedimiento (ver /admin/procedures).
+
+En SQLite los SP no existen: los benchmarks registran como backend
+"sqlite" una emulación con consultas equivalentes
+(benchmarks/procedures_sqlite.py); la aplicación no la carga.
+"""
+
+import time
+from functools import lru_cache
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, text
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session
+
+from app.core.metrics import Counter, Histogram
+from app.db.query_stats import registrar_sentencia
+from app.db.session import engine_procedimientos
+
+# Columna extra del SELECT de OUT: marca el último conjunto de resultados.
+# El cursor adaptado de SQLAlchemy para aiomysql no devuelve el valor de
+# nextset(), así que el fin de la respuesta se detecta por esta columna.
+_FIN = "_fin_sp"
+_MAX_CONJUNTOS = 64
+
+
+@dataclass(frozen=True)
+class ProcedureResult:
+    nombre: str
+    filas: List[Dict[str, Any]] = field(default_factory=list)   # primer result set del SP
+    out: Dict[str, Any] = field(default_factory=dict)           # variables OUT por nombre
+    previa: List[Dict[str, Any]] = field(default_factory=list)  # filas de la consulta previa
+
+    @property
+    def mensaje(self) -> Optional[str]:
+        return self.out.get("p_Out_Message")
+
+
+# ============================================================
+# ESTADÍSTICAS POR PROCEDIMIENTO
+# ============================================================
+
+class ProcedureStats:
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.llamadas = Counter()
+        self.errores = Counter()
+        self.latencia = Histogram()
+
+
+PROCEDURE_STATS: Dict[str, ProcedureStats] = {}
+
+
+def procedure_snapshot() -> List[Dict[str, Any]]:
+    return [
+        {
+            "procedimiento": s.nombre,
+            "llamadas": s.llamadas.value,
+            "errores": s.errores.value,
+            "latencia_seconds": s.latencia.snapshot(),
+        }
+        for s in sorted(PROCEDURE_STATS.values(), key=lambda s: s.nombre)
+    ]
+
+
+# ============================================================
+# BACKENDS POR DIALECTO
+# ============================================================
+# fn(session, nombre, params, out) -> ProcedureResult. El dialecto que no
+# esté registrado usa la ejecución genérica en dos sentencias.
+
+Backend = Callable[[Session, str, Dict[str, Any], Sequence[str]], ProcedureResult]
+_BACKENDS: Dict[str, Backend] = {}
+
+
+def registrar_backend(dialecto: str, fn: Backend) -> None:
+    _BACKENDS[dialecto] = fn
+
+
+def ejecutar_sp(
+    session: Session,
+    nombre: str,
+    params: Optional[Dict[str, Any]] = None,
+    out: Sequence[str] = (),
+    previa: Optional[Select] = None,
+    autonomo: bool = False,
+) -> ProcedureResult:
+    """
+    Ejecuta CALL nombre(:param..., @out...) y devuelve filas y variables OUT.
+    `params` se pasa en el orden de la firma del SP; `out` son los nombres
+    de las variables OUT sin '@'. `previa` se ejecuta antes del CALL y sus
+    filas quedan en resultado.previa. No hace commit: lo decide el servicio.
+
+    `autonomo=True` declara que el SP no necesita la transacción de la
+    sesión (solo lee, o abre y confirma la suya): entonces previa, CALL y
+    OUT pueden ir en un round trip por el engine de procedimientos.
+    """
+    params = params or {}
+    stats = PROCEDURE_STATS.get(nombre) or PROCEDURE_STATS.setdefault(nombre, ProcedureStats(nombre))
+    dialecto = session.get_bind().dialect.name
+
+    inicio = time.perf_counter()
+    try:
+        backend = _BACKENDS.get(dialecto)
+        motor = engine_procedimientos(session.get_bind().dialect.is_async) if autonomo else None
+        if (out or previa is not None) and backend is None and dialecto == "mysql" and motor is not None:
+            resultado = _ejecutar_multi_statement(session, motor, nombre, params, out, previa)
+        else:
+            filas_previa = _filas(session.execute(previa)) if previa is not None else []
+            if backend is not None:
+                resultado = backend(session, nombre, params, out)
+            else:
+                resultado = _ejecutar_generico(session, nombre, params, out)
+            if previa is not None:
+                resultado = replace(resultado, previa=filas_previa)
+    except Exception:
+        stats.errores.inc()
+        raise
+    finally:
+        stats.llamadas.inc()
+        stats.latencia.observe(time.perf_counter() - inicio)
+
+    return resultado
+
+
+# ============================================================
+# IMPLEMENTACIONES
+# ============================================================
+
+def _filas(resultado) -> List[Dict[str, Any]]:
+    return [dict(r) for r in resultado.mappings().all()]
+
+
+def _ejecutar_generico(
+    session: Session, nombre: str, params: Dict[str, Any], out: Sequence[str]
+) -> ProcedureResult:
+    argumentos = [f":{p}" for p in params] + [f"@{o}" for o in out]
+    resultado = session.execute(text(f"CALL {nombre}({', '.join(argumentos)});"), params)
+    filas = _filas(resultado) if resultado.returns_rows else []
+
+    valores: Dict[str, Any] = {}
+    if out:
+        fila = session.execute(
+            text("SELECT " + ", ".join(f"@{o} AS {o}" for o in out) + ";")
+        ).mappings().first()
+        valores = dict(fila) if fila is not None else {}
+
+    return ProcedureResult(nombre, filas, valores)
+
+
+@lru_cache(maxsize=None)
+def _dialecto_pyformat(clase_dialecto):
+    return clase_dialecto(paramstyle="pyformat")
+
+
+def _ejecutar_multi_statement(
+    session: Session, motor, nombre: str, params: Dict[str, Any], out: Sequence[str],
+    previa: Optional[Select] = None,
+) -> ProcedureResult:
+    # Conexión del engine de procedimientos (multi-statement, autocommit),
+    # no la de la sesión: el lote no entra en su transacción
+    with motor.connect() as conexion:
+        return _lote_multi_statement(session, conexion, nombre, params, out, previa)
+
+
+def _lote_multi_statement(
+    session: Session, conexion, nombre: str, params: Dict[str, Any], out: Sequence[str],
+    previa: Optional[Select],
+) -> ProcedureResult:
+    argumentos = [f"%({p})s" for p in params] + [f"@{o}" for o in out]
+    sql = (
+        f"CALL {nombre}({', '.join(argumentos)}); "
+        "SELECT " + ", ".join([f"@{o} AS {o}" for o in out] + [f"1 AS {_FIN}"]) + ";"
+    )
+    if previa is not None:
+        # Parámetros con nombre (pyformat), como los del CALL
+        compilada = previa.compile(dialect=_dialecto_pyformat(type(conexion.dialect)))
+        params = {**compilada.params, **params}
+        sql = f"{compilada}; {sql}"
+
+    dbapi = conexion.dialect.loaded_dbapi
+    cursor = conexion.connection.dbapi_connection.cursor()
+    conjuntos: List[List[Dict[str, Any]]] = []
+    inicio = time.perf_counter()
+    try:
+        cursor.execute(sql, params)
+        for _ in range(_MAX_CONJUNTOS):
+            if cursor.description is not None:
+                columnas = [d[0] for d in cursor.description]
+                conjuntos.append([dict(zip(columnas, f)) for f in cursor.fetchall()])
+                if columnas[-1] == _FIN:
+                    break
+            cursor.nextset()
+        else:
+            raise RuntimeError(f"{nombre}: no se recibieron los parámetros OUT.")
+    except dbapi.Error as e:
+        raise DBAPIError.instance(sql, params, e, dbapi.Error) from e
+    finally:
+        cursor.close()
+        # El cursor propio no dispara los eventos del engine: un round trip,
+        # contado en el engine de la sesión (el que miden QueryCounter y
+        # el consumo por petición)
+        registrar_sentencia(
+            session.get_bind(), sql, time.perf_counter() - inicio,
+            filas=sum(len(c) for c in conjuntos),
+        )
+
+    valores = conjuntos.pop()[0]
+    valores.pop(_FIN)
+    filas_previa = conjuntos.pop(0) if previa is not None else []
+    return ProcedureResult(nombre, conjuntos[0] if conjuntos else [], valores, filas_previa)
+
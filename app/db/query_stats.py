@@ -0,0 +1,158 @@
+# app/db/query_stats.py
+"""
+Conteo de sentencias SQL enviadas a la BD. Cada sentencia es un round trip
+(sobre TLS en la BD cloud), así que el número por operación es la forma
+más directa de detectar regresiones como un SELECT o COMMIT de más.
+
+Además acumula, por petición HTTP, sentencias, filas y tiempo de BD (ver
+app/core/http_metrics.py): el consumo vive en una ContextVar que heredan
+el threadpool y run_sync, así que cuenta todo lo que la petición ejecuta.
+
+presupuesto_sql() fija un máximo de sentencias para un bloque (una
+petición a un endpoint, un servicio) y falla si se supera; lo usa
+benchmarks/check_query_budget.py para frenar regresiones N+1.
+
+Lo que se ejecuta con un cursor DBAPI propio (el CALL multi-sentencia de
+app/db/procedures.py) no pasa por los eventos del engine: se anota con
+registrar_sentencia().
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Cuenta las sentencias que `engine` (sync o async) ejecuta dentro de
+    un bloque `with`:
+
+        with QueryCounter(engine) as qc:
+            authenticate_user_with_sp(session, "jperez", "secreto")
+        assert qc.total <= 2, qc.sentencias
+    """
+
+    def __init__(self, engine):
+        self.engine: Engine = getattr(engine, "sync_engine", engine)
+        self.sentencias: List[str] = []
+
+    def _antes_de_ejecutar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._antes_de_ejecutar)
+        _contadores_activos.append(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._antes_de_ejecutar)
+        _contadores_activos.remove(self)
+
+    @property
+    def total(self) -> int:
+        return len(self.sentencias)
+
+    def reset(self) -> None:
+        self.sentencias.clear()
+
+
+# QueryCounter dentro de su bloque `with` (para registrar_sentencia)
+_contadores_activos: List[QueryCounter] = []
+
+
+class PresupuestoSQLExcedido(AssertionError):
+    """Un bloque ejecutó más sentencias que su presupuesto."""
+
+
+@contextmanager
+def presupuesto_sql(engine, maximo: int, etiqueta: str = "") -> Iterator[QueryCounter]:
+    """
+    Falla con PresupuestoSQLExcedido (y la lista de sentencias) si el
+    bloque ejecuta en `engine` más de `maximo` sentencias:
+
+        with presupuesto_sql(engine, 4, "POST /account/deposito"):
+            client.post("/api/v1/account/deposito", json=...)
+    """
+    with QueryCounter(engine) as qc:
+        yield qc
+    if qc.total > maximo:
+        detalle = "\n".join(f"  {i}. {' '.join(s.split())[:200]}" for i, s in enumerate(qc.sentencias, 1))
+        raise PresupuestoSQLExcedido(
+            f"{etiqueta or 'bloque'}: {qc.total} sentencias SQL, presupuesto {maximo}\n{detalle}"
+        )
+
+
+# ============================================================
+# CONSUMO DE BD POR PETICIÓN
+# ============================================================
+
+class ConsumoBD:
+    __slots__ = ("sentencias", "filas", "segundos")
+
+    def __init__(self):
+        self.sentencias = 0
+        self.filas = 0          # según cursor.rowcount (ver _fin_sentencia)
+        self.segundos = 0.0
+
+
+_consumo_actual: ContextVar[Optional[ConsumoBD]] = ContextVar("consumo_bd", default=None)
+
+
+def iniciar_consumo() -> Token:
+    """Empieza a acumular en un ConsumoBD nuevo (consumo_actual())."""
+    return _consumo_actual.set(ConsumoBD())
+
+
+def consumo_actual() -> Optional[ConsumoBD]:
+    return _consumo_actual.get()
+
+
+def terminar_consumo(token: Token) -> None:
+    _consumo_actual.reset(token)
+
+
+def _inicio_sentencia(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _consumo_actual.get() is not None:
+        context._inicio_bd = time.perf_counter()
+
+
+def _fin_sentencia(conn, cursor, statement, parameters, context, executemany):
+    consumo = _consumo_actual.get()
+    inicio = getattr(context, "_inicio_bd", None)
+    if consumo is not None and inicio is not None:
+        consumo.sentencias += 1
+        consumo.segundos += time.perf_counter() - inicio
+        # Filas afectadas por DML; en SELECT, las leídas si el driver las
+        # conoce al ejecutar (pymysql las trae todas) y -1 si no (sqlite3)
+        if cursor.rowcount > 0:
+            consumo.filas += cursor.rowcount
+
+
+def instrumentar_engine(engine) -> None:
+    """Suma cada sentencia de `engine` (sync o async) al consumo de la petición en curso."""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _inicio_sentencia):
+        event.listen(sync_engine, "before_cursor_execute", _inicio_sentencia)
+        event.listen(sync_engine, "after_cursor_execute", _fin_sentencia)
+
+
+def registrar_sentencia(engine, statement: str, segundos: float, filas: int = 0) -> None:
+    """
+    Anota una sentencia ejecutada fuera de los eventos del engine (cursor
+    DBAPI propio): la ven los QueryCounter activos de `engine` y, si está
+    instrumentado, el consumo de la petición en curso.
+    """
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    for contador in list(_contadores_activos):
+        if contador.engine is sync_engine:
+            contador.sentencias.append(statement)
+
+    consumo = _consumo_actual.get()
+    if consumo is not None and event.contains(sync_engine, "after_cursor_execute", _fin_sentencia):
+        consumo.sentencias += 1
+        consumo.segundos += segundos
+        consumo.filas += filas
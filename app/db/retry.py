@@ -0,0 +1,80 @@
+# app/db/retry.py
+"""
+Reintento transparente de transacciones que fallan por contención:
+deadlock (MySQL 1213), lock wait timeout (MySQL 1205) o "database is
+locked" (SQLite). Backoff exponencial acotado con jitter.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Callable, Tuple
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import DB_RETRY_MAX, DB_RETRY_BACKOFF_BASE_MS, DB_RETRY_BACKOFF_MAX_MS
+from app.core.metrics import Counter
+from app.db.session import run_service
+
+MYSQL_DEADLOCK = 1213
+MYSQL_LOCK_WAIT_TIMEOUT = 1205
+
+# Totales del proceso (ver /metrics)
+reintentos_totales = Counter()
+reintentos_agotados = Counter()
+
+
+def es_error_reintentable(exc: BaseException) -> bool:
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    codigo = orig.args[0] if orig is not None and orig.args else None
+    if codigo in (MYSQL_DEADLOCK, MYSQL_LOCK_WAIT_TIMEOUT):
+        return True
+    return "database is locked" in str(orig)
+
+
+def backoff_segundos(intento: int) -> float:
+    """Espera antes del reintento `intento` (1, 2, ...): base·2^(n-1) con jitter, tope máximo."""
+    tope = min(DB_RETRY_BACKOFF_MAX_MS, DB_RETRY_BACKOFF_BASE_MS * (2 ** (intento - 1)))
+    return random.uniform(tope / 2, tope) / 1000.0
+
+
+def con_reintentos(session, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, int]:
+    """
+    Ejecuta fn(session, ...) — que debe abrir y confirmar su propia
+    transacción — reintentando si falla por contención.
+    Devuelve (resultado, nº de reintentos).
+    """
+    intento = 0
+    while True:
+        try:
+            return fn(session, *args, **kwargs), intento
+        except DBAPIError as e:
+            session.rollback()
+            if not es_error_reintentable(e):
+                raise
+            if intento >= DB_RETRY_MAX:
+                reintentos_agotados.inc()
+                raise
+            intento += 1
+            reintentos_totales.inc()
+            time.sleep(backoff_segundos(intento))
+
+
+async def con_reintentos_async(session, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, int]:
+    """Igual que con_reintentos, pero la espera no bloquea el event loop."""
+    intento = 0
+    while True:
+        try:
+            return await run_service(session, fn, *args, **kwargs), intento
+        except DBAPIError as e:
+            await run_service(session, lambda s: s.rollback())
+            if not es_error_reintentable(e):
+                raise
+            if intento >= DB_RETRY_MAX:
+                reintentos_agotados.inc()
+                raise
+            intento += 1
+            reintentos_totales.inc()
+            await asyncio.sleep(backoff_segundos(intento))
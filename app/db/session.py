@@ -1,11 +1,30 @@
+import ssl
 from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 from app.core.config import (
     DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_ASYNC,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
     DB_HOST,
     DB_USERNAME,
     DB_PASSWORD,
     DB_NAME,
+    DB_SP_MULTI_STATEMENTS,
+    READ_DATABASE_URL,
+    ASYNC_READ_DATABASE_URL,
 )
+from app.db.pool_stats import instrumented_pool_class
+from app.db.query_stats import instrumentar_engine
 import logging
 
 # === DIAGNÓSTICO: IMPRIMIR CONEXIÓN REAL ===
@@ -15,21 +34,179 @@ print(f"🔗 DATABASE_URL → {DATABASE_URL}")
 print(f"🏠 HOST_DB      → {DB_HOST}")
 print(f"👤 USER_DB      → {DB_USERNAME}")
 print(f"📦 DB_NAME      → {DB_NAME}")
+print(f"⚡ DB_ASYNC     → {DB_ASYNC}")
 print("====================================================")
 
 ssl_args = {'ssl': {'ca': 'ca.pem'}}
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --- CONFIGURACIÓN DEL POOL (ver app/core/config.py) ---
+
+pool_args = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+logger.info(f"🏊 Pool de conexiones: {pool_args}")
+
 # --- LÓGICA DE CONEXIÓN CONDICIONAL ---
 
-if DB_HOST in ("localhost", "127.0.0.1"):
+if DB_HOST in ("localhost", "127.0.0.1") or not DATABASE_URL.startswith("mysql"):
     logger.info("🔧 Detectado entorno local. Creando engine de base de datos sin SSL.")
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=instrumented_pool_class("primary"), **pool_args
+    )
 else:
     logger.info("☁️ Detectado entorno de nube/producción. Creando engine con SSL.")
     ssl_args = {'ssl': {'ca': 'ca.pem'}}
-    engine = create_engine(DATABASE_URL, connect_args=ssl_args)
+    engine = create_engine(
+        DATABASE_URL, connect_args=ssl_args,
+        poolclass=instrumented_pool_class("primary"), **pool_args
+    )
+
+
+# --- ENGINE ASÍNCRONO (solo si DB_ASYNC está activo) ---
+# Los drivers async (aiomysql/asyncmy) esperan un SSLContext en lugar del dict de pymysql.
+
+async_engine = None
+
+if DB_ASYNC:
+    async_pool_class = instrumented_pool_class("async", base=AsyncAdaptedQueuePool)
+    if DB_HOST in ("localhost", "127.0.0.1"):
+        logger.info("🔧 Creando engine ASÍNCRONO sin SSL.")
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=async_pool_class, **pool_args
+        )
+    else:
+        logger.info("☁️ Creando engine ASÍNCRONO con SSL.")
+        async_ssl_args = {'ssl': ssl.create_default_context(cafile='ca.pem')}
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, connect_args=async_ssl_args,
+            poolclass=async_pool_class, **pool_args
+        )
+
+
+# --- RÉPLICA DE LECTURA (READ_DATABASE_URL, opcional) ---
+# Los listados e informes (ReadSessionDep) leen de read_engine. Sin réplica
+# configurada es el mismo engine primario (mismo pool).
+
+def _args_conexion(url: str, asincrono: bool = False) -> dict:
+    if not url.startswith("mysql") or make_url(url).host in ("localhost", "127.0.0.1"):
+        return {}
+    return {'ssl': ssl.create_default_context(cafile='ca.pem')} if asincrono else ssl_args
+
+
+def _conexiones_solo_lectura(sync_engine) -> None:
+    """Cada conexión nueva de la réplica se abre en modo solo lectura."""
+    sentencia = (
+        "PRAGMA query_only = ON" if sync_engine.dialect.name == "sqlite"
+        else "SET SESSION TRANSACTION READ ONLY"
+    )
+
+    @event.listens_for(sync_engine, "connect")
+    def _connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute(sentencia)
+        cursor.close()
+
+
+read_engine = engine
+async_read_engine = async_engine
+replica_configurada = READ_DATABASE_URL is not None
+
+if replica_configurada:
+    logger.info("📖 Réplica de lectura configurada: los listados leen de READ_DATABASE_URL.")
+    read_engine = create_engine(
+        READ_DATABASE_URL, connect_args=_args_conexion(READ_DATABASE_URL),
+        poolclass=instrumented_pool_class("replica"), **pool_args
+    )
+    _conexiones_solo_lectura(read_engine)
+
+    if DB_ASYNC:
+        async_read_engine = create_async_engine(
+            ASYNC_READ_DATABASE_URL, connect_args=_args_conexion(ASYNC_READ_DATABASE_URL, asincrono=True),
+            poolclass=instrumented_pool_class("async_replica", base=AsyncAdaptedQueuePool), **pool_args
+        )
+        _conexiones_solo_lectura(async_read_engine.sync_engine)
+
+
+# --- MULTI-STATEMENTS PARA LOS SP (ver app/db/procedures.py) ---
+# Solo el CALL multi-sentencia usa CLIENT.MULTI_STATEMENTS, así que va por
+# un engine propio: el resto del tráfico no admite sentencias apiladas y
+# conserva el client_flag que arma el dialecto. client_flag lo reemplaza
+# entero, por eso se repite FOUND_ROWS (rowcount de los UPDATE del SP).
+# En AUTOCOMMIT: el lote no comparte la transacción de la sesión, así que
+# solo se usa para SP que solo leen o confirman ellos mismos.
+
+sp_engine = None
+async_sp_engine = None
+
+if DB_SP_MULTI_STATEMENTS and DATABASE_URL.startswith("mysql"):
+    from pymysql.constants import CLIENT
+
+    _sp_flag = {"client_flag": CLIENT.MULTI_STATEMENTS | CLIENT.FOUND_ROWS}
+    sp_engine = create_engine(
+        DATABASE_URL, connect_args={**_args_conexion(DATABASE_URL), **_sp_flag},
+        isolation_level="AUTOCOMMIT", poolclass=instrumented_pool_class("procedures"), **pool_args
+    )
+    if DB_ASYNC:
+        async_sp_engine = create_async_engine(
+            ASYNC_DATABASE_URL, connect_args={**_args_conexion(ASYNC_DATABASE_URL, asincrono=True), **_sp_flag},
+            isolation_level="AUTOCOMMIT",
+            poolclass=instrumented_pool_class("async_procedures", base=AsyncAdaptedQueuePool), **pool_args
+        )
+
+
+def engine_procedimientos(asincrono: bool):
+    """Engine (sync) del CALL multi-sentencia, o None si no está activo."""
+    if asincrono:
+        return async_sp_engine.sync_engine if async_sp_engine is not None else None
+    return sp_engine
+
+
+# Tiempo de BD por petición (ver app/core/http_metrics.py)
+for _e in (engine, async_engine, read_engine, async_read_engine):
+    if _e is not None:
+        instrumentar_engine(_e)
+
+
+class SesionLectura(Session):
+    """
+    Sesión de los listados. No confirma: al cerrarse hace rollback. Sobre el
+    primario (sin réplica, o read-your-writes) cada transacción se abre
+    READ ONLY en MySQL; en la réplica ya lo es la conexión entera.
+    """
+
+
+_READ_ONLY_POR_TRANSACCION = "read_only_por_transaccion"
+
+
+@event.listens_for(SesionLectura, "after_begin")
+def _transaccion_solo_lectura(session, _transaction, connection):
+    if session.info.get(_READ_ONLY_POR_TRANSACCION) and connection.dialect.name == "mysql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def nueva_sesion_lectura(primario: bool = False) -> SesionLectura:
+    """
+    Sesión sobre la réplica; con `primario=True` (o sin réplica) sobre el
+    primario, para quien necesita ver lo que acaba de escribir.
+    """
+    bind = engine if primario else read_engine
+    return SesionLectura(bind, info={_READ_ONLY_POR_TRANSACCION: bind is engine})
+
+
+def nueva_sesion_lectura_async(primario: bool = False) -> AsyncSession:
+    bind = async_engine if primario else async_read_engine
+    return AsyncSession(
+        bind, sync_session_class=SesionLectura,
+        info={_READ_ONLY_POR_TRANSACCION: bind is async_engine}
+    )
 
 
 def create_db_and_tables():
@@ -39,3 +216,34 @@ def create_db_and_tables():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
+# Dependencia que usan los endpoints: sesión async si DB_ASYNC, si no la síncrona de siempre.
+get_db_session = get_async_session if DB_ASYNC else get_session
+
+
+def get_read_session(primario: bool = False):
+    with nueva_sesion_lectura(primario) as session:
+        yield session
+
+
+async def get_async_read_session(primario: bool = False):
+    async with nueva_sesion_lectura_async(primario) as session:
+        yield session
+
+
+async def run_service(session, fn, *args, **kwargs):
+    """
+    Ejecuta una función de servicio síncrona (fn(session, ...)) sin bloquear el event loop.
+
+    - AsyncSession: se usa run_sync, la E/S va por el driver async y no ocupa hilos.
+    - Session: se delega al threadpool de Starlette (comportamiento anterior).
+    """
+    if isinstance(session, AsyncSession):
+        return await session.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, session, *args, **kwargs)
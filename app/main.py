@@ -1,11 +1,22 @@
-from fastapi import FastAPI
+import secrets
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from app.api.v1.api import api_router
+from app.core import password_pool, prometheus
+from app.core.config import HASH_POOL_ENABLED, METRICS_TOKEN
+from app.core.http_metrics import MetricasMiddleware
+from app.db.session import engine
+from app.services import catalogos_service
+from sqlmodel import Session
 import logging
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Sistema Bancario API")
 
+# Peticiones, latencia y tiempo de BD por ruta (ver GET /metrics)
+app.add_middleware(MetricasMiddleware)
+
 # ❗ No crear tablas automáticamente
 def safe_create_db_and_tables():
     try:
@@ -17,11 +28,36 @@ def safe_create_db_and_tables():
 @app.on_event("startup")
 def on_startup():
     # ❗ NO LLAMAR safe_create_db_and_tables
+    if HASH_POOL_ENABLED:
+        try:
+            password_pool.iniciar()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo arrancar el pool de bcrypt: {e}")
+    try:
+        # Catálogos en memoria; si la BD no responde se cargan en el primer uso
+        with Session(engine) as session:
+            catalogos_service.cargar_catalogos(session)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudieron cargar los catálogos al iniciar: {e}")
     logger.info("🚀 Sistema Bancario API iniciado correctamente (sin crear tablas).")
 
+@app.on_event("shutdown")
+def on_shutdown():
+    password_pool.detener()
+
 # Registrar rutas
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
 def read_root():
     return {"message": "Bienvenido al API del Sistema Bancario"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Métricas del worker en formato de texto de Prometheus."""
+    if METRICS_TOKEN is not None:
+        autorizacion = request.headers.get("authorization", "")
+        if not secrets.compare_digest(autorizacion, f"Bearer {METRICS_TOKEN}"):
+            return PlainTextResponse("No autorizado.\n", status_code=401)
+    return PlainTextResponse(prometheus.exponer(), media_type=prometheus.CONTENT_TYPE)
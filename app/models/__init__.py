@@ -1,4 +1,6 @@
 from .client import Cliente
 from .user import Usuario
-from .account import Cuenta, Movimiento
+from .account import Cuenta, Movimiento, SecuenciaOperacion, ResumenDiario
 from .common import Estado, Ubigeo, TipoCuenta, TipoMovimiento
+from .idempotencia import Idempotencia
+from .embargo import Embargo
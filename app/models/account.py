@@ -1,4 +1,5 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 from datetime import date
 from decimal import Decimal
@@ -21,12 +22,22 @@ class Cuenta(SQLModel, table=True):
     SaldAct: Optional[Decimal] = Field(default=0.0, max_digits=10, decimal_places=2)
     SaldoPro: Optional[Decimal] = Field(default=0.0, max_digits=10, decimal_places=2)
 
+    # Embargos activos ya agregados (ver embargos_service.recalcular_embargo_cuenta)
+    MontoEmbargado: Decimal = Field(default=0, max_digits=12, decimal_places=2)   # suma de los parciales
+    EmbargoTotal: bool = Field(default=False)
+
     CodUsu: Optional[str] = Field(default=None, foreign_key="t_usuario.CodUsu")
     Estado: Optional[str] = Field(default=None, max_length=1, foreign_key="t_estado.Estado")
 
 
 class Movimiento(SQLModel, table=True):
     __tablename__ = "t_movimientos"
+    # Historial por cuenta (ver sql/migrations/002_t_movimientos_indices.sql)
+    __table_args__ = (
+        Index("ix_mov_cta_oper", "NroCta", "NroOperNumber"),
+        Index("ix_mov_cta_fecha_oper", "NroCta", "Fech_Ope", "NroOperNumber"),
+        Index("ix_mov_cta_tipo_oper", "NroCta", "TipoMov", "NroOperNumber"),
+    )
 
     TipoCta: str = Field(primary_key=True, max_length=2, foreign_key="t_tipocuentas.TipoCta")
     NroCta: str = Field(primary_key=True, max_length=20, foreign_key="t_cuentas.NroCta")
@@ -37,3 +48,30 @@ class Movimiento(SQLModel, table=True):
     TipoMov: Optional[str] = Field(default=None, max_length=2, foreign_key="t_tipomovi.TipoMov")
     MonOpe: Optional[Decimal] = Field(default=None, max_digits=10, decimal_places=2)
     Estado: Optional[str] = Field(default=None, max_length=1, foreign_key="t_estado.Estado")
+
+
+class SecuenciaOperacion(SQLModel, table=True):
+    """
+    Último NroOperNumber asignado por cuenta. Se incrementa con un UPDATE
+    atómico (bloqueo de fila) en lugar de buscar el máximo en t_movimientos.
+    """
+    __tablename__ = "t_secuencia_oper"
+
+    NroCta: str = Field(primary_key=True, max_length=20, foreign_key="t_cuentas.NroCta")
+    UltNroOper: int = Field(default=0)
+
+
+class ResumenDiario(SQLModel, table=True):
+    """
+    Cantidad y suma de MonOpe por día, cuenta y TipoMov, acumuladas al
+    insertar movimientos (ver resumen_service). Las filas con NroCta
+    '*0'..'*N' son el total del banco repartido en fragmentos para que
+    las transferencias concurrentes no compitan por una sola fila.
+    """
+    __tablename__ = "t_resumen_diario"
+
+    Fecha: date = Field(primary_key=True)
+    NroCta: str = Field(primary_key=True, max_length=20)
+    TipoMov: str = Field(primary_key=True, max_length=2)
+    Cantidad: int = Field(default=0)
+    Total: Decimal = Field(default=0, max_digits=14, decimal_places=2)
@@ -1,9 +1,18 @@
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 from datetime import date
 
 class Cliente(SQLModel, table=True):
     __tablename__ = "t_cliente"   # ✔ tabla real en BD
+    # Búsqueda de clientes (clients_service.buscar_clientes): igualdad o
+    # prefijo sobre la columna y desempate/keyset por CodCliente
+    __table_args__ = (
+        Index("ix_cli_dni", "DNI", "CodCliente"),
+        Index("ix_cli_apellidos", "Apellidos", "CodCliente"),
+        Index("ix_cli_nombres", "Nombres", "CodCliente"),
+        Index("ix_cli_email", "e_mail", "CodCliente"),
+    )
 
     CodCliente: str = Field(primary_key=True, max_length=10)
     Apellidos: Optional[str] = Field(default=None, max_length=100)
@@ -0,0 +1,26 @@
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class Embargo(SQLModel, table=True):
+    """
+    Embargos judiciales sobre una cuenta (los registra sp_RegistrarEmbargo).
+    TipoEmbargo 'T' retiene todo el saldo; 'P' retiene MontoEmbargado.
+    Solo cuentan los embargos con Estado 'A' (activos).
+    """
+    __tablename__ = "t_embargos"
+    __table_args__ = (
+        Index("ix_emb_cta_estado", "NroCta", "Estado"),
+    )
+
+    IdEmbargo: Optional[int] = Field(default=None, primary_key=True)
+    NroCta: str = Field(max_length=20, foreign_key="t_cuentas.NroCta")
+    TipoEmbargo: str = Field(max_length=1)
+    MontoEmbargado: Decimal = Field(default=0, max_digits=10, decimal_places=2)
+    Observaciones: Optional[str] = Field(default=None, max_length=200)
+    FechaRegistro: Optional[datetime] = None
+    UsrRegistro: Optional[str] = Field(default=None, max_length=10, foreign_key="t_usuario.CodUsu")
+    Estado: Optional[str] = Field(default="A", max_length=1, foreign_key="t_estado.Estado")
@@ -0,0 +1,25 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import Column, Index, Text
+from sqlmodel import Field, SQLModel
+
+
+class Idempotencia(SQLModel, table=True):
+    """
+    Respuesta guardada por cada Idempotency-Key recibida en depósitos,
+    retiros y transferencias (ver idempotencia_service), por endpoint y
+    usuario que la envía. StatusCode NULL indica que la operación con esa
+    clave todavía está en curso.
+    """
+    __tablename__ = "t_idempotencia"
+    __table_args__ = (
+        Index("ix_idem_fecha", "FechaCreacion"),
+    )
+
+    Endpoint: str = Field(primary_key=True, max_length=30)
+    CodUsu: str = Field(primary_key=True, max_length=10)
+    Clave: str = Field(primary_key=True, max_length=100)
+    HashPeticion: str = Field(max_length=64)
+    StatusCode: Optional[int] = None
+    Respuesta: Optional[str] = Field(default=None, sa_column=Column(Text))
+    FechaCreacion: datetime
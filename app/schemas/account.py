@@ -35,8 +35,8 @@ class CuentaDetailsDTO(SQLModel):
     FechaApertura: date
     SaldoActual: float
     SaldoPromedio: float
-    CodUsu: str = Field(..., max_length=10)
-    UsuarioPropietario: str = Field(..., description="Nombre de usuario asociado (T_Usuario.Usuario)")
+    CodUsu: Optional[str] = Field(default=None, max_length=10)
+    UsuarioPropietario: Optional[str] = Field(default=None, description="Nombre de usuario asociado (T_Usuario.Usuario)")
     Estado: str = Field(..., max_length=1)
 
 
@@ -0,0 +1,20 @@
+from typing import Literal
+from sqlmodel import SQLModel, Field
+
+# ===============================================================
+# SCHEMAS DE LOS CATÁLOGOS DE REFERENCIA
+# ===============================================================
+
+NivelUbigeo = Literal["departamento", "provincia", "distrito"]
+
+
+class UbigeoSugerencia(SQLModel):
+    """
+    Resultado del autocompletado de ubigeo. CodUbigeo es el prefijo del
+    código del nivel: 2 dígitos (departamento), 4 (provincia) o 6 (distrito).
+    """
+    nivel: NivelUbigeo
+    CodUbigeo: str = Field(..., max_length=6)
+    Depart: str
+    Provin: str = ""
+    Distrit: str = ""
@@ -1,5 +1,6 @@
 # app/schemas/movimiento.py
 
+from typing import Optional
 from sqlmodel import SQLModel
 from decimal import Decimal
 from datetime import date
@@ -19,3 +20,29 @@ class MovimientoDelDia(SQLModel):
     TipoMovimiento: str
     Monto: Decimal
     EstadoMovimiento: str
+
+
+class MovimientoHistorial(SQLModel):
+    """
+    Fila de t_movimientos devuelta por el historial paginado
+    (/movements/historial).
+    """
+    NroCta: str
+    NroOperNumber: int
+    Fech_Ope: Optional[date] = None
+    TipoCta: str
+    TipoMov: Optional[str] = None
+    MonOpe: Optional[Decimal] = None
+    CodUsu: Optional[str] = None
+    Estado: Optional[str] = None
+
+
+class ResumenDelDia(SQLModel):
+    """
+    Totales del día por TipoMov (y por cuenta, salvo para el administrador)
+    leídos de t_resumen_diario.
+    """
+    NroCta: Optional[str] = None
+    TipoMov: str
+    Cantidad: int
+    Total: Decimal
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 class TransferenciaRequest(BaseModel):
@@ -12,3 +13,20 @@ class TransferenciaResponse(BaseModel):
     mensaje: str
     saldo_origen: float
     saldo_destino: float
+    reintentos: int = 0   # reintentos por deadlock / lock wait timeout
+
+
+class TransferenciaBatchItem(BaseModel):
+    indice: int            # posición en la lista recibida
+    ok: bool
+    mensaje: str
+    saldo_origen: Optional[float] = None
+    saldo_destino: Optional[float] = None
+
+
+class TransferenciaBatchResponse(BaseModel):
+    procesadas: int
+    exitosas: int
+    fallidas: int
+    reintentos: int = 0
+    resultados: List[TransferenciaBatchItem]
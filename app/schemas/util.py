@@ -13,3 +13,4 @@ class APIResponse(SQLModel):
     codigo: Optional[str] = Field(default=None, description="Código de referencia (ej: NroCta, Codigo de Error).")
     status_code: int = Field(..., description="Código de estado HTTP de la respuesta.")
     result: Optional[List[Any]] = Field(default=None, description="Contenedor para la lista de resultados de la operación.")
+    cursor_siguiente: Optional[str] = Field(default=None, description="Cursor opaco de la página siguiente (null si es la última).")
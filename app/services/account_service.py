@@ -1,60 +1,57 @@
 # app/services/account_service.py
 
-from typing import Dict, Any, Optional, List
-from sqlmodel import Session
-from sqlalchemy import text, Row
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Any, Optional, List, Tuple, Union
+from sqlalchemy import or_, update
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.pagination import decodificar_cursor, cortar_pagina, cursor_siguiente
+from app.db.procedures import ejecutar_sp
+from app.db.retry import con_reintentos, con_reintentos_async
+from app.models.account import Cuenta
+from app.models.common import TipoCuenta
+from app.models.user import Usuario
+from app.db.session import run_service
+from app.services.catalogos_service import obtener_catalogos
+from app.services.movimientos_service import TIPO_MOV_DEPOSITO, TIPO_MOV_RETIRO, insertar_movimientos
+from app.services.secuencia_service import reservar_nro_operacion
 from app.schemas.account import CuentaCreationData, CuentaDetailsDTO, CuentaEstadoUpdate
-# 🛑 NUEVAS IMPORTACIONES REQUERIDAS para Depósito y Retiro
 from app.schemas.transaction import DepositoRequest, RetiroRequest
 
+CURSOR_CUENTAS = "cuentas"
+
 
 def insertar_nueva_cuenta_sp(session: Session, datos: CuentaCreationData) -> Dict[str, Any]:
     """
     Llama al stored procedure sp_InsertarNuevaCuenta y maneja los parámetros OUT.
     """
     try:
-        query = text("""
-            CALL sp_InsertarNuevaCuenta(
-                :p_TipoCta, :p_Moneda, :p_Saldoni, :p_CodUsu,
-                @p_Out_NroCta, @p_Out_Message
-            );
-        """)
-        
-        # 1. Ejecutamos la llamada al SP
-        session.execute(query, {
+        # 0. TipoCta contra el catálogo en memoria, antes de ir a la BD
+        obtener_catalogos(session).validar_tipo_cuenta(datos.TipoCta)
+
+        # 1. CALL + lectura de las variables OUT (un solo round trip)
+        resultado = ejecutar_sp(session, "sp_InsertarNuevaCuenta", {
             "p_TipoCta": datos.TipoCta,
             "p_Moneda": datos.Moneda,
             "p_Saldoni": datos.SaldoInicial,
             "p_CodUsu": datos.CodUsu
-        })
-        
-        # 2. Obtenemos los valores de las variables de salida
-        out_params_result: Optional[Row] = session.execute(
-            text("SELECT @p_Out_NroCta AS NroCta, @p_Out_Message AS Mensaje;")
-        ).first()
+        }, out=("p_Out_NroCta", "p_Out_Message"), autonomo=True)   # el SP confirma
 
-        # 3. Validación de la respuesta de la base de datos
-        if out_params_result is None:
+        # 2. Validación de la respuesta de la base de datos
+        output_message = resultado.mensaje
+        if output_message is None:
             raise Exception("La base de datos no devolvió el resultado del OUT SELECT.")
-            
-        try:
-            nro_cta_generada = out_params_result.NroCta
-            output_message = out_params_result.Mensaje
-        except AttributeError:
-            # Fallback por si el acceso por alias falla
-            nro_cta_generada = out_params_result[0]
-            output_message = out_params_result[1]
-
-        # 4. VERIFICACIÓN DE ÉXITO/ERROR (La parte modificada)
-        
+
+        # 3. VERIFICACIÓN DE ÉXITO/ERROR
         if not output_message.lower().startswith('éxito'): 
             
             # Si el SP devolvió cualquier cosa que no sea un éxito, lo tratamos como error
             raise ValueError(output_message)
 
-        # 5. Si pasa la verificación (el mensaje comienza con "Éxito:"), devolvemos los datos
+        # 4. Si pasa la verificación (el mensaje comienza con "Éxito:"), devolvemos los datos
         return {
-            "NroCta": nro_cta_generada,
+            "NroCta": resultado.out["p_Out_NroCta"],
             "MensajeSP": output_message
         }
 
@@ -68,14 +65,12 @@ def listar_cuentas_sp(session: Session, cod_usu_input: Optional[str]) -> List[Cu
     # ... (lógica para limpiar p_cod_usu)
     p_cod_usu = cod_usu_input if cod_usu_input and cod_usu_input != '' else None
     
-    query = text("CALL sp_ListarCuentas(:p_CodUsu);")
-    
     try:
         # 1. Ejecutamos la llamada
-        results = session.execute(query, {"p_CodUsu": p_cod_usu}).mappings().all()
+        resultado = ejecutar_sp(session, "sp_ListarCuentas", {"p_CodUsu": p_cod_usu})
         
         # 2. Mapeamos cada diccionario/fila (Row) al DTO
-        lista_cuentas_dto = [CuentaDetailsDTO.model_validate(row) for row in results]
+        lista_cuentas_dto = [CuentaDetailsDTO.model_validate(row) for row in resultado.filas]
         
         return lista_cuentas_dto
 
@@ -89,39 +84,27 @@ def actualizar_estado_cuenta_sp(session: Session, datos: CuentaEstadoUpdate) ->
     Llama al stored procedure sp_ActualizarEstadoCuenta.
     """
     try:
-        # La llamada al SP (solo tiene un parámetro OUT: @p_Out_Message)
-        query = text("""
-            CALL sp_ActualizarEstadoCuenta(
-                :p_NroCta, :p_NuevoEstado, :p_CodUsuModifica,
-                @p_Out_Message
-            );
-        """)
-        
-        # 1. Ejecutamos la llamada
-        session.execute(query, {
+        # 0. El nuevo estado debe existir en t_estado
+        obtener_catalogos(session).validar_estado(datos.nuevo_estado)
+
+        # 1. CALL + lectura del único parámetro OUT (un solo round trip)
+        resultado = ejecutar_sp(session, "sp_ActualizarEstadoCuenta", {
             "p_NroCta": datos.nro_cta,
             "p_NuevoEstado": datos.nuevo_estado,
             "p_CodUsuModifica": datos.cod_usu_modifica
-        })
-        
-        # 2. Obtenemos el valor del parámetro de salida
-        out_params_result: Optional[Row] = session.execute(
-            text("SELECT @p_Out_Message AS Mensaje;")
-        ).first()
+        }, out=("p_Out_Message",), autonomo=True)   # el SP confirma
 
-        # 3. Validación de la respuesta
-        if out_params_result is None:
+        # 2. Validación de la respuesta
+        output_message = resultado.mensaje
+        if output_message is None:
             raise Exception("La base de datos no devolvió el mensaje de estado.")
-            
-        # Accedemos al mensaje por el alias
-        output_message = out_params_result.Mensaje
 
-        # 4. Verificación de Éxito/Error (Revisa si NO comienza con "Éxito:")
+        # 3. Verificación de Éxito/Error (Revisa si NO comienza con "Éxito:")
         if not output_message.lower().startswith('éxito'): 
             # Si el SP devolvió cualquier mensaje que no sea Éxito (incluyendo "Error:"), lanzamos un error
             raise ValueError(output_message)
 
-        # 5. Éxito
+        # 4. Éxito
         return {
             "NroCta": datos.nro_cta,
             "MensajeSP": output_message
@@ -131,65 +114,310 @@ def actualizar_estado_cuenta_sp(session: Session, datos: CuentaEstadoUpdate) ->
         session.rollback()
         raise e
 
+def select_cuentas_detalle():
+    """
+    Columnas de sp_ListarCuentas (CuentaDetailsDTO). El listado paginado no
+    pasa por el SP (no admite keyset) y debe devolver las mismas filas y
+    forma que él: un cambio del SP se replica aquí. Las cuentas sin usuario
+    propietario también salen (OUTER JOIN).
+    """
+    return (
+        select(
+            Cuenta.NroCta,
+            Cuenta.TipoCta,
+            TipoCuenta.Descripcion.label("TipoCuenta"),
+            Cuenta.CodCliente,
+            Cuenta.Moneda,
+            Cuenta.Fech_Apert.label("FechaApertura"),
+            Cuenta.SaldAct.label("SaldoActual"),
+            Cuenta.SaldoPro.label("SaldoPromedio"),
+            Cuenta.CodUsu,
+            Usuario.Usuario.label("UsuarioPropietario"),
+            Cuenta.Estado,
+        )
+        .outerjoin(Usuario, Usuario.CodUsu == Cuenta.CodUsu)
+        .outerjoin(TipoCuenta, TipoCuenta.TipoCta == Cuenta.TipoCta)
+    )
+
+
+def listar_cuentas_pagina(
+    session: Session, limite: int, cursor: Optional[str] = None
+) -> Tuple[List[CuentaDetailsDTO], Optional[str]]:
+    """
+    Listado completo (sin filtro de usuario) paginado por NroCta, con el
+    SELECT de select_cuentas_detalle() para poder aplicar WHERE NroCta >
+    :ultima ... LIMIT sobre la clave primaria.
+    Devuelve (página, cursor de la siguiente o None).
+    """
+    statement = select_cuentas_detalle().order_by(Cuenta.NroCta).limit(limite + 1)
+    if cursor:
+        (ultima,) = decodificar_cursor(CURSOR_CUENTAS, cursor)
+        statement = statement.where(Cuenta.NroCta > ultima)
+
+    try:
+        filas, hay_mas = cortar_pagina(session.execute(statement).mappings().all(), limite)
+        pagina = [CuentaDetailsDTO.model_validate(row) for row in filas]
+    except Exception as e:
+        session.rollback()
+        raise e
+
+    ultima_fila = [pagina[-1].NroCta] if pagina else None
+    return pagina, cursor_siguiente(CURSOR_CUENTAS, hay_mas, ultima_fila)
+
+
+def es_titular_cuenta(session: Session, nro_cta: str, cod_usu: str) -> bool:
+    """True si la cuenta existe y pertenece al usuario (lectura por clave primaria)."""
+    return session.execute(
+        select(Cuenta.NroCta).where(Cuenta.NroCta == nro_cta, Cuenta.CodUsu == cod_usu)
+    ).first() is not None
+
 # ===============================================================
-# FUNCIONES DE SIMULACIÓN (Depósito y Retiro)
+# DEPÓSITOS Y RETIROS (UPDATE condicional sobre t_cuentas)
 # ===============================================================
+TIPO_PLAZO_FIJO = "PF"
+ESTADO_ACTIVO = "A"
+MONEDA_SOLES = "SO"
+MONEDA_DOLARES = "DO"
+
+# Códigos de moneda aceptados en las peticiones → código de t_cuenta.Moneda
+_MONEDAS = {
+    "SO": MONEDA_SOLES, "PEN": MONEDA_SOLES, "SOL": MONEDA_SOLES,
+    "DO": MONEDA_DOLARES, "USD": MONEDA_DOLARES,
+}
+
+_cuentas = Cuenta.__table__
+
 
-def insertar_deposito_sp(session: Session, datos: DepositoRequest) -> Dict[str, Any]:
+def normalizar_moneda(moneda: str) -> str:
+    """Código de t_cuenta.Moneda de la moneda pedida (PEN → SO, USD → DO)."""
+    codigo = moneda.strip().upper()
+    return _MONEDAS.get(codigo, codigo)
+
+
+def _importe(monto: float) -> Decimal:
     """
-    SIMULACIÓN: Registra el depósito aplicando la lógica de embargo/desembargo 
-    en memoria para permitir la prueba del endpoint. (NO HACE LLAMADAS A DB)
+    El monto al céntimo, como se guarda en SaldAct y MonOpe. Se valida ya
+    redondeado: 0.001 pasa el "> 0" de la petición pero sería un 0.00.
     """
-    
-    # Simulación de verificación de cuenta
-    if datos.Cuenta == "CUENTA_INVALIDA":
-        raise ValueError("Error: Cuenta bancaria no encontrada.")
-        
-    # --- LÓGICA DE SIMULACIÓN DE EMBARGO/DESEMBARGO ---
-    
-    tiene_embargo = True if datos.Cuenta == "CUE0002" else False
-    
-    if tiene_embargo:
-        # 🧪 Caso de Prueba: CUE0002 (El depósito va al embargo)
-        mensaje_final = f"Éxito: Depósito de {datos.Monto} aplicado a SALDO EMBARGADO."
-        nuevo_saldo_disponible = 100.00
-        nuevo_saldo_embargado = 2500.00 + datos.Monto
+    importe = Decimal(str(monto))
+    if not importe.is_finite():
+        raise ValueError("Error: El monto no es un número válido.")
+    importe = importe.quantize(Decimal("0.01"))
+    if importe <= 0:
+        raise ValueError("Error: El monto debe ser de al menos 0.01.")
+    return importe
+
+
+def _leer_cuenta(session: Session, nro_cta: str):
+    """Fila de la cuenta, con sus embargos activos ya agregados."""
+    return session.execute(
+        select(
+            _cuentas.c.NroCta, _cuentas.c.TipoCta, _cuentas.c.CodUsu, _cuentas.c.Estado,
+            _cuentas.c.Moneda, _cuentas.c.Fech_Bloq, _cuentas.c.Fech_Cierre, _cuentas.c.SaldAct,
+            _cuentas.c.MontoEmbargado, _cuentas.c.EmbargoTotal,
+        ).where(_cuentas.c.NroCta == nro_cta)
+    ).first()
+
+
+def _saldos(saldo: Decimal, cuenta) -> Tuple[Decimal, Decimal]:
+    """
+    (disponible, embargado) de un saldo: el embargo total retiene todo; los
+    parciales, hasta la suma de sus montos.
+    """
+    if cuenta.EmbargoTotal:
+        return Decimal("0"), saldo
+    retenido = max(Decimal("0"), min(saldo, cuenta.MontoEmbargado))
+    return saldo - retenido, retenido
+
+
+def _motivo_rechazo(cuenta, retiro: bool, moneda: Optional[str] = None) -> str:
+    """
+    Explica por qué el UPDATE condicional no tocó ninguna fila. Solo se
+    consulta en el camino de error; el de éxito no lee antes de escribir.
+    """
+    if cuenta is None:
+        return "Error: Cuenta bancaria no encontrada."
+    if cuenta.Estado != ESTADO_ACTIVO:
+        return "Error: La cuenta no está activa."
+    if moneda is not None and cuenta.Moneda != moneda:
+        return f"Error: La moneda del depósito ({moneda}) no coincide con la de la cuenta ({cuenta.Moneda})."
+    if retiro:
+        if cuenta.EmbargoTotal:
+            return "Error: Retiro no autorizado. Cuenta con embargo total activo."
+        if cuenta.Fech_Bloq is not None:
+            return "Error: Retiro no autorizado. Cuenta bloqueada por embargo."
+        if cuenta.TipoCta == TIPO_PLAZO_FIJO:
+            return "Error: Retiro no permitido. Cuenta a plazo fijo no ha cumplido el término."
+    disponible, _ = _saldos(cuenta.SaldAct or Decimal("0"), cuenta)
+    return f"Error: El monto a retirar excede el saldo disponible ({disponible})."
+
+
+def _registrar_movimiento(session: Session, cuenta, tipo_mov: str, monto: Decimal, cod_usu: Optional[str]) -> int:
+    """
+    Movimiento de la operación (MonOpe con signo, como en transferencias).
+    CodUsu es quien la hizo, no el titular de la cuenta.
+    """
+    nro_oper = reservar_nro_operacion(session, cuenta.NroCta, cuenta.TipoCta)
+    insertar_movimientos(session, [{
+        "TipoCta": cuenta.TipoCta,
+        "NroCta": cuenta.NroCta,
+        "NroOperNumber": nro_oper,
+        "Fech_Ope": date.today(),
+        "CodUsu": cod_usu,
+        "TipoMov": tipo_mov,
+        "MonOpe": monto,
+        "Estado": ESTADO_ACTIVO,
+    }])
+    return nro_oper
+
+
+def _ejecutar_deposito(session: Session, datos: DepositoRequest, cod_usu: Optional[str]) -> Dict[str, Any]:
+    monto = _importe(datos.Monto)
+    moneda = normalizar_moneda(datos.Moneda)
+    try:
+        # 1. Abono atómico: SaldAct = SaldAct + :m (sin leer el saldo antes),
+        #    solo si la cuenta está activa y es de la moneda del depósito
+        aplicado = session.execute(
+            update(_cuentas)
+            .where(
+                _cuentas.c.NroCta == datos.Cuenta,
+                _cuentas.c.Estado == ESTADO_ACTIVO,
+                _cuentas.c.Moneda == moneda,
+            )
+            .values(SaldAct=_cuentas.c.SaldAct + monto, Fech_Ult_M=date.today())
+        ).rowcount
+
+        # 2. La fila ya está bloqueada por el UPDATE: el saldo leído es el nuevo
+        cuenta = _leer_cuenta(session, datos.Cuenta)
+        if not aplicado:
+            raise ValueError(_motivo_rechazo(cuenta, retiro=False, moneda=moneda))
+
+        # 3. Movimiento en la misma transacción
+        nro_oper = _registrar_movimiento(session, cuenta, TIPO_MOV_DEPOSITO, monto, cod_usu)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    disponible, embargado = _saldos(cuenta.SaldAct, cuenta)
+    _, embargado_antes = _saldos(cuenta.SaldAct - monto, cuenta)
+    a_embargo = embargado - embargado_antes
+
+    if a_embargo == 0:
+        mensaje = f"Éxito: Depósito de {monto} aplicado a SALDO DISPONIBLE."
+    elif a_embargo == monto:
+        mensaje = f"Éxito: Depósito de {monto} aplicado a SALDO EMBARGADO."
     else:
-        # 🧪 Caso de Prueba: CUE0001 (El depósito va al disponible)
-        mensaje_final = f"Éxito: Depósito de {datos.Monto} aplicado a SALDO DISPONIBLE."
-        nuevo_saldo_disponible = 1000.00 + datos.Monto
-        nuevo_saldo_embargado = 0.00 
-        
-    # --- Devolver el resultado de la simulación ---
+        mensaje = (
+            f"Éxito: Depósito de {monto} aplicado: {a_embargo} a SALDO EMBARGADO "
+            f"y {monto - a_embargo} a SALDO DISPONIBLE."
+        )
+
     return {
-        "NroTransaccion": "TXD" + str(hash(datos.Cuenta))[:6],
-        "MensajeSP": mensaje_final,
-        "NuevoSaldoDisponible": nuevo_saldo_disponible,
-        "NuevoSaldoEmbargado": nuevo_saldo_embargado
+        "NroTransaccion": f"{cuenta.NroCta}-{nro_oper}",
+        "MensajeSP": mensaje,
+        "NuevoSaldoDisponible": float(disponible),
+        "NuevoSaldoEmbargado": float(embargado),
     }
 
-def insertar_retiro_sp(session: Session, datos: RetiroRequest) -> Dict[str, Any]:
+
+def _ejecutar_retiro(session: Session, datos: RetiroRequest, cod_usu: Optional[str]) -> Dict[str, Any]:
+    monto = _importe(datos.Monto)
+    hoy = date.today()
+    try:
+        # 1. Cargo condicional: todas las reglas van en el WHERE, así dos
+        #    retiros simultáneos no pueden dejar la cuenta en descubierto
+        aplicado = session.execute(
+            update(_cuentas)
+            .where(
+                _cuentas.c.NroCta == datos.Cuenta,
+                _cuentas.c.Estado == ESTADO_ACTIVO,
+                _cuentas.c.Fech_Bloq.is_(None),
+                or_(_cuentas.c.TipoCta != TIPO_PLAZO_FIJO, _cuentas.c.Fech_Cierre <= hoy),
+                _cuentas.c.EmbargoTotal.is_(False),
+                _cuentas.c.SaldAct - monto >= _cuentas.c.MontoEmbargado,
+            )
+            .values(SaldAct=_cuentas.c.SaldAct - monto, Fech_Ult_M=hoy)
+        ).rowcount
+
+        cuenta = _leer_cuenta(session, datos.Cuenta)
+        if not aplicado:
+            raise ValueError(_motivo_rechazo(cuenta, retiro=True))
+
+        nro_oper = _registrar_movimiento(session, cuenta, TIPO_MOV_RETIRO, monto * -1, cod_usu)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    disponible, embargado = _saldos(cuenta.SaldAct, cuenta)
+    return {
+        "NroTransaccion": f"{cuenta.NroCta}-{nro_oper}",
+        "MensajeSP": f"Éxito: Retiro de {monto} procesado correctamente.",
+        "NuevoSaldoDisponible": float(disponible),
+        "NuevoSaldoEmbargado": float(embargado),
+    }
+
+
+def registrar_deposito(session: Session, datos: DepositoRequest, cod_usu: Optional[str]) -> Dict[str, Any]:
     """
-    SIMULACIÓN: Llama al SP para el retiro aplicando la lógica de Embargo, Saldo, Sobregiro
-    en memoria para permitir la prueba del endpoint. (NO HACE LLAMADAS A DB)
+    Abona el monto con un UPDATE atómico y registra el movimiento 'DE' en la
+    misma transacción. La moneda pedida (PEN/SO, USD/DO) debe ser la de la
+    cuenta. Con embargos activos, el depósito cubre primero lo retenido.
+    El movimiento lleva el CodUsu de quien deposita. Errores de negocio:
+    ValueError.
     """
-    
-    # 1. SIMULACIÓN DE CASOS DE FALLO CRÍTICOS (EMBARGO/PLAZO/SALDO)
-    if datos.Cuenta == "CUE9999": # Prueba de Embargo Total
-        raise ValueError("Error: Retiro no autorizado. Cuenta con embargo total activo.")
-    
-    if datos.Cuenta == "CUE8888" and datos.Monto > 500: # Prueba de Saldo Insuficiente
-        raise ValueError("Error: El monto a retirar excede el saldo disponible (S/500).")
-        
-    if datos.Cuenta == "CUE7777": # Prueba de Cuenta a Plazo Fijo
-        raise ValueError("Error: Retiro no permitido. Cuenta a plazo fijo no ha cumplido el término.")
-        
-    # --- SIMULACIÓN DE ÉXITO (Si no falló en los casos anteriores) ---
-    
-    # 2. Devolver el resultado de la simulación
-    return {
-        "MensajeSP": "Éxito: Retiro procesado correctamente.",
-        "NroTransaccion": "TXR" + str(hash(datos.Cuenta))[:6],
-        "NuevoSaldoDisponible": 10000.00 - datos.Monto, 
-        "NuevoSaldoEmbargado": 0.00
-    }
\ No newline at end of file
+    resultado, _ = con_reintentos(session, _ejecutar_deposito, datos, cod_usu)
+    return resultado
+
+
+def registrar_retiro(session: Session, datos: RetiroRequest, cod_usu: Optional[str]) -> Dict[str, Any]:
+    """
+    Descuenta el monto con un único UPDATE condicional (saldo menos
+    MontoEmbargado, sin embargo total, bloqueo ni plazo fijo vigente) y registra
+    el movimiento 'RE' (con el CodUsu de quien retira) en la misma
+    transacción. Si el UPDATE no afecta
+    ninguna fila se lanza ValueError con el motivo.
+    """
+    resultado, _ = con_reintentos(session, _ejecutar_retiro, datos, cod_usu)
+    return resultado
+
+
+# ===============================================================
+# VERSIONES ASÍNCRONAS (no bloquean el event loop)
+# ===============================================================
+
+async def insertar_nueva_cuenta_sp_async(session: Union[Session, AsyncSession], datos: CuentaCreationData) -> Dict[str, Any]:
+    return await run_service(session, insertar_nueva_cuenta_sp, datos)
+
+
+async def listar_cuentas_sp_async(session: Union[Session, AsyncSession], cod_usu_input: Optional[str]) -> List[CuentaDetailsDTO]:
+    return await run_service(session, listar_cuentas_sp, cod_usu_input)
+
+
+async def listar_cuentas_pagina_async(
+    session: Union[Session, AsyncSession], limite: int, cursor: Optional[str] = None
+) -> Tuple[List[CuentaDetailsDTO], Optional[str]]:
+    return await run_service(session, listar_cuentas_pagina, limite, cursor)
+
+
+async def es_titular_cuenta_async(session: Union[Session, AsyncSession], nro_cta: str, cod_usu: str) -> bool:
+    return await run_service(session, es_titular_cuenta, nro_cta, cod_usu)
+
+
+async def actualizar_estado_cuenta_sp_async(session: Union[Session, AsyncSession], datos: CuentaEstadoUpdate) -> Dict[str, Any]:
+    return await run_service(session, actualizar_estado_cuenta_sp, datos)
+
+
+async def registrar_deposito_async(
+    session: Union[Session, AsyncSession], datos: DepositoRequest, cod_usu: Optional[str]
+) -> Dict[str, Any]:
+    resultado, _ = await con_reintentos_async(session, _ejecutar_deposito, datos, cod_usu)
+    return resultado
+
+
+async def registrar_retiro_async(
+    session: Union[Session, AsyncSession], datos: RetiroRequest, cod_usu: Optional[str]
+) -> Dict[str, Any]:
+    resultado, _ = await con_reintentos_async(session, _ejecutar_retiro, datos, cod_usu)
+    return resultado
@@ -0,0 +1,168 @@
+# app/services/catalogos_service.py
+"""
+Catálogos de referencia en memoria: t_estado, t_tipocuentas, t_tipomovi y
+t_ubigeo. Son tablas que prácticamente no cambian; se leen una vez (al
+arrancar o en el primer uso) y se sirven desde una instantánea inmutable.
+
+Con la instantánea se construye el índice de prefijos del autocompletado
+de ubigeo (departamento, provincia y distrito), que responde sin ir a la BD.
+
+La instantánea se reemplaza entera al recargar (POST /admin/catalogos/recargar),
+así que los lectores nunca ven un catálogo a medio cargar. La recarga es
+local al worker que atiende la petición.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.prefix_index import IndicePrefijos
+from app.db.session import run_service
+from app.models.common import Estado, TipoCuenta, TipoMovimiento, Ubigeo
+from app.schemas.catalogos import NivelUbigeo, UbigeoSugerencia
+
+NIVELES_UBIGEO: Tuple[NivelUbigeo, ...] = ("departamento", "provincia", "distrito")
+
+
+class DatoReferenciaInvalido(ValueError):
+    """Código que no existe en su catálogo (TipoCta, Estado, CodUbigeo...)."""
+
+
+@dataclass(frozen=True)
+class Catalogos:
+    estados: Tuple[Estado, ...]
+    tipos_cuenta: Tuple[TipoCuenta, ...]
+    tipos_movimiento: Tuple[TipoMovimiento, ...]
+    ubigeos: Tuple[Ubigeo, ...]
+    # Índices por código (solo lectura)
+    por_estado: Mapping[str, Estado]
+    por_tipo_cuenta: Mapping[str, TipoCuenta]
+    por_tipo_movimiento: Mapping[str, TipoMovimiento]
+    por_ubigeo: Mapping[str, Ubigeo]
+    indice_ubigeo: Mapping[str, IndicePrefijos[UbigeoSugerencia]]   # por nivel
+    version: str            # hash del contenido; se usa como ETag
+    cargado_en: datetime
+
+    def validar_estado(self, estado: str) -> None:
+        if estado not in self.por_estado:
+            raise DatoReferenciaInvalido(f"El estado '{estado}' no existe.")
+
+    def validar_tipo_cuenta(self, tipo_cta: str) -> None:
+        if tipo_cta not in self.por_tipo_cuenta:
+            raise DatoReferenciaInvalido(f"El tipo de cuenta '{tipo_cta}' no existe.")
+
+    def validar_tipo_movimiento(self, tipo_mov: str) -> None:
+        if tipo_mov not in self.por_tipo_movimiento:
+            raise DatoReferenciaInvalido(f"El tipo de movimiento '{tipo_mov}' no existe.")
+
+    def validar_ubigeo(self, cod_ubigeo: Optional[str]) -> None:
+        """CodUbigeo es opcional en el registro: solo se valida si viene informado."""
+        if cod_ubigeo and cod_ubigeo not in self.por_ubigeo:
+            raise DatoReferenciaInvalido(f"El código de ubigeo '{cod_ubigeo}' no existe.")
+
+    def buscar_ubigeo(
+        self, texto: str, nivel: Optional[NivelUbigeo] = None, limite: int = 20
+    ) -> List[UbigeoSugerencia]:
+        """Autocompletado sin tildes; sin nivel: departamentos, luego provincias y distritos."""
+        resultado: List[UbigeoSugerencia] = []
+        for n in ((nivel,) if nivel else NIVELES_UBIGEO):
+            resultado += self.indice_ubigeo[n].buscar(texto, limite - len(resultado))
+        return resultado
+
+    def resumen(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "cargado_en": self.cargado_en.isoformat(timespec="seconds"),
+            "estados": len(self.estados),
+            "tipos_cuenta": len(self.tipos_cuenta),
+            "tipos_movimiento": len(self.tipos_movimiento),
+            "ubigeos": len(self.ubigeos),
+        }
+
+
+_actual: Optional[Catalogos] = None
+
+
+def _leer(session: Session, modelo, orden):
+    # Copias desligadas de la sesión, como en user_cache
+    filas = session.exec(select(modelo).order_by(orden)).all()
+    return tuple(modelo.model_validate(f.model_dump()) for f in filas)
+
+
+def _indexar_ubigeos(ubigeos: Tuple[Ubigeo, ...]) -> Dict[str, IndicePrefijos[UbigeoSugerencia]]:
+    """
+    Un índice por nivel. Departamento y provincia se deducen del código
+    (DDPPdd): una sugerencia por cada prefijo de 2 y 4 dígitos.
+    """
+    departamentos: Dict[str, UbigeoSugerencia] = {}
+    provincias: Dict[str, UbigeoSugerencia] = {}
+    distritos: List[UbigeoSugerencia] = []
+
+    for u in ubigeos:
+        depart, provin, distrit = u.Depart or "", u.Provin or "", u.Distrit or ""
+        if depart:
+            departamentos.setdefault(u.CodUbigeo[:2], UbigeoSugerencia(
+                nivel="departamento", CodUbigeo=u.CodUbigeo[:2], Depart=depart))
+        if provin:
+            provincias.setdefault(u.CodUbigeo[:4], UbigeoSugerencia(
+                nivel="provincia", CodUbigeo=u.CodUbigeo[:4], Depart=depart, Provin=provin))
+        if distrit:
+            distritos.append(UbigeoSugerencia(
+                nivel="distrito", CodUbigeo=u.CodUbigeo, Depart=depart, Provin=provin, Distrit=distrit))
+
+    return {
+        "departamento": IndicePrefijos((s.Depart, s) for s in departamentos.values()),
+        "provincia": IndicePrefijos((s.Provin, s) for s in provincias.values()),
+        "distrito": IndicePrefijos((s.Distrit, s) for s in distritos),
+    }
+
+
+def cargar_catalogos(session: Session) -> Catalogos:
+    """Lee las cuatro tablas y publica una instantánea nueva."""
+    global _actual
+
+    estados = _leer(session, Estado, Estado.Estado)
+    tipos_cuenta = _leer(session, TipoCuenta, TipoCuenta.TipoCta)
+    tipos_movimiento = _leer(session, TipoMovimiento, TipoMovimiento.TipoMov)
+    ubigeos = _leer(session, Ubigeo, Ubigeo.CodUbigeo)
+
+    contenido = json.dumps(
+        [[f.model_dump() for f in t] for t in (estados, tipos_cuenta, tipos_movimiento, ubigeos)],
+        sort_keys=True, default=str,
+    )
+    _actual = Catalogos(
+        estados=estados,
+        tipos_cuenta=tipos_cuenta,
+        tipos_movimiento=tipos_movimiento,
+        ubigeos=ubigeos,
+        por_estado=MappingProxyType({f.Estado: f for f in estados}),
+        por_tipo_cuenta=MappingProxyType({f.TipoCta: f for f in tipos_cuenta}),
+        por_tipo_movimiento=MappingProxyType({f.TipoMov: f for f in tipos_movimiento}),
+        por_ubigeo=MappingProxyType({f.CodUbigeo: f for f in ubigeos}),
+        indice_ubigeo=MappingProxyType(_indexar_ubigeos(ubigeos)),
+        version=hashlib.sha1(contenido.encode()).hexdigest()[:16],
+        cargado_en=datetime.now(),
+    )
+    return _actual
+
+
+def obtener_catalogos(session: Session) -> Catalogos:
+    """Instantánea vigente; la carga con `session` si aún no existe."""
+    return _actual if _actual is not None else cargar_catalogos(session)
+
+
+async def obtener_catalogos_async(session: Union[Session, AsyncSession]) -> Catalogos:
+    # Camino habitual sin saltar al threadpool: la instantánea ya está cargada
+    if _actual is not None:
+        return _actual
+    return await run_service(session, cargar_catalogos)
+
+
+async def cargar_catalogos_async(session: Union[Session, AsyncSession]) -> Catalogos:
+    return await run_service(session, cargar_catalogos)
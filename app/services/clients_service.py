@@ -1,12 +1,48 @@
 # app/services/cliente_service.py
 
-from typing import List, Optional
-from sqlmodel import Session
-from sqlalchemy import text
+from typing import Dict, List, Literal, Optional, Tuple, Union
+from sqlalchemy import and_, case, func, literal, or_
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.pagination import decodificar_cursor, cortar_pagina, cursor_siguiente
+from app.db.procedures import ejecutar_sp
+from app.db.session import run_service
+from app.models.client import Cliente
 
 # Importamos el schema de respuesta que definiste
 from app.schemas.clients import ClientePublic
 
+CURSOR_CLIENTES = "clientes"
+CURSOR_BUSQUEDA = "clientes-busqueda"
+
+CampoBusqueda = Literal["dni", "apellidos", "nombres", "email"]
+
+# Columna indexada de cada campo de búsqueda (ver Cliente.__table_args__)
+COLUMNAS_BUSQUEDA: Dict[str, object] = {
+    "dni": Cliente.DNI,
+    "apellidos": Cliente.Apellidos,
+    "nombres": Cliente.Nombres,
+    "email": Cliente.e_mail,
+}
+
+# Columnas de sp_ListarClientes (ClientePublic). El listado paginado y la
+# búsqueda no pasan por el SP (no admite keyset) y deben devolver la misma
+# forma que él: un cambio del SP se replica aquí. t_cliente solo guarda DNI,
+# así que el tipo de documento es 'DNI' cuando lo hay.
+COLUMNAS_LISTAR_CLIENTES = (
+    Cliente.CodCliente,
+    func.trim(
+        func.coalesce(Cliente.Nombres, "") + literal(" ") + func.coalesce(Cliente.Apellidos, "")
+    ).label("nombres"),
+    case((Cliente.DNI.is_not(None), literal("DNI")), else_=None).label("tipo"),
+    Cliente.DNI.label("documento"),
+    Cliente.e_mail.label("email"),
+    Cliente.Telefonos.label("telefono"),
+    Cliente.Estado.label("estado"),
+    Cliente.CodUsu,
+)
+
 
 def listar_clientes_sp(session: Session, cod_usu_input: Optional[str]) -> List[ClientePublic]:
     """
@@ -25,22 +61,131 @@ def listar_clientes_sp(session: Session, cod_usu_input: Optional[str]) -> List[C
     #    El SP espera NULL (no '') para "listar todos".
     p_cod_usu = cod_usu_input if cod_usu_input and cod_usu_input.strip() != '' else None
     
-    # 2. Definimos la consulta al Stored Procedure
-    query = text("CALL sp_ListarClientes(:p_CodUsu);")
-    
     try:
-        # 3. Ejecutamos la consulta
-        results = session.execute(query, {"p_CodUsu": p_cod_usu}).mappings().all()
+        # 2. Ejecutamos el Stored Procedure
+        resultado = ejecutar_sp(session, "sp_ListarClientes", {"p_CodUsu": p_cod_usu})
         
-        # 4. Mapeamos los resultados al modelo Pydantic/SQLModel
+        # 3. Mapeamos los resultados al modelo Pydantic/SQLModel
         #    Esto valida que los datos de la BD coincidan con el schema
-        lista_clientes_dto = [ClientePublic.model_validate(row) for row in results]
+        lista_clientes_dto = [ClientePublic.model_validate(row) for row in resultado.filas]
         
         return lista_clientes_dto
 
     except Exception as e:
-        # 5. Manejo de errores
+        # 4. Manejo de errores
         print(f"🔴 Error al ejecutar sp_ListarClientes: {e}")
         session.rollback()
         # Es buena idea relanzar el error para que el endpoint lo maneje
         raise e
+
+
+def listar_clientes_pagina(
+    session: Session, limite: int, cursor: Optional[str] = None
+) -> Tuple[List[ClientePublic], Optional[str]]:
+    """
+    Listado completo (sin filtro de usuario) paginado por CodCliente.
+    Mismas columnas que sp_ListarClientes, con un SELECT directo sobre la
+    clave primaria. Devuelve (página, cursor de la siguiente o None).
+    """
+    statement = (
+        select(*COLUMNAS_LISTAR_CLIENTES)
+        .order_by(Cliente.CodCliente)
+        .limit(limite + 1)
+    )
+    if cursor:
+        (ultima,) = decodificar_cursor(CURSOR_CLIENTES, cursor)
+        statement = statement.where(Cliente.CodCliente > ultima)
+
+    try:
+        filas, hay_mas = cortar_pagina(session.execute(statement).mappings().all(), limite)
+    except Exception as e:
+        print(f"🔴 Error al paginar clientes: {e}")
+        session.rollback()
+        raise e
+
+    pagina = [ClientePublic.model_validate(f) for f in filas]
+    ultima_fila = [pagina[-1].CodCliente] if pagina else None
+    return pagina, cursor_siguiente(CURSOR_CLIENTES, hay_mas, ultima_fila)
+
+
+def detectar_campo(texto: str) -> CampoBusqueda:
+    """Sin campo explícito: dígitos → DNI, con '@' → email, si no → apellidos."""
+    if texto.isdigit():
+        return "dni"
+    if "@" in texto:
+        return "email"
+    return "apellidos"
+
+
+def buscar_clientes(
+    session: Session,
+    texto: str,
+    campo: Optional[CampoBusqueda] = None,
+    exacto: bool = False,
+    limite: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ClientePublic], Optional[str]]:
+    """
+    Clientes cuyo DNI, apellidos, nombres o email es igual a `texto`
+    (exacto) o empieza por él. Se ordena por (columna, CodCliente) y se
+    pagina por esa clave, así que cada página es un range scan del índice
+    de la columna. Devuelve (página, cursor de la siguiente o None).
+    """
+    campo = campo or detectar_campo(texto)
+    columna = COLUMNAS_BUSQUEDA[campo]
+    tipo_cursor = f"{CURSOR_BUSQUEDA}:{campo}"
+
+    if exacto:
+        condicion = columna == texto
+    else:
+        escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        condicion = columna.like(escapado + "%", escape="\\")
+
+    # La columna de búsqueda va aparte: el cursor guarda su valor crudo
+    statement = select(*COLUMNAS_LISTAR_CLIENTES, columna.label("clave_busqueda")).where(condicion)
+
+    if cursor:
+        valor, cod_cliente = decodificar_cursor(tipo_cursor, cursor, longitud=2)
+        statement = statement.where(or_(
+            columna > valor,
+            and_(columna == valor, Cliente.CodCliente > cod_cliente),
+        ))
+
+    statement = statement.order_by(columna, Cliente.CodCliente).limit(limite + 1)
+
+    try:
+        filas, hay_mas = cortar_pagina(session.execute(statement).mappings().all(), limite)
+    except Exception as e:
+        print(f"🔴 Error al buscar clientes: {e}")
+        session.rollback()
+        raise e
+
+    pagina = [ClientePublic.model_validate(f) for f in filas]
+    ultima = [filas[-1]["clave_busqueda"], filas[-1]["CodCliente"]] if filas else None
+    return pagina, cursor_siguiente(tipo_cursor, hay_mas, ultima)
+
+
+async def listar_clientes_pagina_async(
+    session: Union[Session, AsyncSession], limite: int, cursor: Optional[str] = None
+) -> Tuple[List[ClientePublic], Optional[str]]:
+    return await run_service(session, listar_clientes_pagina, limite, cursor)
+
+
+async def buscar_clientes_async(
+    session: Union[Session, AsyncSession],
+    texto: str,
+    campo: Optional[CampoBusqueda] = None,
+    exacto: bool = False,
+    limite: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ClientePublic], Optional[str]]:
+    return await run_service(session, buscar_clientes, texto, campo, exacto, limite, cursor)
+
+
+async def listar_clientes_sp_async(
+    session: Union[Session, AsyncSession], cod_usu_input: Optional[str]
+) -> List[ClientePublic]:
+    """
+    Versión asíncrona de listar_clientes_sp (no bloquea el event loop).
+    """
+    return await run_service(session, listar_clientes_sp, cod_usu_input)
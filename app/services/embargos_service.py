@@ -1,8 +1,44 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
+from sqlalchemy import exists, func, select, update
 from sqlmodel import Session
-from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.procedures import ejecutar_sp
+from app.db.session import run_service
+from app.models.account import Cuenta
+from app.models.embargo import Embargo
 from app.schemas.embargos import EmbargoCreate
 
+ESTADO_ACTIVO = "A"
+ESTADO_LEVANTADO = "I"
+
+_cuentas = Cuenta.__table__
+_embargos = Embargo.__table__
+
+
+# ============================================================
+# 0. EMBARGO AGREGADO EN t_cuentas
+# ============================================================
+def recalcular_embargo_cuenta(session: Session, nro_cta: str) -> None:
+    """
+    Vuelve a calcular t_cuentas.MontoEmbargado (suma de los embargos
+    parciales activos) y EmbargoTotal a partir de t_embargos. Se llama en
+    la transacción que registra o levanta un embargo, así depósitos,
+    retiros y transferencias leen un solo valor en vez de recorrer la
+    lista. Recalcula desde cero (no suma ni resta): es idempotente.
+    No confirma la transacción.
+    """
+    activos = (_embargos.c.NroCta == _cuentas.c.NroCta, _embargos.c.Estado == ESTADO_ACTIVO)
+    session.execute(
+        update(_cuentas)
+        .where(_cuentas.c.NroCta == nro_cta)
+        .values(
+            MontoEmbargado=select(func.coalesce(func.sum(_embargos.c.MontoEmbargado), 0))
+            .where(*activos, _embargos.c.TipoEmbargo == "P")
+            .scalar_subquery(),
+            EmbargoTotal=exists().where(*activos, _embargos.c.TipoEmbargo == "T"),
+        )
+    )
+
 
 # ============================================================
 # 1. REGISTRAR EMBARGO - SP REAL (6 PARÁMETROS)
@@ -10,17 +46,6 @@ from app.schemas.embargos import EmbargoCreate
 def registrar_embargo_sp(session: Session, datos_embargo: EmbargoCreate) -> Dict[str, Any]:
 
     try:
-        query = text("""
-            CALL sp_RegistrarEmbargo(
-                :p_NroCta,
-                :p_TipoEmbargo,
-                :p_MontoEmbargado,
-                :p_UsrRegistro,
-                @p_Out_IdEmbargo,
-                @p_Out_Message
-            );
-        """)
-
         params = {
             "p_NroCta": datos_embargo.NroCta,
             "p_TipoEmbargo": datos_embargo.TipoEmbargo,
@@ -28,25 +53,29 @@ def registrar_embargo_sp(session: Session, datos_embargo: EmbargoCreate) -> Dict
             "p_UsrRegistro": datos_embargo.CodUsu
         }
 
-        # Ejecutar SP
-        session.execute(query, params)
-
-        # 🔥🔥 COMMIT obligatorio
-        session.commit()
-
-        # Leer OUT parameters
-        result = session.execute(text("""
-            SELECT 
-                @p_Out_IdEmbargo AS IdEmbargo,
-                @p_Out_Message AS MensajeSP;
-        """)).mappings().first()
+        # Ejecutar SP y leer OUT parameters en la transacción de la sesión:
+        # recalcular_embargo_cuenta debe ver el embargo recién insertado
+        resultado = ejecutar_sp(
+            session, "sp_RegistrarEmbargo", params,
+            out=("p_Out_IdEmbargo", "p_Out_Message")
+        )
 
-        result = dict(result)
+        result = {
+            "IdEmbargo": resultado.out["p_Out_IdEmbargo"],
+            "MensajeSP": resultado.mensaje,
+        }
 
         # Validar errores del SP
         if result["MensajeSP"].startswith("Error:"):
+            session.rollback()
             raise ValueError(result["MensajeSP"])
 
+        # El agregado de la cuenta se actualiza en la misma transacción
+        recalcular_embargo_cuenta(session, datos_embargo.NroCta)
+
+        # 🔥🔥 COMMIT obligatorio
+        session.commit()
+
         return result
 
     except ValueError:
@@ -54,6 +83,8 @@ def registrar_embargo_sp(session: Session, datos_embargo: EmbargoCreate) -> Dict
 
     except Exception as e:
         print("🔴 Error interno en registrar_embargo_sp:", e)
+        # Ni el embargo a medias ni el UPDATE del agregado quedan pendientes
+        session.rollback()
         raise Exception(f"Error interno al registrar embargo: {e}")
 
 
@@ -62,16 +93,73 @@ def registrar_embargo_sp(session: Session, datos_embargo: EmbargoCreate) -> Dict
 # ============================================================
 def listar_embargos_por_cuenta_sp(session: Session, nrocta: str) -> List[Dict[str, Any]]:
     try:
-        res = session.execute(
-            text("CALL sp_ListarEmbargosPorCuenta(:nrocta);"),
-            {"nrocta": nrocta}
-        )
-        
-        # 🔥 IMPORTANTE: algunos SP requieren commit
-        session.commit()
-
-        return [dict(r) for r in res.mappings().all()]
+        # Solo lectura: la sesión (ReadSessionDep) se cierra con rollback
+        resultado = ejecutar_sp(session, "sp_ListarEmbargosPorCuenta", {"nrocta": nrocta})
+        return resultado.filas
 
     except Exception as e:
         print("🔴 Error en listar_embargos_por_cuenta_sp:", e)
         raise ValueError(f"Error al listar embargos: {e}")
+
+
+# ============================================================
+# 3. LEVANTAR EMBARGO
+# ============================================================
+def levantar_embargo(session: Session, id_embargo: int) -> Dict[str, Any]:
+    """
+    Marca el embargo como levantado (Estado 'I') y recalcula el agregado
+    de su cuenta en la misma transacción.
+    """
+    try:
+        nro_cta = session.execute(
+            select(_embargos.c.NroCta).where(_embargos.c.IdEmbargo == id_embargo)
+        ).scalar()
+        if nro_cta is None:
+            raise ValueError(f"Error: El embargo {id_embargo} no existe.")
+
+        levantado = session.execute(
+            update(_embargos)
+            .where(_embargos.c.IdEmbargo == id_embargo, _embargos.c.Estado == ESTADO_ACTIVO)
+            .values(Estado=ESTADO_LEVANTADO)
+        ).rowcount
+        if not levantado:
+            raise ValueError(f"Error: El embargo {id_embargo} no está activo.")
+
+        recalcular_embargo_cuenta(session, nro_cta)
+        session.commit()
+
+        return {
+            "IdEmbargo": id_embargo,
+            "NroCta": nro_cta,
+            "MensajeSP": "Éxito: Embargo levantado.",
+        }
+
+    except ValueError:
+        session.rollback()
+        raise
+
+    except Exception as e:
+        session.rollback()
+        print("🔴 Error interno en levantar_embargo:", e)
+        raise Exception(f"Error interno al levantar embargo: {e}")
+
+
+# ============================================================
+# 4. VERSIONES ASÍNCRONAS
+# ============================================================
+async def registrar_embargo_sp_async(
+    session: Union[Session, AsyncSession], datos_embargo: EmbargoCreate
+) -> Dict[str, Any]:
+    return await run_service(session, registrar_embargo_sp, datos_embargo)
+
+
+async def listar_embargos_por_cuenta_sp_async(
+    session: Union[Session, AsyncSession], nrocta: str
+) -> List[Dict[str, Any]]:
+    return await run_service(session, listar_embargos_por_cuenta_sp, nrocta)
+
+
+async def levantar_embargo_async(
+    session: Union[Session, AsyncSession], id_embargo: int
+) -> Dict[str, Any]:
+    return await run_service(session, levantar_embargo, id_embargo)
@@ -0,0 +1,140 @@
+# app/services/idempotencia_service.py
+"""
+Claves de idempotencia (cabecera Idempotency-Key) de depósitos, retiros y
+transferencias.
+
+Las claves son por usuario: (endpoint, CodUsu del token, clave). Un
+cliente no puede repetir ni bloquear la respuesta guardada de otro.
+
+La primera petición con una clave la reserva en t_idempotencia (INSERT
+con StatusCode NULL) antes de mover dinero; al terminar se guarda la
+respuesta. Un reintento con la misma clave recibe esa respuesta sin
+repetir la operación: desde la caché en memoria del worker si la tiene,
+si no con un INSERT fallido y un SELECT. Dos peticiones simultáneas con la
+misma clave no pueden ejecutar ambas: la PK deja pasar solo a una.
+
+Una reserva sin respuesta (el worker cayó a mitad de la operación) deja de
+bloquear la clave a los IDEMPOTENCY_LEASE segundos; las respuestas
+terminadas se repiten durante IDEMPOTENCY_TTL.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.core.cache import TTLCache
+from app.core.config import IDEMPOTENCY_CACHE_MAXSIZE, IDEMPOTENCY_LEASE, IDEMPOTENCY_TTL
+from app.models.idempotencia import Idempotencia
+
+# Solo respuestas terminadas; la clave es (endpoint, CodUsu, Idempotency-Key)
+idempotencia_cache = TTLCache(IDEMPOTENCY_CACHE_MAXSIZE, IDEMPOTENCY_TTL, nombre="idempotencia")
+
+_tabla = Idempotencia.__table__
+
+
+@dataclass(frozen=True)
+class RespuestaGuardada:
+    hash_peticion: str
+    status_code: Optional[int]      # None: la operación sigue en curso
+    cuerpo: Optional[str]           # JSON tal como se envió
+
+
+def hash_peticion(payload: Any) -> str:
+    """SHA-256 del cuerpo normalizado: detecta una clave reutilizada con otros datos."""
+    normalizado = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(normalizado.encode()).hexdigest()
+
+
+def respuesta_en_cache(endpoint: str, cod_usu: str, clave: str) -> Optional[RespuestaGuardada]:
+    return idempotencia_cache.get((endpoint, cod_usu, clave))
+
+
+def reservar(session: Session, endpoint: str, cod_usu: str, clave: str, hash_: str) -> Optional[RespuestaGuardada]:
+    """
+    Reserva la clave para esta petición (devuelve None) o, si ya existe y
+    no ha vencido, devuelve lo guardado (terminado o en curso).
+    """
+    ahora = datetime.now()
+    try:
+        session.execute(insert(_tabla).values(
+            Endpoint=endpoint, CodUsu=cod_usu, Clave=clave, HashPeticion=hash_, FechaCreacion=ahora
+        ))
+        session.commit()
+        return None
+    except IntegrityError:
+        session.rollback()
+
+    # La clave existe: se reutiliza como nueva si venció (IDEMPOTENCY_TTL)
+    # o si es una reserva abandonada sin respuesta (IDEMPOTENCY_LEASE)
+    vencida = session.execute(
+        update(_tabla)
+        .where(
+            _tabla.c.Endpoint == endpoint,
+            _tabla.c.CodUsu == cod_usu,
+            _tabla.c.Clave == clave,
+            or_(
+                _tabla.c.FechaCreacion < ahora - timedelta(seconds=IDEMPOTENCY_TTL),
+                and_(
+                    _tabla.c.StatusCode.is_(None),
+                    _tabla.c.FechaCreacion < ahora - timedelta(seconds=IDEMPOTENCY_LEASE),
+                ),
+            ),
+        )
+        .values(HashPeticion=hash_, StatusCode=None, Respuesta=None, FechaCreacion=ahora)
+    )
+    if vencida.rowcount:
+        session.commit()
+        return None
+
+    fila = session.execute(
+        select(_tabla.c.HashPeticion, _tabla.c.StatusCode, _tabla.c.Respuesta)
+        .where(_tabla.c.Endpoint == endpoint, _tabla.c.CodUsu == cod_usu, _tabla.c.Clave == clave)
+    ).first()
+    session.commit()
+
+    if fila is None:
+        # Purgada entre el INSERT y el SELECT: se intenta de nuevo
+        return reservar(session, endpoint, cod_usu, clave, hash_)
+
+    guardada = RespuestaGuardada(fila.HashPeticion, fila.StatusCode, fila.Respuesta)
+    if guardada.status_code is not None:
+        idempotencia_cache.set((endpoint, cod_usu, clave), guardada)
+    return guardada
+
+
+def completar(
+    session: Session, endpoint: str, cod_usu: str, clave: str, hash_: str, status_code: int, cuerpo: str
+) -> None:
+    """Guarda la respuesta final de la clave reservada por esta petición."""
+    session.rollback()   # por si la operación dejó la transacción abortada
+    session.execute(
+        update(_tabla)
+        .where(_tabla.c.Endpoint == endpoint, _tabla.c.CodUsu == cod_usu, _tabla.c.Clave == clave)
+        .values(StatusCode=status_code, Respuesta=cuerpo)
+    )
+    session.commit()
+    idempotencia_cache.set((endpoint, cod_usu, clave), RespuestaGuardada(hash_, status_code, cuerpo))
+
+
+def liberar(session: Session, endpoint: str, cod_usu: str, clave: str) -> None:
+    """
+    Borra la reserva tras un error inesperado (5xx): la operación no se
+    completó y el reintento del cliente debe poder ejecutarla.
+    """
+    session.rollback()
+    session.execute(
+        delete(_tabla).where(
+            _tabla.c.Endpoint == endpoint,
+            _tabla.c.CodUsu == cod_usu,
+            _tabla.c.Clave == clave,
+            _tabla.c.StatusCode.is_(None),
+        )
+    )
+    session.commit()
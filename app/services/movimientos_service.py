@@ -1,11 +1,27 @@
 # app/services/movimiento_service.py
 
-from typing import List
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 from sqlmodel import Session
-from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import and_, insert, or_, select
 
-from app.schemas.movimientos import MovimientoDelDia
+from app.core.config import EXPORT_CHUNK_ROWS
+from app.core.pagination import CursorInvalido, decodificar_cursor, cortar_pagina, cursor_siguiente
+from app.db.procedures import ejecutar_sp
+from app.db.session import nueva_sesion_lectura, nueva_sesion_lectura_async, run_service
+from app.services.resumen_service import acumular_movimientos
 
+from app.models.account import Movimiento
+from app.schemas.movimientos import MovimientoDelDia, MovimientoHistorial
+
+# Códigos de t_tipomovi que generan los servicios
+TIPO_MOV_DEPOSITO = "DE"
+TIPO_MOV_RETIRO = "RE"
+TIPO_MOV_TRANSFERENCIA = "TR"
 
 
 # ============================================================
@@ -21,12 +37,11 @@ def listar_movimientos_del_dia_sp(
     aplicando la lógica de seguridad (Admin ve todo, usuario ve lo suyo).
     """
 
-    query = text("CALL sp_ListarMovimientosDelDia(:p_CodUsu, :p_Rol);")
     params = {"p_CodUsu": cod_usu, "p_Rol": rol}
 
     try:
-        results = session.execute(query, params).mappings().all()
-        return [MovimientoDelDia.model_validate(row) for row in results]
+        resultado = ejecutar_sp(session, "sp_ListarMovimientosDelDia", params)
+        return [MovimientoDelDia.model_validate(row) for row in resultado.filas]
 
     except Exception as e:
         print(f"🔴 Error al ejecutar sp_ListarMovimientosDelDia: {e}")
@@ -46,14 +61,227 @@ def listar_ultimos_movimientos_sp(
     llamando al SP sp_GetLastMovements(p_NroCta).
     """
 
-    query = text("CALL sp_GetLastMovements(:p_NroCta);")
     params = {"p_NroCta": nro_cuenta}
 
     try:
-        results = session.execute(query, params).mappings().all()
-        return [MovimientoDelDia.model_validate(row) for row in results]
+        resultado = ejecutar_sp(session, "sp_GetLastMovements", params)
+        return [MovimientoDelDia.model_validate(row) for row in resultado.filas]
 
     except Exception as e:
         print(f"🔴 Error al ejecutar sp_GetLastMovements: {e}")
         session.rollback()
         raise e
+
+
+# ============================================================
+#   3. Registrar movimientos (INSERT multi-fila)
+# ============================================================
+def insertar_movimientos(session: Session, filas: List[Dict[str, Any]]) -> None:
+    """
+    Inserta los movimientos en t_movimientos con un único INSERT de varias
+    filas (un round trip) y los acumula en t_resumen_diario. Cada fila usa
+    las columnas del modelo Movimiento.
+    No confirma la transacción: lo hace quien llama.
+    """
+    if not filas:
+        return
+    session.execute(insert(Movimiento.__table__).values(filas))
+    acumular_movimientos(session, filas)
+
+
+# ============================================================
+#   4. Historial paginado (keyset sobre NroCta, NroOperNumber)
+# ============================================================
+CURSOR_HISTORIAL = "historial"
+
+
+def listar_historial(
+    session: Session,
+    nro_cuenta: str,
+    limite: int,
+    cursor: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    tipo_mov: Optional[str] = None,
+) -> Tuple[List[MovimientoHistorial], Optional[str]]:
+    """
+    Movimientos de una cuenta del más reciente al más antiguo, por páginas.
+
+    Sin rango de fechas se recorre ix_mov_cta_oper (o ix_mov_cta_tipo_oper
+    si se filtra TipoMov) con NroOperNumber < :ultimo. Con rango de fechas
+    se ordena por (Fech_Ope, NroOperNumber) sobre ix_mov_cta_fecha_oper:
+    el mismo orden, porque los números de operación crecen con la fecha.
+    Devuelve (página, cursor de la siguiente o None).
+    """
+    tabla = Movimiento.__table__
+    por_fecha = fecha_desde is not None or fecha_hasta is not None
+
+    statement = select(
+        tabla.c.NroCta, tabla.c.NroOperNumber, tabla.c.Fech_Ope, tabla.c.TipoCta,
+        tabla.c.TipoMov, tabla.c.MonOpe, tabla.c.CodUsu, tabla.c.Estado,
+    ).where(tabla.c.NroCta == nro_cuenta)
+
+    if tipo_mov:
+        statement = statement.where(tabla.c.TipoMov == tipo_mov)
+
+    if cursor:
+        fecha, nro_oper = decodificar_cursor(CURSOR_HISTORIAL, cursor, longitud=2)
+        if por_fecha:
+            try:
+                fecha = date.fromisoformat(fecha)
+            except (TypeError, ValueError):
+                raise CursorInvalido("Cursor de paginación inválido.")
+            # Un único límite superior de fecha: con dos, el planificador puede
+            # elegir fecha_hasta y recorrer todo lo posterior al cursor
+            fecha_hasta = min(fecha_hasta, fecha) if fecha_hasta else fecha
+            statement = statement.where(or_(
+                tabla.c.Fech_Ope < fecha,
+                and_(tabla.c.Fech_Ope == fecha, tabla.c.NroOperNumber < nro_oper),
+            ))
+        else:
+            statement = statement.where(tabla.c.NroOperNumber < nro_oper)
+
+    if fecha_desde:
+        statement = statement.where(tabla.c.Fech_Ope >= fecha_desde)
+    if fecha_hasta:
+        statement = statement.where(tabla.c.Fech_Ope <= fecha_hasta)
+
+    orden = (
+        (tabla.c.Fech_Ope.desc(), tabla.c.NroOperNumber.desc()) if por_fecha
+        else (tabla.c.NroOperNumber.desc(),)
+    )
+    statement = statement.order_by(*orden).limit(limite + 1)
+
+    try:
+        filas, hay_mas = cortar_pagina(session.execute(statement).mappings().all(), limite)
+        pagina = [MovimientoHistorial.model_validate(dict(row)) for row in filas]
+    except Exception as e:
+        print(f"🔴 Error al listar el historial de movimientos: {e}")
+        session.rollback()
+        raise e
+
+    ultima = [pagina[-1].Fech_Ope, pagina[-1].NroOperNumber] if pagina else None
+    return pagina, cursor_siguiente(CURSOR_HISTORIAL, hay_mas, ultima)
+
+
+# ============================================================
+#   5. Exportación en streaming (NDJSON / CSV)
+# ============================================================
+# El generador abre su propia sesión: las dependencias de FastAPI se
+# cierran antes de que StreamingResponse empiece a enviar el cuerpo.
+# stream_results usa un cursor de servidor sin buffer (SSCursor en
+# pymysql): la memoria es la de un bloque de EXPORT_CHUNK_ROWS filas.
+
+COLUMNAS_EXPORT = [
+    "TipoCta", "NroCta", "NroOperNumber", "Fech_Ope",
+    "CodUsu", "TipoMov", "MonOpe", "Estado",
+]
+
+
+def consulta_export(
+    nro_cuenta: Optional[str], fecha_desde: Optional[date], fecha_hasta: Optional[date]
+):
+    tabla = Movimiento.__table__
+    statement = select(*(tabla.c[c] for c in COLUMNAS_EXPORT))
+    if nro_cuenta:
+        statement = statement.where(tabla.c.NroCta == nro_cuenta)
+    if fecha_desde:
+        statement = statement.where(tabla.c.Fech_Ope >= fecha_desde)
+    if fecha_hasta:
+        statement = statement.where(tabla.c.Fech_Ope <= fecha_hasta)
+    return statement.order_by(tabla.c.NroCta, tabla.c.NroOperNumber)
+
+
+def _formatear_bloque(filas, formato: str) -> str:
+    if formato == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(filas)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(COLUMNAS_EXPORT, fila)), ensure_ascii=False, default=str) + "\n"
+        for fila in filas
+    )
+
+
+def _cabecera(formato: str) -> Optional[str]:
+    return ",".join(COLUMNAS_EXPORT) + "\n" if formato == "csv" else None
+
+
+def exportar_movimientos(
+    nro_cuenta: Optional[str], fecha_desde: Optional[date], fecha_hasta: Optional[date],
+    formato: str
+) -> Iterator[str]:
+    """
+    Generador síncrono (StreamingResponse lo consume en el threadpool).
+    Lee de la réplica, si está configurada.
+    """
+    cabecera = _cabecera(formato)
+    if cabecera:
+        yield cabecera
+
+    with nueva_sesion_lectura() as session:
+        try:
+            result = session.execute(
+                consulta_export(nro_cuenta, fecha_desde, fecha_hasta),
+                execution_options={"stream_results": True, "yield_per": EXPORT_CHUNK_ROWS},
+            )
+            for filas in result.partitions():
+                yield _formatear_bloque(filas, formato)
+        except Exception as e:
+            # Las cabeceras HTTP ya se enviaron: solo queda cortar el stream
+            print(f"🔴 Error durante la exportación de movimientos: {e}")
+            raise
+
+
+async def exportar_movimientos_async(
+    nro_cuenta: Optional[str], fecha_desde: Optional[date], fecha_hasta: Optional[date],
+    formato: str
+) -> AsyncIterator[str]:
+    """Generador asíncrono sobre el engine async de lectura (AsyncSession.stream)."""
+    cabecera = _cabecera(formato)
+    if cabecera:
+        yield cabecera
+
+    async with nueva_sesion_lectura_async() as session:
+        try:
+            result = await session.stream(
+                consulta_export(nro_cuenta, fecha_desde, fecha_hasta),
+                execution_options={"yield_per": EXPORT_CHUNK_ROWS},
+            )
+            async for filas in result.partitions():
+                yield _formatear_bloque(filas, formato)
+        except Exception as e:
+            print(f"🔴 Error durante la exportación de movimientos: {e}")
+            raise
+
+
+# ============================================================
+#   6. Versiones asíncronas
+# ============================================================
+async def listar_movimientos_del_dia_sp_async(
+    session: Union[Session, AsyncSession],
+    cod_usu: str,
+    rol: str
+) -> List[MovimientoDelDia]:
+    return await run_service(session, listar_movimientos_del_dia_sp, cod_usu, rol)
+
+
+async def listar_ultimos_movimientos_sp_async(
+    session: Union[Session, AsyncSession],
+    nro_cuenta: str
+) -> List[MovimientoDelDia]:
+    return await run_service(session, listar_ultimos_movimientos_sp, nro_cuenta)
+
+
+async def listar_historial_async(
+    session: Union[Session, AsyncSession],
+    nro_cuenta: str,
+    limite: int,
+    cursor: Optional[str] = None,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    tipo_mov: Optional[str] = None,
+) -> Tuple[List[MovimientoHistorial], Optional[str]]:
+    return await run_service(
+        session, listar_historial, nro_cuenta, limite, cursor, fecha_desde, fecha_hasta, tipo_mov
+    )
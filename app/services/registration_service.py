@@ -1,34 +1,45 @@
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from sqlmodel import Session
-from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.schemas.registration import FullClientRegistration
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, get_password_hash_async
+from app.db.procedures import ejecutar_sp
+from app.db.session import run_service
+from app.services.catalogos_service import obtener_catalogos, obtener_catalogos_async
 
 def register_client_with_sp(session: Session, reg_data: FullClientRegistration) -> Dict[str, Any]:
     """
     Crea un nuevo Usuario y Cliente llamando al SP de forma robusta.
     Este método es más explícito y confiable para obtener los parámetros OUT.
     """
-    user_data = reg_data.user_data
-    client_data = reg_data.client_data
+    # 0. CodUbigeo contra el catálogo en memoria: un dato inválido no paga el bcrypt
+    obtener_catalogos(session).validar_ubigeo(reg_data.client_data.CodUbigeo)
 
     # 1. La encriptación de la contraseña SIEMPRE se hace en Python.
-    hashed_password = get_password_hash(user_data.Password)
+    hashed_password = get_password_hash(reg_data.user_data.Password)
+    return _registrar_cliente_sp(session, reg_data, hashed_password)
+
+
+async def register_client_with_sp_async(
+    session: Union[Session, AsyncSession], reg_data: FullClientRegistration
+) -> Dict[str, Any]:
+    """
+    Versión asíncrona: el hash (CPU) va al pool de bcrypt y la llamada al SP
+    por la sesión configurada, sin bloquear el event loop.
+    """
+    (await obtener_catalogos_async(session)).validar_ubigeo(reg_data.client_data.CodUbigeo)
+    hashed_password = await get_password_hash_async(reg_data.user_data.Password)
+    return await run_service(session, _registrar_cliente_sp, reg_data, hashed_password)
+
+
+def _registrar_cliente_sp(session: Session, reg_data: FullClientRegistration, hashed_password: str) -> Dict[str, Any]:
+    user_data = reg_data.user_data
+    client_data = reg_data.client_data
 
     try:
-        # 2. Preparamos y ejecutamos la llamada al SP.
-        #    Usamos variables de sesión estándar de MySQL (@variable).
-        query = text("""
-            CALL sp_RegisterFullClientAndUser(
-                :p_Usuario, :p_Password, :p_Rol,
-                :p_Nombres, :p_Apellidos, :p_DNI, :p_Email, :p_FechaNac,
-                :p_Direccion, :p_CodUbigeo, :p_Telefonos, :p_Movil,
-                @p_Out_CodUsu, @p_Out_CodCliente, @p_Out_Message
-            );
-        """)
-        
-        session.execute(query, {
+        # 2. Llamada al SP y lectura de sus variables OUT en un solo round trip.
+        resultado = ejecutar_sp(session, "sp_RegisterFullClientAndUser", {
             "p_Usuario": user_data.Usuario,
             "p_Password": hashed_password,
             "p_Rol": user_data.Rol,
@@ -41,25 +52,18 @@ def register_client_with_sp(session: Session, reg_data: FullClientRegistration)
             "p_CodUbigeo": client_data.CodUbigeo,
             "p_Telefonos": client_data.Telefonos,
             "p_Movil": client_data.Movil
-        })
-        
-
-        out_params_result = session.execute(
-            text("SELECT @p_Out_CodUsu, @p_Out_CodCliente, @p_Out_Message;")
-        ).first()
+        }, out=("p_Out_CodUsu", "p_Out_CodCliente", "p_Out_Message"), autonomo=True)   # el SP confirma
 
         # 4. Verificamos si el SP devolvió un mensaje de error.
-        #    El mensaje de error es el tercer valor (índice 2) que devuelve nuestro SELECT.
-        print(f"Resultado devuelto por la BD (out_params_result): {out_params_result}")
-        if out_params_result and out_params_result[2] != "OK":
-            # Si el mensaje no es NULL, significa que hubo un error de negocio.
-            raise ValueError(out_params_result[2])
+        print(f"Resultado devuelto por la BD (OUT): {resultado.out}")
+        if resultado.mensaje != "OK":
+            # Si el mensaje no es "OK", significa que hubo un error de negocio.
+            raise ValueError(resultado.mensaje)
 
         # 5. Si todo salió bien, devolvemos los códigos generados.
-        #    El CodUsu es el primer valor (índice 0) y el CodCliente el segundo (índice 1).
         return {
-            "CodUsu": out_params_result[0],
-            "CodCliente": out_params_result[1]
+            "CodUsu": resultado.out["p_Out_CodUsu"],
+            "CodCliente": resultado.out["p_Out_CodCliente"]
         }
 
     except Exception as e:
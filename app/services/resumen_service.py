@@ -0,0 +1,167 @@
+# app/services/resumen_service.py
+"""
+Resumen diario de movimientos (t_resumen_diario), mantenido de forma
+incremental: cada INSERT de movimientos suma sus cantidades e importes en
+la misma transacción, y la consulta del día lee filas ya agregadas en vez
+de recorrer t_movimientos.
+
+Solo se acumulan los movimientos que inserta la aplicación
+(movimientos_service.insertar_movimientos). Los que escriben los
+procedimientos almacenados u otros procesos directamente en la BD no pasan
+por aquí; para esos días, reconstruir_resumen() recalcula el resumen desde
+t_movimientos (POST /admin/resumen/reconstruir).
+"""
+
+import zlib
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import RESUMEN_SHARDS
+from app.db.session import run_service
+from app.models.account import Cuenta, Movimiento, ResumenDiario
+from app.schemas.movimientos import ResumenDelDia
+
+
+def fragmento_global(nro_cta: str) -> str:
+    """Fila del total del banco a la que suma la cuenta (CRC32 % RESUMEN_SHARDS)."""
+    return f"*{zlib.crc32(nro_cta.encode()) % RESUMEN_SHARDS}"
+
+
+def acumular_movimientos(session: Session, filas: List[Dict[str, Any]]) -> None:
+    """
+    Suma las filas de t_movimientos recién insertadas al resumen con un
+    único upsert multi-fila. No confirma: va en la transacción de quien
+    inserta los movimientos.
+    """
+    if not filas:
+        return
+
+    acumulado: Dict[tuple, List] = defaultdict(lambda: [0, Decimal("0")])
+    for f in filas:
+        monto = Decimal(str(f["MonOpe"] or 0))
+        for nro in (f["NroCta"], fragmento_global(f["NroCta"])):
+            fila = acumulado[(f["Fech_Ope"], nro, f["TipoMov"])]
+            fila[0] += 1
+            fila[1] += monto
+
+    # Orden fijo de claves: dos transacciones bloquean las filas en el mismo orden
+    valores = [
+        {"Fecha": fecha, "NroCta": nro, "TipoMov": tipo, "Cantidad": cantidad, "Total": total}
+        for (fecha, nro, tipo), (cantidad, total) in sorted(acumulado.items())
+    ]
+    session.execute(_upsert(session, valores))
+
+
+def reconstruir_resumen(session: Session, fecha: date) -> Dict[str, Any]:
+    """
+    Recalcula desde t_movimientos el resumen de un día (cuentas y
+    fragmentos del total del banco) y confirma.
+    """
+    r = ResumenDiario.__table__
+    m = Movimiento.__table__
+    try:
+        # El DELETE va primero: bloquea las filas del día, así que un
+        # movimiento concurrente espera y suma después de este recálculo.
+        session.execute(delete(r).where(r.c.Fecha == fecha))
+        agregados = session.execute(
+            select(m.c.NroCta, m.c.TipoMov, func.count().label("Cantidad"),
+                   func.coalesce(func.sum(m.c.MonOpe), 0).label("Total"))
+            .where(m.c.Fech_Ope == fecha, m.c.TipoMov.is_not(None))
+            .group_by(m.c.NroCta, m.c.TipoMov)
+        ).all()
+
+        acumulado: Dict[tuple, List] = defaultdict(lambda: [0, Decimal("0")])
+        for fila in agregados:
+            for nro in (fila.NroCta, fragmento_global(fila.NroCta)):
+                celda = acumulado[(nro, fila.TipoMov)]
+                celda[0] += fila.Cantidad
+                celda[1] += Decimal(str(fila.Total))
+
+        if acumulado:
+            session.execute(insert(r).values([
+                {"Fecha": fecha, "NroCta": nro, "TipoMov": tipo, "Cantidad": cantidad, "Total": total}
+                for (nro, tipo), (cantidad, total) in sorted(acumulado.items())
+            ]))
+        session.commit()
+    except Exception as e:
+        print(f"🔴 Error al reconstruir el resumen del {fecha}: {e}")
+        session.rollback()
+        raise e
+
+    return {
+        "fecha": fecha.isoformat(),
+        "movimientos": sum(f.Cantidad for f in agregados),
+        "filas": len(acumulado),
+    }
+
+
+async def reconstruir_resumen_async(session: Union[Session, AsyncSession], fecha: date) -> Dict[str, Any]:
+    return await run_service(session, reconstruir_resumen, fecha)
+
+
+def _upsert(session: Session, valores: List[Dict[str, Any]]):
+    tabla = ResumenDiario.__table__
+    dialecto = session.get_bind().dialect.name
+
+    if dialecto == "mysql":
+        stmt = mysql.insert(tabla).values(valores)
+        return stmt.on_duplicate_key_update(
+            Cantidad=tabla.c.Cantidad + stmt.inserted.Cantidad,
+            Total=tabla.c.Total + stmt.inserted.Total,
+        )
+
+    modulo = postgresql if dialecto == "postgresql" else sqlite
+    stmt = modulo.insert(tabla).values(valores)
+    return stmt.on_conflict_do_update(
+        index_elements=[tabla.c.Fecha, tabla.c.NroCta, tabla.c.TipoMov],
+        set_={
+            "Cantidad": tabla.c.Cantidad + stmt.excluded.Cantidad,
+            "Total": tabla.c.Total + stmt.excluded.Total,
+        },
+    )
+
+
+def obtener_resumen_del_dia(
+    session: Session, cod_usu: str, rol: str, fecha: Optional[date] = None
+) -> List[ResumenDelDia]:
+    """
+    Admin (rol A): totales del banco por TipoMov (RESUMEN_SHARDS filas por tipo).
+    Resto: totales por cuenta y TipoMov de las cuentas del usuario.
+    """
+    fecha = fecha or date.today()
+    r = ResumenDiario.__table__
+
+    if rol == "A":
+        statement = (
+            select(r.c.TipoMov, func.sum(r.c.Cantidad).label("Cantidad"), func.sum(r.c.Total).label("Total"))
+            .where(r.c.Fecha == fecha, r.c.NroCta.in_([f"*{i}" for i in range(RESUMEN_SHARDS)]))
+            .group_by(r.c.TipoMov)
+            .order_by(r.c.TipoMov)
+        )
+    else:
+        statement = (
+            select(r.c.NroCta, r.c.TipoMov, r.c.Cantidad, r.c.Total)
+            .join(Cuenta, Cuenta.NroCta == r.c.NroCta)
+            .where(r.c.Fecha == fecha, Cuenta.CodUsu == cod_usu)
+            .order_by(r.c.NroCta, r.c.TipoMov)
+        )
+
+    try:
+        return [ResumenDelDia.model_validate(dict(row)) for row in session.execute(statement).mappings()]
+    except Exception as e:
+        print(f"🔴 Error al leer el resumen diario: {e}")
+        session.rollback()
+        raise e
+
+
+async def obtener_resumen_del_dia_async(
+    session: Union[Session, AsyncSession], cod_usu: str, rol: str, fecha: Optional[date] = None
+) -> List[ResumenDelDia]:
+    return await run_service(session, obtener_resumen_del_dia, cod_usu, rol, fecha)
@@ -0,0 +1,108 @@
+# app/services/secuencia_service.py
+
+from typing import Dict, Optional
+from sqlmodel import Session
+from sqlalchemy import select, update, insert, func, case
+from sqlalchemy.exc import IntegrityError
+
+from app.models.account import Movimiento, SecuenciaOperacion
+
+
+def reservar_nro_operacion(
+    session: Session,
+    nro_cta: str,
+    tipo_cta: Optional[str] = None,
+    cantidad: int = 1
+) -> int:
+    """
+    Reserva `cantidad` NroOperNumber consecutivos para la cuenta y devuelve
+    el primero. Coste O(1): un UPDATE y un SELECT por clave primaria.
+
+    El UPDATE bloquea la fila de t_secuencia_oper hasta el commit de la
+    transacción que llama, así que dos transferencias concurrentes sobre la
+    misma cuenta nunca reciben el mismo número.
+    """
+    incremento = (
+        update(SecuenciaOperacion)
+        .where(SecuenciaOperacion.NroCta == nro_cta)
+        .values(UltNroOper=SecuenciaOperacion.UltNroOper + cantidad)
+    )
+
+    if session.execute(incremento).rowcount == 0:
+        _inicializar_secuencia(session, nro_cta, tipo_cta)
+        session.execute(incremento)
+
+    ultimo = session.execute(
+        select(SecuenciaOperacion.UltNroOper).where(SecuenciaOperacion.NroCta == nro_cta)
+    ).scalar_one()
+
+    return ultimo - cantidad + 1
+
+
+def reservar_nros_operacion(
+    session: Session,
+    cantidades: Dict[str, int],
+    tipos_cta: Optional[Dict[str, str]] = None
+) -> Dict[str, int]:
+    """
+    Versión por lote de reservar_nro_operacion: reserva cantidades[NroCta]
+    números para cada cuenta con un solo UPDATE (CASE por cuenta) y un solo
+    SELECT. Devuelve {NroCta: primer número reservado}.
+    """
+    if not cantidades:
+        return {}
+    tipos_cta = tipos_cta or {}
+    nros = sorted(cantidades)
+
+    def incrementar(cuentas):
+        return session.execute(
+            update(SecuenciaOperacion)
+            .where(SecuenciaOperacion.NroCta.in_(cuentas))
+            .values(UltNroOper=SecuenciaOperacion.UltNroOper + case(
+                {nro: cantidades[nro] for nro in cuentas},
+                value=SecuenciaOperacion.NroCta,
+            ))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    if incrementar(nros) < len(nros):
+        # Cuentas sin contador: se crean y se incrementan solo esas
+        existentes = set(session.execute(
+            select(SecuenciaOperacion.NroCta).where(SecuenciaOperacion.NroCta.in_(nros))
+        ).scalars())
+        nuevas = [nro for nro in nros if nro not in existentes]
+        for nro in nuevas:
+            _inicializar_secuencia(session, nro, tipos_cta.get(nro))
+        incrementar(nuevas)
+
+    ultimos = session.execute(
+        select(SecuenciaOperacion.NroCta, SecuenciaOperacion.UltNroOper)
+        .where(SecuenciaOperacion.NroCta.in_(nros))
+    ).all()
+
+    return {nro: ultimo - cantidades[nro] + 1 for nro, ultimo in ultimos}
+
+
+def _inicializar_secuencia(session: Session, nro_cta: str, tipo_cta: Optional[str]) -> None:
+    """
+    Crea el contador de una cuenta que aún no lo tiene (cuentas nuevas o
+    anteriores a la migración), partiendo del máximo existente. Solo ocurre
+    una vez por cuenta.
+    """
+    maximo = select(func.coalesce(func.max(Movimiento.NroOperNumber), 0)).where(
+        Movimiento.NroCta == nro_cta
+    )
+    if tipo_cta is not None:
+        # Prefijo de la PK (TipoCta, NroCta, NroOperNumber) → búsqueda por índice
+        maximo = maximo.where(Movimiento.TipoCta == tipo_cta)
+
+    ultimo = session.execute(maximo).scalar_one()
+
+    try:
+        with session.begin_nested():
+            session.execute(
+                insert(SecuenciaOperacion).values(NroCta=nro_cta, UltNroOper=ultimo)
+            )
+    except IntegrityError:
+        # Otra transacción creó el contador primero; el UPDATE posterior lo usará.
+        pass
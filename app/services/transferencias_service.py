@@ -1,111 +1,284 @@
-from app.db.session import get_session
-from app.models.account import Cuenta, Movimiento
+from typing import Dict, Iterable, List, Union
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.retry import con_reintentos, con_reintentos_async
+from app.models.account import Cuenta
+from app.services.movimientos_service import TIPO_MOV_TRANSFERENCIA, insertar_movimientos
+from app.services.secuencia_service import reservar_nro_operacion, reservar_nros_operacion
 from app.schemas.transferencias_schema import TransferenciaRequest
 from datetime import date
 from decimal import Decimal
 from sqlalchemy.exc import SQLAlchemyError
 
 
+class ErrorBD(Exception):
+    """Fallo de la BD (no de negocio) al transferir; el cliente puede reintentar."""
+
+
 class TransferenciaService:
 
     @staticmethod
-    def realizar_transferencia(data: TransferenciaRequest):
+    async def realizar_transferencia_async(db: Union[Session, AsyncSession], data: TransferenciaRequest):
+        try:
+            resultado, reintentos = await con_reintentos_async(
+                db, TransferenciaService._ejecutar_transferencia, data
+            )
+        except SQLAlchemyError as e:
+            raise ErrorBD(f"Error en la BD: {str(e)}")
+
+        resultado["reintentos"] = reintentos
+        return resultado
 
-        db = next(get_session())
+    @staticmethod
+    def realizar_transferencia(db: Session, data: TransferenciaRequest):
+        """
+        Transfiere entre dos cuentas bloqueando ambas filas de t_cuentas en
+        orden de NroCta (sin deadlocks A→B / B→A). Si aun así la BD aborta por
+        deadlock o lock wait timeout, la transacción completa se reintenta.
+        """
         try:
-            # ----------------------------------------
-            # 1. Obtener cuentas
-            # ----------------------------------------
-            origen = db.query(Cuenta).filter(Cuenta.NroCta == data.cuenta_origen).first()
-            destino = db.query(Cuenta).filter(Cuenta.NroCta == data.cuenta_destino).first()
+            resultado, reintentos = con_reintentos(
+                db, TransferenciaService._ejecutar_transferencia, data
+            )
+        except SQLAlchemyError as e:
+            raise ErrorBD(f"Error en la BD: {str(e)}")
 
-            if not origen:
-                raise Exception("La cuenta de origen no existe")
+        resultado["reintentos"] = reintentos
+        return resultado
 
-            if not destino:
-                raise Exception("La cuenta de destino no existe")
+    # ----------------------------------------------------------------
+    # TRANSFERENCIAS EN LOTE
+    # ----------------------------------------------------------------
 
-            # ----------------------------------------
-            # 2. Validar embargo
-            # ----------------------------------------
-            if origen.Fech_Bloq is not None:
-                raise Exception("La cuenta de origen está embargada o bloqueada")
+    @staticmethod
+    def realizar_transferencias_batch(db: Session, items: List[TransferenciaRequest], chunk: int) -> Dict:
+        """
+        Procesa la lista en bloques de `chunk` transferencias, una transacción
+        por bloque. Un fallo de negocio solo afecta a su transferencia; un
+        error de BD no recuperable marca como fallido su bloque completo.
+        """
+        resultados: List[Dict] = []
+        reintentos_totales = 0
 
-            # ----------------------------------------
-            # 3. Validar cuenta a plazo
-            # ----------------------------------------
-            if origen.TipoCta == "PF":     # Ajustar según códigos reales de tu BD
-                raise Exception("La cuenta de origen es de plazo fijo y no permite transferencias")
+        for inicio in range(0, len(items), chunk):
+            bloque = items[inicio:inicio + chunk]
+            try:
+                parcial, reintentos = con_reintentos(
+                    db, TransferenciaService._ejecutar_bloque, bloque, inicio
+                )
+                reintentos_totales += reintentos
+            except SQLAlchemyError as e:
+                parcial = TransferenciaService._bloque_fallido(bloque, inicio, e)
+            resultados.extend(parcial)
 
-            # ----------------------------------------
-            # 4. Validar saldo
-            # ----------------------------------------
-            monto = Decimal(str(data.monto))
+        return TransferenciaService._resumen_batch(resultados, reintentos_totales)
+
+    @staticmethod
+    async def realizar_transferencias_batch_async(
+        db: Union[Session, AsyncSession], items: List[TransferenciaRequest], chunk: int
+    ) -> Dict:
+        resultados: List[Dict] = []
+        reintentos_totales = 0
+
+        for inicio in range(0, len(items), chunk):
+            bloque = items[inicio:inicio + chunk]
+            try:
+                parcial, reintentos = await con_reintentos_async(
+                    db, TransferenciaService._ejecutar_bloque, bloque, inicio
+                )
+                reintentos_totales += reintentos
+            except SQLAlchemyError as e:
+                parcial = TransferenciaService._bloque_fallido(bloque, inicio, e)
+            resultados.extend(parcial)
 
-            if origen.SaldAct < monto:
-                raise Exception("Saldo insuficiente")
+        return TransferenciaService._resumen_batch(resultados, reintentos_totales)
 
+    # ----------------------------------------------------------------
+    # LÓGICA COMÚN (dentro de la transacción)
+    # ----------------------------------------------------------------
+
+    @staticmethod
+    def _ejecutar_transferencia(db: Session, data: TransferenciaRequest):
+
+        try:
             # ----------------------------------------
-            # 5. Actualizar saldos
+            # 1. Obtener y BLOQUEAR cuentas (SELECT ... FOR UPDATE)
+            #    Siempre en orden de NroCta → orden de bloqueo determinista
             # ----------------------------------------
-            origen.SaldAct -= monto
-            destino.SaldAct += monto
+            cuentas = TransferenciaService._bloquear_cuentas(
+                db, (data.cuenta_origen, data.cuenta_destino)
+            )
 
             # ----------------------------------------
-            # 6. Registrar movimiento ORIGEN
+            # 2 a 5. Validar y actualizar saldos
             # ----------------------------------------
-            mov_origen = Movimiento(
-                TipoCta=origen.TipoCta,    # <<--- AGREGADO
-                NroCta=origen.NroCta,
-                NroOperNumber=TransferenciaService._next_oper_number(db, origen.NroCta),
-                Fech_Ope=date.today(),
-                CodUsu=data.cod_usuario,
-                TipoMov="TR",
-                MonOpe=monto * -1,
-                Estado="A"
-            )
+            origen, destino, monto = TransferenciaService._aplicar(cuentas, data)
 
             # ----------------------------------------
-            # 7. Registrar movimiento DESTINO
+            # 6 y 7. Registrar movimientos ORIGEN y DESTINO
             # ----------------------------------------
-            mov_destino = Movimiento(
-                TipoCta=destino.TipoCta,   # <<--- AGREGADO
-                NroCta=destino.NroCta,
-                NroOperNumber=TransferenciaService._next_oper_number(db, destino.NroCta),
-                Fech_Ope=date.today(),
-                CodUsu=data.cod_usuario,
-                TipoMov="TR",
-                MonOpe=monto,
-                Estado="A"
-            )
+            # Números de operación en el mismo orden que los bloqueos de cuenta
+            nro_oper = {
+                cta.NroCta: reservar_nro_operacion(db, cta.NroCta, cta.TipoCta)
+                for cta in sorted((origen, destino), key=lambda c: c.NroCta)
+            }
 
-            db.add(mov_origen)
-            db.add(mov_destino)
+            insertar_movimientos(db, [
+                TransferenciaService._fila_movimiento(origen, nro_oper[origen.NroCta], data, monto * -1),
+                TransferenciaService._fila_movimiento(destino, nro_oper[destino.NroCta], data, monto),
+            ])
 
+            saldo_origen = float(origen.SaldAct)
+            saldo_destino = float(destino.SaldAct)
             db.commit()
-            db.refresh(origen)
-            db.refresh(destino)
 
             return {
                 "mensaje": "Transferencia realizada correctamente",
-                "saldo_origen": float(origen.SaldAct),
-                "saldo_destino": float(destino.SaldAct)
+                "saldo_origen": saldo_origen,
+                "saldo_destino": saldo_destino
             }
 
-        except SQLAlchemyError as e:
+        except Exception:
             db.rollback()
-            raise Exception(f"Error en la BD: {str(e)}")
+            raise
+
+    @staticmethod
+    def _ejecutar_bloque(db: Session, bloque: List[TransferenciaRequest], inicio: int) -> List[Dict]:
+        try:
+            # 1. Bloquear TODAS las cuentas del bloque en un solo SELECT ordenado
+            cuentas = TransferenciaService._bloquear_cuentas(
+                db, (n for t in bloque for n in (t.cuenta_origen, t.cuenta_destino))
+            )
+
+            # 2. Aplicar cada transferencia en memoria sobre las filas bloqueadas
+            resultados: List[Dict] = []
+            aplicadas = []
+            for i, data in enumerate(bloque, start=inicio):
+                try:
+                    origen, destino, monto = TransferenciaService._aplicar(cuentas, data)
+                except Exception as e:
+                    resultados.append({"indice": i, "ok": False, "mensaje": str(e)})
+                    continue
+                aplicadas.append((data, origen, destino, monto))
+                resultados.append({
+                    "indice": i,
+                    "ok": True,
+                    "mensaje": "Transferencia realizada correctamente",
+                    "saldo_origen": float(origen.SaldAct),
+                    "saldo_destino": float(destino.SaldAct),
+                })
+
+            # 3. Reservar los NroOperNumber de todas las cuentas (un UPDATE + un SELECT)
+            por_cuenta: Dict[str, int] = {}
+            for _, origen, destino, _ in aplicadas:
+                por_cuenta[origen.NroCta] = por_cuenta.get(origen.NroCta, 0) + 1
+                por_cuenta[destino.NroCta] = por_cuenta.get(destino.NroCta, 0) + 1
+            siguiente = reservar_nros_operacion(
+                db, por_cuenta, {nro: cuentas[nro].TipoCta for nro in por_cuenta}
+            )
 
-        except Exception as e:
+            # 4. Un único INSERT multi-fila con todos los movimientos del bloque
+            filas = []
+            for data, origen, destino, monto in aplicadas:
+                for cuenta, importe in ((origen, monto * -1), (destino, monto)):
+                    filas.append(TransferenciaService._fila_movimiento(
+                        cuenta, siguiente[cuenta.NroCta], data, importe
+                    ))
+                    siguiente[cuenta.NroCta] += 1
+            insertar_movimientos(db, filas)
+
+            db.commit()
+            return resultados
+
+        except Exception:
             db.rollback()
             raise
 
     @staticmethod
-    def _next_oper_number(db, nro_cta: str):
-        last = (
-            db.query(Movimiento)
-            .filter(Movimiento.NroCta == nro_cta)
-            .order_by(Movimiento.NroOperNumber.desc())
-            .first()
-        )
-        return 1 if last is None else last.NroOperNumber + 1
+    def _bloquear_cuentas(db: Session, nros: Iterable[str]) -> Dict[str, Cuenta]:
+        return {
+            c.NroCta: c
+            for c in db.exec(
+                select(Cuenta)
+                .where(Cuenta.NroCta.in_(sorted(set(nros))))
+                .order_by(Cuenta.NroCta)
+                .with_for_update()
+            ).all()
+        }
+
+    @staticmethod
+    def _aplicar(cuentas: Dict[str, Cuenta], data: TransferenciaRequest):
+        """Valida la transferencia sobre las cuentas bloqueadas y mueve los saldos."""
+        monto = Decimal(str(data.monto))
+        if not monto.is_finite():
+            raise Exception("El monto no es un número válido")
+
+        # Al céntimo, como SaldAct y MonOpe; se valida ya redondeado
+        monto = monto.quantize(Decimal("0.01"))
+        if monto <= 0:
+            raise Exception("El monto debe ser de al menos 0.01")
+
+        if data.cuenta_origen == data.cuenta_destino:
+            raise Exception("La cuenta de origen y destino deben ser distintas")
+
+        origen = cuentas.get(data.cuenta_origen)
+        destino = cuentas.get(data.cuenta_destino)
+
+        if not origen:
+            raise Exception("La cuenta de origen no existe")
+
+        if not destino:
+            raise Exception("La cuenta de destino no existe")
+
+        # Validar embargo
+        if origen.Fech_Bloq is not None:
+            raise Exception("La cuenta de origen está embargada o bloqueada")
+
+        if origen.EmbargoTotal:
+            raise Exception("La cuenta de origen tiene un embargo total activo")
+
+        # Validar cuenta a plazo
+        if origen.TipoCta == "PF":     # Ajustar según códigos reales de tu BD
+            raise Exception("La cuenta de origen es de plazo fijo y no permite transferencias")
+
+        # Validar saldo disponible: lo embargado no se puede transferir
+        # (filas bloqueadas: el saldo leído no cambia)
+        if origen.SaldAct - origen.MontoEmbargado < monto:
+            raise Exception("Saldo insuficiente")
+
+        # Actualizar saldos
+        origen.SaldAct -= monto
+        destino.SaldAct += monto
+        return origen, destino, monto
+
+    @staticmethod
+    def _fila_movimiento(cuenta: Cuenta, nro_oper: int, data: TransferenciaRequest, monto: Decimal) -> Dict:
+        return {
+            "TipoCta": cuenta.TipoCta,
+            "NroCta": cuenta.NroCta,
+            "NroOperNumber": nro_oper,
+            "Fech_Ope": date.today(),
+            "CodUsu": data.cod_usuario,
+            "TipoMov": TIPO_MOV_TRANSFERENCIA,
+            "MonOpe": monto,
+            "Estado": "A",
+        }
+
+    @staticmethod
+    def _bloque_fallido(bloque: List[TransferenciaRequest], inicio: int, error: Exception) -> List[Dict]:
+        mensaje = f"Error en la BD: {str(error)}"
+        return [
+            {"indice": i, "ok": False, "mensaje": mensaje}
+            for i in range(inicio, inicio + len(bloque))
+        ]
+
+    @staticmethod
+    def _resumen_batch(resultados: List[Dict], reintentos: int) -> Dict:
+        exitosas = sum(1 for r in resultados if r["ok"])
+        return {
+            "procesadas": len(resultados),
+            "exitosas": exitosas,
+            "fallidas": len(resultados) - exitosas,
+            "reintentos": reintentos,
+            "resultados": resultados,
+        }
@@ -0,0 +1,89 @@
+# app/services/user_cache.py
+"""
+Caché de registros Usuario por nombre de usuario para get_current_user.
+
+La invalidación explícita (update_user, inactivar_usuario_sp) es local al
+worker que atiende la escritura. En el resto de workers un usuario
+inactivado, o con otro rol, sigue autenticándose con el registro anterior
+hasta que vence su entrada: USER_CACHE_TTL (30 s por defecto) es el máximo
+que tarda en verse el cambio, y por eso debe ser corto.
+
+Una invalidación que llega mientras cargar_usuario lee la BD no debe
+quedar tapada por el registro leído antes: cada invalidación marca el
+usuario con una generación y la carga no guarda en caché si la marca es
+posterior a su inicio. Una marca solo sirve mientras sigue en curso alguna
+carga empezada antes que ella: sin cargas en curso se vacían todas, y si
+se acumulan más de USER_CACHE_MAXSIZE se descartan las que ya no afectan
+a ninguna.
+"""
+
+import itertools
+import threading
+from typing import Dict, Optional, Set, Tuple
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.core.config import USER_CACHE_MAXSIZE, USER_CACHE_TTL
+from app.models.user import Usuario
+
+usuarios_cache = TTLCache(USER_CACHE_MAXSIZE, USER_CACHE_TTL, nombre="usuarios")
+
+# ("u", username) / ("c", CodUsu) -> generación de su última invalidación
+_generacion = itertools.count(1)
+_invalidado_en: Dict[Tuple[str, str], int] = {}
+# Generación de inicio de cada carga en curso
+_cargas_en_curso: Set[int] = set()
+_lock = threading.Lock()
+
+
+def obtener_usuario_cacheado(username: str) -> Optional[Usuario]:
+    """Copia del usuario en caché, o None si no está (no toca la BD)."""
+    user = usuarios_cache.get(username)
+    return user.model_copy() if user is not None else None
+
+
+def cargar_usuario(session: Session, username: str) -> Optional[Usuario]:
+    """
+    Lee el usuario de t_usuario y lo guarda en caché (copia desligada de la
+    sesión), salvo que se haya invalidado durante la lectura.
+    """
+    with _lock:
+        inicio = next(_generacion)
+        _cargas_en_curso.add(inicio)
+    try:
+        user = session.exec(select(Usuario).where(Usuario.Usuario == username)).first()
+        if user is None:
+            return None
+        copia = Usuario.model_validate(user.model_dump())
+
+        with _lock:
+            invalidado = max(_invalidado_en.get(("u", username), 0), _invalidado_en.get(("c", copia.CodUsu), 0))
+            if invalidado < inicio:
+                usuarios_cache.set(username, copia)
+        return copia.model_copy()
+    finally:
+        with _lock:
+            _cargas_en_curso.discard(inicio)
+            _podar_marcas()
+
+
+def _podar_marcas() -> None:
+    """Descarta las marcas que ninguna carga en curso puede ver (con _lock)."""
+    if not _cargas_en_curso:
+        _invalidado_en.clear()
+    elif len(_invalidado_en) > USER_CACHE_MAXSIZE:
+        primera = min(_cargas_en_curso)
+        for clave in [c for c, g in _invalidado_en.items() if g < primera]:
+            del _invalidado_en[clave]
+
+
+def invalidar_usuario(username: Optional[str] = None, codusu: Optional[str] = None) -> None:
+    with _lock:
+        generacion = next(_generacion)
+        if username is not None:
+            _invalidado_en[("u", username)] = generacion
+            usuarios_cache.invalidate(username)
+        if codusu is not None:
+            _invalidado_en[("c", codusu)] = generacion
+            usuarios_cache.invalidate_where(lambda _, u: u.CodUsu == codusu)
+        _podar_marcas()
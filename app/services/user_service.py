@@ -1,12 +1,17 @@
 # app/services/user_service.py
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 from datetime import datetime, timedelta
 
-from sqlalchemy import text
+from sqlalchemy import case, update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
+from app.core.password_pool import HashPoolSaturado
+from app.db.procedures import ejecutar_sp
+from app.db.session import run_service
+from app.services.user_cache import invalidar_usuario
 from app.models.user import Usuario
 from app.schemas.user import (
     UsuarioCreate,
@@ -15,14 +20,11 @@ from app.schemas.user import (
     StaffRegistrationData
 )
 
-from passlib.context import CryptContext
-
 # ============================================================
 #  CONFIGURACIÓN
 # ============================================================
 
 BLOQUEO_MINUTOS = 15
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 # ============================================================
@@ -33,93 +35,125 @@ def authenticate_user_with_sp(
     session: Session, username: str, password: str
 ) -> tuple[Optional[UserFromDB], list]:
 
-    result_list: list = []
-
     try:
-        # ------------------------------------------------------------
-        # 1) OBTENER USUARIO REAL EN t_usuario
-        # ------------------------------------------------------------
-        statement = select(Usuario).where(Usuario.Usuario == username)
-        user_obj: Optional[Usuario] = session.exec(statement).first()
-
-        if not user_obj:
-            print(f"Usuario '{username}' no existe en t_usuario.")
-            return None, []
-
-        # ------------------------------------------------------------
-        # 2) VALIDAR ESTADO (empleado inactivo NO ingresa)
-        # ------------------------------------------------------------
-        if user_obj.Rol == "E" and user_obj.Estado != "A":
-            print(f"Empleado '{username}' está INACTIVO.")
-            return {"error": "inactivo"}, []
-
-        # ------------------------------------------------------------
-        # 3) BLOQUEO TEMPORAL SI TIENE ≥3 INTENTOS
-        # ------------------------------------------------------------
-        if user_obj.IntentosFallidos >= 3 and user_obj.UltimoIntento:
-            tiempo_transcurrido = datetime.now() - user_obj.UltimoIntento
-
-            if tiempo_transcurrido < timedelta(minutes=BLOQUEO_MINUTOS):
-                print("Usuario bloqueado temporalmente por intentos fallidos.")
-                return {"error": "bloqueado"}, []
-
-            # Ya pasó el tiempo → desbloquear
-            user_obj.IntentosFallidos = 0
-            session.add(user_obj)
-            session.commit()
+        # Pasos 1) a 4): usuario, estado, bloqueo y datos del SP
+        cod_usu, user, result_list = _cargar_datos_login(session, username)
+        if not isinstance(user, UserFromDB):
+            return user, []
 
         # ------------------------------------------------------------
-        # 4) EJECUTAR SP PARA OBTENER DATOS DEL USUARIO
+        # 5) VALIDAR CONTRASEÑA
         # ------------------------------------------------------------
-        query = text("CALL sp_ValidateUserLogin(:p_Username, @p_Out_Message);")
-        result_proxy = session.execute(query, {"p_Username": username})
-        result_list = result_proxy.mappings().all()
+        password_ok = security.verify_password(password, user.HashedPassword)
 
-        # OUT message
-        message_result = session.execute(text("SELECT @p_Out_Message;"))
-        message_from_db = message_result.scalar_one_or_none()
+        # 6) REGISTRAR INTENTO Y 7) RETORNAR RESULTADOS
+        return _registrar_resultado_login(session, cod_usu, user, result_list, password_ok)
 
-        if "Error:" in (message_from_db or ""):
-            print(f"SP error para '{username}': {message_from_db}")
-            return None, []
+    except HashPoolSaturado:
+        # No es un fallo de credenciales: el endpoint responde 503
+        raise
 
-        if not result_list:
-            print(f"SP no encontró datos para '{username}'.")
-            return None, []
-
-        user_data = result_list[0]
-        user = UserFromDB.model_validate(user_data)
-
-        # ------------------------------------------------------------
-        # 5) VALIDAR CONTRASEÑA
-        # ------------------------------------------------------------
-        if not security.verify_password(password, user.HashedPassword):
-            print(f"Contraseña incorrecta para '{username}'.")
+    except Exception as e:
+        print(f"🔴 Error inesperado en authenticate_user_with_sp: {e}")
+        return None, []
 
-            user_obj.IntentosFallidos += 1
-            user_obj.UltimoIntento = datetime.now()
 
-            session.add(user_obj)
-            session.commit()
-            return {"error": "password"}, []
+def _cargar_datos_login(session: Session, username: str) -> tuple[Optional[str], Any, list]:
+    """
+    Devuelve (cod_usu, user, result_list). Si user no es un UserFromDB,
+    el login termina aquí y user es None o el diccionario de error.
+
+    Estado de bloqueo (t_usuario), result set de sp_ValidateUserLogin y
+    su @p_Out_Message llegan en un solo round trip (ejecutar_sp con
+    consulta previa); aquí no se escribe nada, la contabilidad del
+    intento va en un solo UPDATE.
+    """
+    # ------------------------------------------------------------
+    # 1) USUARIO REAL EN t_usuario + SP (un round trip)
+    # ------------------------------------------------------------
+    resultado = ejecutar_sp(
+        session, "sp_ValidateUserLogin", {"p_Username": username},
+        out=("p_Out_Message",),
+        previa=select(
+            Usuario.CodUsu, Usuario.Rol, Usuario.Estado, Usuario.IntentosFallidos, Usuario.UltimoIntento
+        ).where(Usuario.Usuario == username),
+        autonomo=True,   # solo lee: el intento se registra después por la sesión
+    )
 
+    if not resultado.previa:
+        print(f"Usuario '{username}' no existe en t_usuario.")
+        return None, None, []
+
+    user_row = resultado.previa[0]
+    cod_usu = user_row["CodUsu"]
+
+    # ------------------------------------------------------------
+    # 2) VALIDAR ESTADO (empleado inactivo NO ingresa)
+    # ------------------------------------------------------------
+    if user_row["Rol"] == "E" and user_row["Estado"] != "A":
+        print(f"Empleado '{username}' está INACTIVO.")
+        return cod_usu, {"error": "inactivo"}, []
+
+    # ------------------------------------------------------------
+    # 3) BLOQUEO TEMPORAL SI TIENE ≥3 INTENTOS
+    # ------------------------------------------------------------
+    # Si el bloqueo ya venció no se desbloquea aquí: el UPDATE del
+    # resultado (paso 6) reinicia el contador.
+    if user_row["IntentosFallidos"] >= 3 and user_row["UltimoIntento"]:
+        tiempo_transcurrido = datetime.now() - user_row["UltimoIntento"]
+
+        if tiempo_transcurrido < timedelta(minutes=BLOQUEO_MINUTOS):
+            print("Usuario bloqueado temporalmente por intentos fallidos.")
+            return cod_usu, {"error": "bloqueado"}, []
+
+    # ------------------------------------------------------------
+    # 4) DATOS DEL USUARIO SEGÚN EL SP
+    # ------------------------------------------------------------
+    message_from_db = resultado.mensaje
+    if "Error:" in (message_from_db or ""):
+        print(f"SP error para '{username}': {message_from_db}")
+        return cod_usu, None, []
+
+    result_list = resultado.filas
+    if not result_list:
+        print(f"SP no encontró datos para '{username}'.")
+        return cod_usu, None, []
+
+    return cod_usu, UserFromDB.model_validate(result_list[0]), result_list
+
+
+def _registrar_resultado_login(
+    session: Session, cod_usu: str, user: UserFromDB, result_list: list, password_ok: bool
+) -> tuple[Any, list]:
+    # Un solo UPDATE atómico
+    if not password_ok:
+        print(f"Contraseña incorrecta para '{user.Usuario}'.")
+
+        # Con ≥3 intentos aquí el bloqueo ya venció: se empieza de nuevo en 1
+        intentos = case(
+            (Usuario.IntentosFallidos >= 3, 1),
+            else_=Usuario.IntentosFallidos + 1,
+        )
+    else:
         # ------------------------------------------------------------
         # 6) LOGIN EXITOSO → RESET
         # ------------------------------------------------------------
-        user_obj.IntentosFallidos = 0
-        user_obj.UltimoIntento = datetime.now()
+        intentos = 0
 
-        session.add(user_obj)
-        session.commit()
+    session.execute(
+        update(Usuario)
+        .where(Usuario.CodUsu == cod_usu)
+        .values(IntentosFallidos=intentos, UltimoIntento=datetime.now())
+    )
+    session.commit()
 
-        # ------------------------------------------------------------
-        # 7) RETORNAR RESULTADOS PARA EL ENDPOINT
-        # ------------------------------------------------------------
-        return user, result_list
+    if not password_ok:
+        return {"error": "password"}, []
 
-    except Exception as e:
-        print(f"🔴 Error inesperado en authenticate_user_with_sp: {e}")
-        return None, []
+    # ------------------------------------------------------------
+    # 7) RETORNAR RESULTADOS PARA EL ENDPOINT
+    # ------------------------------------------------------------
+    return user, result_list
 
 
 # ============================================================
@@ -127,11 +161,15 @@ def authenticate_user_with_sp(
 # ============================================================
 
 def create_user(session: Session, user_in: UsuarioCreate) -> Usuario:
+    return _crear_usuario(session, user_in, security.get_password_hash(user_in.Password))
+
+
+def _crear_usuario(session: Session, user_in: UsuarioCreate, hashed_password: str) -> Usuario:
     db_user = Usuario(
         CodUsu=user_in.CodUsu,
         Usuario=user_in.Usuario,
         Rol=user_in.Rol,
-        HashedPassword=security.get_password_hash(user_in.Password),
+        HashedPassword=hashed_password,
         Estado="A"
     )
 
@@ -146,11 +184,22 @@ def create_user(session: Session, user_in: UsuarioCreate) -> Usuario:
 # ============================================================
 
 def update_user(session: Session, codusu: str, data: UsuarioUpdate) -> Dict[str, Any]:
+    hashed_password = (
+        security.get_password_hash(data.Password) if data.Password is not None else None
+    )
+    return _actualizar_usuario(session, codusu, data, hashed_password)
+
+
+def _actualizar_usuario(
+    session: Session, codusu: str, data: UsuarioUpdate, hashed_password: Optional[str]
+) -> Dict[str, Any]:
     user = session.get(Usuario, codusu)
 
     if not user:
         raise Exception("El usuario no existe")
 
+    username_anterior = user.Usuario
+
     if data.Usuario is not None:
         user.Usuario = data.Usuario
 
@@ -160,13 +209,16 @@ def update_user(session: Session, codusu: str, data: UsuarioUpdate) -> Dict[str,
     if data.Estado is not None:
         user.Estado = data.Estado
 
-    if data.Password is not None:
-        user.HashedPassword = security.get_password_hash(data.Password)
+    if hashed_password is not None:
+        user.HashedPassword = hashed_password
 
     session.add(user)
     session.commit()
     session.refresh(user)
 
+    # Rol/Estado/contraseña cambiados → fuera de la caché de get_current_user
+    invalidar_usuario(username=username_anterior, codusu=user.CodUsu)
+
     return {
         "mensaje": "Usuario actualizado correctamente",
         "CodUsu": user.CodUsu,
@@ -181,9 +233,7 @@ def update_user(session: Session, codusu: str, data: UsuarioUpdate) -> Dict[str,
 # ============================================================
 
 def listar_administradores(session: Session):
-    query = text("CALL sp_ListarAdministradores();")
-    result = session.execute(query)
-    return [dict(row) for row in result.mappings().all()]
+    return ejecutar_sp(session, "sp_ListarAdministradores").filas
 
 
 # ============================================================
@@ -191,10 +241,7 @@ def listar_administradores(session: Session):
 # ============================================================
 
 def listar_empleados(session: Session):
-    query = text("CALL sp_ListarEmpleados();")
-    result = session.execute(query)
-
-    empleados = [dict(row) for row in result.mappings().all()]
+    empleados = ejecutar_sp(session, "sp_ListarEmpleados").filas
     return [emp for emp in empleados if emp.get("Rol") == "E"]
 
 
@@ -204,7 +251,11 @@ def listar_empleados(session: Session):
 
 def register_staff_sp(session: Session, user_data: StaffRegistrationData) -> Dict[str, Any]:
 
-    hashed_password = pwd_context.hash(user_data.Password)
+    hashed_password = security.get_password_hash(user_data.Password)
+    return _simular_registro_staff(user_data, hashed_password)
+
+
+def _simular_registro_staff(user_data: StaffRegistrationData, hashed_password: str) -> Dict[str, Any]:
 
     if user_data.Usuario == "fail_test":
         raise ValueError("El usuario ya existe en la base de datos.")
@@ -221,24 +272,82 @@ def register_staff_sp(session: Session, user_data: StaffRegistrationData) -> Dic
 
 def inactivar_usuario_sp(session: Session, codusu: str) -> dict:
     try:
-        # Ejecutar SP
-        session.execute(
-            text("CALL sp_InactivarUsuario(:cod, @msg);"),
-            {"cod": codusu}
-        )
+        # Ejecutar SP y obtener mensaje OUT, en la transacción de la sesión
+        resultado = ejecutar_sp(session, "sp_InactivarUsuario", {"cod": codusu}, out=("msg",))
 
         # 🚀 IMPORTANTE: confirmar cambios del SP
         session.commit()
 
-        # Obtener mensaje OUT
-        result = session.execute(text("SELECT @msg;"))
-        message = result.scalar_one_or_none()
+        # El usuario inactivado debe rechazarse ya, no al expirar la caché
+        invalidar_usuario(codusu=codusu)
 
         return {
             "CodUsu": codusu,
-            "Mensaje": message
+            "Mensaje": resultado.out["msg"]
         }
 
     except Exception as e:
         session.rollback()
         raise Exception(f"Error al inactivar usuario: {e}")
+
+
+# ============================================================
+# VERSIONES ASÍNCRONAS
+# ============================================================
+# La E/S va por run_service (driver async o threadpool) y el
+# trabajo de bcrypt al pool de procesos: nunca en el event loop.
+
+async def authenticate_user_with_sp_async(
+    session: Union[Session, AsyncSession], username: str, password: str
+) -> tuple[Optional[UserFromDB], list]:
+    try:
+        cod_usu, user, result_list = await run_service(session, _cargar_datos_login, username)
+        if not isinstance(user, UserFromDB):
+            return user, []
+
+        password_ok = await security.verify_password_async(password, user.HashedPassword)
+
+        return await run_service(
+            session, _registrar_resultado_login, cod_usu, user, result_list, password_ok
+        )
+
+    except HashPoolSaturado:
+        raise
+
+    except Exception as e:
+        print(f"🔴 Error inesperado en authenticate_user_with_sp_async: {e}")
+        return None, []
+
+
+async def create_user_async(session: Union[Session, AsyncSession], user_in: UsuarioCreate) -> Usuario:
+    hashed_password = await security.get_password_hash_async(user_in.Password)
+    return await run_service(session, _crear_usuario, user_in, hashed_password)
+
+
+async def update_user_async(
+    session: Union[Session, AsyncSession], codusu: str, data: UsuarioUpdate
+) -> Dict[str, Any]:
+    hashed_password = None
+    if data.Password is not None:
+        hashed_password = await security.get_password_hash_async(data.Password)
+    return await run_service(session, _actualizar_usuario, codusu, data, hashed_password)
+
+
+async def listar_administradores_async(session: Union[Session, AsyncSession]):
+    return await run_service(session, listar_administradores)
+
+
+async def listar_empleados_async(session: Union[Session, AsyncSession]):
+    return await run_service(session, listar_empleados)
+
+
+async def register_staff_sp_async(
+    session: Union[Session, AsyncSession], user_data: StaffRegistrationData
+) -> Dict[str, Any]:
+    # Simulación sin BD: solo el hash, en el pool de bcrypt.
+    hashed_password = await security.get_password_hash_async(user_data.Password)
+    return _simular_registro_staff(user_data, hashed_password)
+
+
+async def inactivar_usuario_sp_async(session: Union[Session, AsyncSession], codusu: str) -> dict:
+    return await run_service(session, inactivar_usuario_sp, codusu)
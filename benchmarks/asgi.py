@@ -0,0 +1,15 @@
+# benchmarks/asgi.py
+"""
+La aplicación con la emulación de los SP registrada, para levantar uvicorn
+sobre la BD SQLite de los benchmarks (app.main:app no la carga):
+
+    DATABASE_URL=sqlite:////tmp/bench_suite.db uvicorn benchmarks.asgi:app --port 8000
+
+Contra MySQL no hace falta: basta app.main:app.
+"""
+
+from benchmarks.procedures_sqlite import registrar_emulacion
+
+registrar_emulacion()
+
+from app.main import app  # noqa: E402,F401
@@ -0,0 +1,56 @@
+# benchmarks/bench_async_engine.py
+"""
+Compara peticiones/segundo de /account/getCuentasBancarias y /auth/token
+entre el modo síncrono (threadpool) y el asíncrono (DB_ASYNC=true).
+
+Levantar el servidor en cada modo y ejecutar el benchmark contra él:
+
+    DB_ASYNC=false uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_async_engine --url http://127.0.0.1:8000 \
+        --usuario jperez --password secreto --etiqueta sync
+
+    DB_ASYNC=true uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_async_engine ... --etiqueta async
+
+Cada escenario imprime una línea JSON con rps y latencias p50/p95/p99.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.common import run_load
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrencia, max_keepalive_connections=args.concurrencia)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60.0) as client:
+
+        async def listar_cuentas(c: httpx.AsyncClient) -> httpx.Response:
+            return await c.get("/api/v1/account/getCuentasBancarias", params={"cod_usu": args.cod_usu})
+
+        async def login(c: httpx.AsyncClient) -> httpx.Response:
+            return await c.post(
+                "/api/v1/auth/token",
+                data={"username": args.usuario, "password": args.password},
+            )
+
+        for nombre, fn in (("getCuentasBancarias", listar_cuentas), ("auth_token", login)):
+            resultado = await run_load(
+                f"{args.etiqueta}:{nombre}", client, fn,
+                concurrencia=args.concurrencia, duracion_s=args.duracion,
+            )
+            print(resultado.to_json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--usuario", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--cod-usu", default="", help="Filtro para getCuentasBancarias (vacío = todas).")
+    parser.add_argument("--concurrencia", type=int, default=100)
+    parser.add_argument("--duracion", type=float, default=15.0, help="Segundos por escenario.")
+    parser.add_argument("--etiqueta", default="sync", help="Etiqueta del modo probado (sync/async).")
+    asyncio.run(main(parser.parse_args()))
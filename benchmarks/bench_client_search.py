@@ -0,0 +1,132 @@
+# benchmarks/bench_client_search.py
+"""
+Latencia de la búsqueda de clientes (/clients/buscar) sobre --clientes
+filas (por defecto 1.000.000): DNI exacto y por prefijo, apellido exacto
+y por prefijo, nombre por prefijo y email exacto, en la primera página y
+tras seguir el cursor --paginas veces. Con --comparar-sin-indices repite
+las mediciones tras borrar los índices ix_cli_* (lo que costaría sin la
+migración 004).
+
+    python -m benchmarks.bench_client_search
+    python -m benchmarks.bench_client_search --db-url mysql+pymysql://... --clientes 1000000
+
+En SQLite el LIKE por prefijo solo usa el índice con case_sensitive_like
+(la collation _ci de MySQL ya lo permite sin distinguir mayúsculas), así
+que el benchmark lo activa y busca con las mayúsculas tal cual se guardan.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import event, insert, text
+from sqlmodel import Session
+
+from benchmarks.common import percentile
+from benchmarks.db import crear_engine_bench
+from app.models.client import Cliente
+from app.services.clients_service import buscar_clientes
+
+APELLIDOS = [
+    "Quispe", "Flores", "Sánchez", "Rodríguez", "García", "Rojas", "Díaz", "Torres", "López",
+    "Chávez", "Mendoza", "Ramírez", "Huamán", "Mamani", "Vásquez", "Ramos", "Castillo", "Espinoza",
+    "Gutiérrez", "Vargas", "Pérez", "Romero", "Ruiz", "Fernández", "Gonzales", "Salazar", "Cruz",
+    "Condori", "Herrera", "Mori", "Aguilar", "Silva", "Reyes", "Córdova", "Ccahuana", "Villanueva",
+]
+NOMBRES = [
+    "José", "Juan", "Luis", "Carlos", "Jorge", "Miguel", "Rosa", "María", "Ana", "Carmen",
+    "Lucía", "Elena", "Pedro", "Víctor", "Julio", "Sofía", "Valeria", "Diego", "Andrea", "Fiorella",
+]
+
+
+def apellido(i: int) -> str:
+    # Apellido compuesto con sufijo para que haya ~1M valores distintos
+    return f"{APELLIDOS[i % len(APELLIDOS)]} {APELLIDOS[(i // 7) % len(APELLIDOS)]}{i // 1296:04d}"
+
+
+def sembrar_clientes(engine, cantidad: int, lote: int = 50_000) -> None:
+    with engine.begin() as conn:
+        for inicio in range(0, cantidad, lote):
+            conn.execute(insert(Cliente.__table__), [
+                {
+                    "CodCliente": f"C{i:09d}", "DNI": f"{10_000_000 + i * 37 % 89_999_999:08d}",
+                    "Apellidos": apellido(i), "Nombres": NOMBRES[i % len(NOMBRES)],
+                    "e_mail": f"cliente{i}@ficti.bank", "Estado": "A",
+                }
+                for i in range(inicio, min(inicio + lote, cantidad))
+            ])
+
+
+def medir(engine, repeticiones: int, paginas: int, **kwargs) -> dict:
+    primera, profunda = [], []
+    filas = 0
+    with Session(engine) as session:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            pagina, cursor = buscar_clientes(session, **kwargs)
+            primera.append((time.perf_counter() - inicio) * 1000.0)
+            filas = len(pagina)
+
+            for _ in range(paginas):
+                if not cursor:
+                    break
+                inicio = time.perf_counter()
+                _, cursor = buscar_clientes(session, cursor=cursor, **kwargs)
+                profunda.append((time.perf_counter() - inicio) * 1000.0)
+    return {
+        "filas_pagina": filas,
+        "p50_ms": round(percentile(primera, 50), 3),
+        "p99_ms": round(percentile(primera, 99), 3),
+        "siguientes_p50_ms": round(percentile(profunda, 50), 3) if profunda else None,
+    }
+
+
+def escenarios(cantidad: int, rnd: random.Random):
+    i = rnd.randrange(cantidad)
+    dni = f"{10_000_000 + i * 37 % 89_999_999:08d}"
+    return {
+        "dni_exacto": {"texto": dni, "campo": "dni", "exacto": True},
+        "dni_prefijo": {"texto": dni[:5], "campo": "dni"},
+        "apellido_exacto": {"texto": apellido(i), "campo": "apellidos", "exacto": True},
+        "apellido_prefijo": {"texto": APELLIDOS[i % len(APELLIDOS)][:4], "campo": "apellidos"},
+        "nombre_prefijo": {"texto": "Lu", "campo": "nombres"},
+        "email_exacto": {"texto": f"cliente{i}@ficti.bank", "campo": "email", "exacto": True},
+    }
+
+
+def ejecutar(engine, args, etiqueta: str) -> None:
+    rnd = random.Random(7)
+    for nombre, filtros in escenarios(args.clientes, rnd).items():
+        resultado = medir(engine, args.repeticiones, args.paginas, limite=args.limite, **filtros)
+        print(json.dumps({"indices": etiqueta, "escenario": nombre, **resultado}, ensure_ascii=False))
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_client_search.db", bloqueo_escritura=False)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _like_con_indice(dbapi_conn, _record):
+            dbapi_conn.execute("PRAGMA case_sensitive_like = ON")
+        engine.dispose()
+
+    sembrar_clientes(engine, args.clientes)
+    ejecutar(engine, args, "con_indices")
+
+    if args.comparar_sin_indices:
+        with engine.begin() as conn:
+            for indice in ("ix_cli_dni", "ix_cli_apellidos", "ix_cli_nombres", "ix_cli_email"):
+                conn.execute(text(f"DROP INDEX {indice}" + ("" if engine.dialect.name == "sqlite" else " ON t_cliente")))
+        args.repeticiones = max(1, args.repeticiones // 10)
+        ejecutar(engine, args, "sin_indices")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="URL SQLAlchemy (por defecto SQLite temporal).")
+    parser.add_argument("--clientes", type=int, default=1_000_000)
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--paginas", type=int, default=10, help="Páginas siguientes a recorrer con el cursor.")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--comparar-sin-indices", action="store_true")
+    main(parser.parse_args())
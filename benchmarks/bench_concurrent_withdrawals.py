@@ -0,0 +1,129 @@
+# benchmarks/bench_concurrent_withdrawals.py
+"""
+Benchmark de concurrencia de retiros: N hilos retiran de la misma cuenta
+hasta agotarla, pidiendo en total más de lo que hay (--sobredemanda) para
+forzar carreras en el último saldo. La cuenta tiene además un embargo
+parcial (--embargo) que ningún retiro puede tocar.
+
+Al terminar verifica que no hubo descubierto (saldo final >= embargo), que
+lo descontado es exactamente la suma de los retiros aceptados, que hay un
+movimiento 'RE' por retiro aceptado y que t_resumen_diario cuadra.
+Reporta retiros/s (intentos y aceptados).
+
+    python -m benchmarks.bench_concurrent_withdrawals --hilos 16
+    python -m benchmarks.bench_concurrent_withdrawals --db-url mysql+pymysql://...
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from benchmarks.db import crear_engine_bench, sembrar_cuentas
+from app.db import retry
+from app.models.account import Cuenta, Movimiento, ResumenDiario
+from app.models.embargo import Embargo
+from app.schemas.transaction import RetiroRequest
+from app.services.account_service import registrar_retiro
+from app.services.embargos_service import recalcular_embargo_cuenta
+
+NRO_CTA = "BENCHRET01"
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_concurrent_withdrawals.db")
+    saldo_inicial = Decimal(args.saldo).quantize(Decimal("0.01"))
+    embargo = Decimal(args.embargo).quantize(Decimal("0.01"))
+    sembrar_cuentas(engine, [NRO_CTA], saldo_inicial)
+    if embargo:
+        with Session(engine) as s:
+            s.add(Embargo(NroCta=NRO_CTA, TipoEmbargo="P", MontoEmbargado=embargo))
+            s.flush()
+            recalcular_embargo_cuenta(s, NRO_CTA)
+            s.commit()
+
+    # Montos múltiplos de 0,25: exactos también en el REAL de SQLite
+    disponible = saldo_inicial - embargo
+    # Monto medio 5,125 (randint(1, 40) / 4)
+    intentos_por_hilo = max(1, int(disponible * Decimal(args.sobredemanda) / Decimal("5.125") / args.hilos))
+
+    aceptados = []
+    rechazados = 0
+    errores = 0
+    lock = threading.Lock()
+
+    def worker(semilla: int):
+        nonlocal rechazados, errores
+        rnd = random.Random(semilla)
+        with Session(engine) as session:
+            for _ in range(intentos_por_hilo):
+                monto = Decimal(rnd.randint(1, 40)) / 4
+                try:
+                    registrar_retiro(session, RetiroRequest(Cuenta=NRO_CTA, Monto=float(monto)), cod_usu=None)
+                    with lock:
+                        aceptados.append(monto)
+                except ValueError:
+                    with lock:
+                        rechazados += 1
+                except Exception:
+                    with lock:
+                        errores += 1
+
+    hilos = [threading.Thread(target=worker, args=(i,)) for i in range(args.hilos)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    duracion = time.perf_counter() - inicio
+
+    with Session(engine) as s:
+        saldo_final = s.execute(select(Cuenta.SaldAct).where(Cuenta.NroCta == NRO_CTA)).scalar_one()
+        movimientos, suma_movimientos = s.execute(
+            select(func.count(), func.coalesce(func.sum(Movimiento.MonOpe), 0))
+            .where(Movimiento.NroCta == NRO_CTA, Movimiento.TipoMov == "RE")
+        ).one()
+        resumen = s.execute(
+            select(func.sum(ResumenDiario.Cantidad)).where(ResumenDiario.NroCta == NRO_CTA)
+        ).scalar_one() or 0
+
+    intentos = len(aceptados) + rechazados + errores
+    retirado = sum(aceptados, Decimal("0"))
+    resultado = {
+        "hilos": args.hilos,
+        "intentos": intentos,
+        "aceptados": len(aceptados),
+        "rechazados": rechazados,
+        "errores": errores,
+        "reintentos_agotados": retry.reintentos_agotados.value,
+        "intentos_por_s": round(intentos / duracion, 2),
+        "retiros_por_s": round(len(aceptados) / duracion, 2),
+        "saldo_inicial": str(saldo_inicial),
+        "embargo": str(embargo),
+        "retirado": str(retirado),
+        "saldo_final": str(saldo_final),
+        "movimientos": movimientos,
+    }
+    print(json.dumps(resultado))
+
+    assert saldo_final >= embargo, "¡Descubierto: el saldo quedó por debajo del embargo!"
+    assert saldo_inicial - saldo_final == retirado, "Lo descontado no cuadra con los retiros aceptados"
+    assert movimientos == resumen == len(aceptados), "Movimientos o resumen no cuadran con los retiros"
+    assert -Decimal(suma_movimientos) == retirado, "La suma de MonOpe no cuadra con lo retirado"
+    assert rechazados > 0, "La sobredemanda no llegó a agotar el saldo; sube --sobredemanda"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="Por defecto SQLite temporal.")
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--saldo", default="10000.00")
+    parser.add_argument("--embargo", default="1500.00", help="Embargo parcial activo (0 = sin embargo).")
+    parser.add_argument("--sobredemanda", type=float, default=1.5,
+                        help="Total pedido / saldo disponible (>1 para forzar rechazos).")
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+# benchmarks/bench_login_queries.py
+"""
+Sentencias SQL por login (cada una es un round trip a la BD) en cada
+resultado posible: éxito, contraseña incorrecta, bloqueo vigente, bloqueo
+vencido y usuario inexistente. Falla (exit 1) si algún caso supera su
+presupuesto, para detectar regresiones del login en un solo round trip
+(t_usuario, sp_ValidateUserLogin y @p_Out_Message en el mismo lote) más
+el UPDATE del intento:
+
+    python -m benchmarks.bench_login_queries
+
+Por defecto usa SQLite temporal; --db-url apunta a un MySQL ya migrado.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# bcrypt en el propio proceso: aquí solo interesa la BD
+os.environ.setdefault("HASH_POOL_ENABLED", "false")
+# Con --db-url, también la de la app: el engine de procedimientos
+# (multi-statement) se crea desde DATABASE_URL al importarla
+_previo = argparse.ArgumentParser(add_help=False)
+_previo.add_argument("--db-url", default=None)
+_db_url = _previo.parse_known_args()[0].db_url
+if _db_url:
+    os.environ["DATABASE_URL"] = _db_url
+
+from sqlmodel import Session  # noqa: E402
+
+from benchmarks.db import crear_engine_bench, sentencias_sp  # noqa: E402
+from benchmarks.procedures_sqlite import registrar_emulacion  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.query_stats import QueryCounter  # noqa: E402
+from app.models.client import Cliente  # noqa: E402
+from app.models.user import Usuario  # noqa: E402
+from app.services.user_service import authenticate_user_with_sp  # noqa: E402
+
+PASSWORD = "secreto123"
+
+# (escenario, usuario, contraseña, intentos previos, minutos desde el último, escribe el intento)
+ESCENARIOS = [
+    ("exito", "u_ok", PASSWORD, 0, None, True),
+    ("password_incorrecta", "u_mal", "otra", 0, None, True),
+    ("bloqueado", "u_bloq", PASSWORD, 3, 1, False),
+    ("bloqueo_vencido", "u_venc", PASSWORD, 3, 60, True),
+    ("inexistente", "no_existe", PASSWORD, 0, None, False),
+]
+
+
+def sembrar(engine) -> None:
+    hashed = get_password_hash(PASSWORD)
+    ahora = datetime.now()
+    with Session(engine) as session:
+        for i, (_, usuario, _, intentos, minutos, _) in enumerate(ESCENARIOS):
+            if usuario == "no_existe":
+                continue
+            cod = f"U{i:04d}"
+            session.add(Usuario(
+                CodUsu=cod, Usuario=usuario, Rol="C", Estado="A", HashedPassword=hashed,
+                IntentosFallidos=intentos,
+                UltimoIntento=ahora - timedelta(minutes=minutos) if minutos else None,
+            ))
+            session.add(Cliente(
+                CodCliente=f"C{i:04d}", Nombres="Juan", Apellidos="Pérez",
+                e_mail=f"{usuario}@ficti.bank", Estado="A", CodUsu=cod,
+            ))
+        session.commit()
+
+
+def main(args) -> int:
+    registrar_emulacion()
+    engine = crear_engine_bench(args.db_url, "bench_login_queries.db", bloqueo_escritura=False)
+    sembrar(engine)
+
+    # Lectura (un round trip con multi-statement) + UPDATE del intento
+    lectura = sentencias_sp(engine, previa=True)
+
+    fallos = 0
+    for escenario, usuario, password, _, _, escribe in ESCENARIOS:
+        presupuesto = lectura + escribe
+        with Session(engine) as session, QueryCounter(engine) as qc:
+            t0 = time.perf_counter()
+            user, _ = authenticate_user_with_sp(session, usuario, password)
+            ms = (time.perf_counter() - t0) * 1000.0
+
+        ok = qc.total <= presupuesto
+        fallos += not ok
+        print(json.dumps({
+            "escenario": escenario,
+            "resultado": user if isinstance(user, dict) else (user and user.Usuario),
+            "sentencias": qc.total,
+            "presupuesto": presupuesto,
+            "ok": ok,
+            "ms": round(ms, 2),
+            "sql": qc.sentencias if not ok else None,
+        }, ensure_ascii=False, default=str))
+
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="URL SQLAlchemy (por defecto SQLite temporal).")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+# benchmarks/bench_login_storm.py
+"""
+Tormenta de logins: mientras N clientes repiten POST /auth/token, otros M
+sondean un endpoint sin bcrypt. Mide logins/s (y cuántos 503 devolvió el
+límite del pool) junto con la latencia p50/p99 del sondeo, que debería
+mantenerse plana si bcrypt no compite con el event loop ni con el threadpool.
+
+Comparar el servidor con y sin el pool de procesos:
+
+    HASH_POOL_ENABLED=false uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_login_storm --usuario jperez --password secreto --etiqueta inline
+
+    HASH_POOL_ENABLED=true uvicorn app.main:app --port 8000
+    python -m benchmarks.bench_login_storm ... --etiqueta pool
+
+Sobre la BD SQLite de los benchmarks, levantar benchmarks.asgi:app en lugar
+de app.main:app (registra la emulación de los SP).
+
+Imprime una línea JSON por escenario (login y sondeo).
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.common import run_load
+
+
+async def main(args) -> None:
+    total = args.concurrencia_login + args.concurrencia_sondeo
+    limits = httpx.Limits(max_connections=total, max_keepalive_connections=total)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60.0) as client:
+
+        rechazados = 0
+
+        async def login(c: httpx.AsyncClient) -> httpx.Response:
+            nonlocal rechazados
+            resp = await c.post(
+                "/api/v1/auth/token",
+                data={"username": args.usuario, "password": args.password},
+            )
+            if resp.status_code == 503:
+                rechazados += 1
+            return resp
+
+        async def sondeo(c: httpx.AsyncClient) -> httpx.Response:
+            return await c.get(args.ruta_sondeo)
+
+        logins, sondeos = await asyncio.gather(
+            run_load(f"{args.etiqueta}:login", client, login,
+                     concurrencia=args.concurrencia_login, duracion_s=args.duracion),
+            run_load(f"{args.etiqueta}:sondeo", client, sondeo,
+                     concurrencia=args.concurrencia_sondeo, duracion_s=args.duracion),
+        )
+
+        exitosos = logins.peticiones - logins.errores
+        logins.extra = {
+            "logins_por_s": round(exitosos / logins.duracion_s, 2) if logins.duracion_s else 0.0,
+            "rechazados_503": rechazados,
+        }
+        sondeos.extra = {"ruta": args.ruta_sondeo}
+
+        print(logins.to_json())
+        print(sondeos.to_json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--usuario", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--ruta-sondeo", default="/", help="Endpoint sin bcrypt cuya latencia se vigila.")
+    parser.add_argument("--concurrencia-login", type=int, default=200)
+    parser.add_argument("--concurrencia-sondeo", type=int, default=10)
+    parser.add_argument("--duracion", type=float, default=15.0, help="Segundos de tormenta.")
+    parser.add_argument("--etiqueta", default="pool", help="Etiqueta del modo probado (inline/pool).")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+# benchmarks/bench_movement_history.py
+"""
+Latencia de una página del historial de movimientos según su profundidad.
+
+Se crea una cuenta con --historial movimientos (por defecto 1.000.000,
+--por-dia operaciones por día, TipoMov alternando DE/RE) y se pide una
+página de --limite filas empezando a distintas profundidades, con cada
+combinación de filtros del endpoint /movements/historial. Con keyset la
+latencia debe ser plana; --comparar-offset mide también LIMIT/OFFSET.
+
+    python -m benchmarks.bench_movement_history
+    python -m benchmarks.bench_movement_history --db-url mysql+pymysql://... --historial 5000000
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from benchmarks.common import percentile
+from benchmarks.db import crear_engine_bench, sembrar_cuentas, sembrar_historial
+from app.core.pagination import codificar_cursor
+from app.services.movimientos_service import CURSOR_HISTORIAL, listar_historial
+
+CUENTA = "HIST0001"
+
+CONSULTA_OFFSET = text(
+    "SELECT * FROM t_movimientos WHERE NroCta = :c "
+    "ORDER BY NroOperNumber DESC LIMIT :l OFFSET :o"
+)
+
+
+def medir_pagina(engine, repeticiones: int, **kwargs) -> dict:
+    latencias = []
+    filas = 0
+    with Session(engine) as session:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            pagina, _ = listar_historial(session, CUENTA, **kwargs)
+            latencias.append((time.perf_counter() - inicio) * 1000.0)
+            filas = len(pagina)
+    return {
+        "filas": filas,
+        "p50_ms": round(percentile(latencias, 50), 3),
+        "p99_ms": round(percentile(latencias, 99), 3),
+    }
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_movement_history.db", bloqueo_escritura=False)
+    sembrar_cuentas(engine, [CUENTA], Decimal("0"))
+    sembrar_historial(engine, CUENTA, args.historial, por_dia=args.por_dia, tipos_mov=("DE", "RE"))
+
+    hoy = date.today()
+    profundidades = [int(p) for p in args.profundidades.split(",") if int(p) < args.historial]
+
+    for profundidad in profundidades:
+        # Cursor equivalente a haber recorrido `profundidad` filas (la más reciente es la N)
+        nro = args.historial - profundidad + 1
+        fecha = hoy - timedelta(days=(args.historial - nro) // args.por_dia)
+        cursor = codificar_cursor(CURSOR_HISTORIAL, [fecha, nro]) if profundidad else None
+
+        escenarios = {
+            "sin_filtros": {},
+            "tipo_mov": {"tipo_mov": "DE"},
+            "rango_fechas": {"fecha_desde": hoy - timedelta(days=args.historial // args.por_dia), "fecha_hasta": hoy},
+        }
+        for nombre, filtros in escenarios.items():
+            resultado = medir_pagina(engine, args.repeticiones, limite=args.limite, cursor=cursor, **filtros)
+            print(json.dumps({"escenario": nombre, "profundidad": profundidad, **resultado}, default=str))
+
+        if args.comparar_offset:
+            with engine.connect() as conn:
+                inicio = time.perf_counter()
+                for _ in range(args.repeticiones):
+                    conn.execute(CONSULTA_OFFSET, {"c": CUENTA, "l": args.limite, "o": profundidad}).all()
+                ms = (time.perf_counter() - inicio) * 1000.0 / args.repeticiones
+            print(json.dumps({"escenario": "offset", "profundidad": profundidad, "media_ms": round(ms, 3)}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="URL SQLAlchemy (por defecto SQLite temporal).")
+    parser.add_argument("--historial", type=int, default=1_000_000)
+    parser.add_argument("--por-dia", type=int, default=100, help="Operaciones por día en el historial sembrado.")
+    parser.add_argument("--profundidades", default="0,1000,10000,100000,500000,990000")
+    parser.add_argument("--limite", type=int, default=50)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--comparar-offset", action="store_true")
+    main(parser.parse_args())
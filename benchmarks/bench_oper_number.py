@@ -0,0 +1,78 @@
+# benchmarks/bench_oper_number.py
+"""
+Latencia de transferencia según el tamaño del historial de la cuenta origen.
+
+Para cada tamaño (por defecto 10 → 1.000.000 movimientos) se crea una cuenta
+con ese historial y se miden N transferencias con el asignador de
+NroOperNumber (t_secuencia_oper). Con --comparar-legado se mide también la
+consulta anterior (ORDER BY NroOperNumber DESC LIMIT 1 por NroCta).
+
+    python -m benchmarks.bench_oper_number
+    python -m benchmarks.bench_oper_number --db-url mysql+pymysql://... --tamanos 10,100000
+"""
+
+import argparse
+import json
+import time
+from decimal import Decimal
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from benchmarks.common import percentile
+from benchmarks.db import crear_engine_bench, sembrar_cuentas, sembrar_historial
+from app.schemas.transferencias_schema import TransferenciaRequest
+from app.services.transferencias_service import TransferenciaService
+
+CONSULTA_LEGADO = text(
+    "SELECT NroOperNumber FROM t_movimientos WHERE NroCta = :c "
+    "ORDER BY NroOperNumber DESC LIMIT 1"
+)
+
+
+def medir(engine, tamano: int, transferencias: int, comparar_legado: bool) -> dict:
+    origen, destino = f"O{tamano}", f"D{tamano}"
+    sembrar_cuentas(engine, [origen, destino], Decimal("1000000000"))
+    sembrar_historial(engine, origen, tamano)
+
+    latencias = []
+    with Session(engine) as session:
+        for _ in range(transferencias):
+            inicio = time.perf_counter()
+            TransferenciaService.realizar_transferencia(session, TransferenciaRequest(
+                cuenta_origen=origen, cuenta_destino=destino, monto=1.0, cod_usuario="BENCH",
+            ))
+            latencias.append((time.perf_counter() - inicio) * 1000.0)
+
+    resultado = {
+        "historial": tamano,
+        "transferencias": transferencias,
+        "p50_ms": round(percentile(latencias, 50), 3),
+        "p99_ms": round(percentile(latencias, 99), 3),
+        "media_ms": round(sum(latencias) / len(latencias), 3),
+    }
+
+    if comparar_legado:
+        with engine.connect() as conn:
+            inicio = time.perf_counter()
+            for _ in range(transferencias):
+                conn.execute(CONSULTA_LEGADO, {"c": origen}).first()
+            resultado["legado_consulta_ms"] = round(
+                (time.perf_counter() - inicio) * 1000.0 / transferencias, 3
+            )
+    return resultado
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_oper_number.db")
+    for tamano in (int(t) for t in args.tamanos.split(",")):
+        print(json.dumps(medir(engine, tamano, args.transferencias, args.comparar_legado)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="Por defecto SQLite temporal.")
+    parser.add_argument("--tamanos", default="10,1000,100000,1000000")
+    parser.add_argument("--transferencias", type=int, default=200)
+    parser.add_argument("--comparar-legado", action="store_true")
+    main(parser.parse_args())
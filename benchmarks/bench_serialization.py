@@ -0,0 +1,123 @@
+# benchmarks/bench_serialization.py
+"""
+Coste de serializar un listado APIResponse de --filas DTOs (por defecto
+10.000) por la ruta genérica de FastAPI (response_model=APIResponse:
+volcado, validación, jsonable y json.dumps) frente a respuesta_lista
+(TypeAdapter cacheado). Comprueba además que ambos cuerpos son idénticos.
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --filas 50000 --repeticiones 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from benchmarks.common import percentile  # noqa: E402
+from app.core.responses import respuesta_lista  # noqa: E402
+from app.schemas.account import CuentaDetailsDTO  # noqa: E402
+from app.schemas.clients import ClientePublic  # noqa: E402
+from app.schemas.movimientos import MovimientoHistorial  # noqa: E402
+from app.schemas.util import APIResponse  # noqa: E402
+
+CAMPO_RESPUESTA = create_model_field(name="Response", type_=APIResponse, mode="serialization")
+
+
+def filas_cuentas(n: int):
+    hoy = date.today()
+    return [
+        CuentaDetailsDTO.model_validate({
+            "NroCta": f"CA-{i:07d}", "TipoCta": "AC", "TipoCuenta": "Ahorro Corriente",
+            "CodCliente": f"C{i:06d}", "Moneda": "SO", "FechaApertura": hoy - timedelta(days=i % 900),
+            "SaldoActual": 1000.0 + i, "SaldoPromedio": 950.5, "CodUsu": f"U{i:06d}",
+            "UsuarioPropietario": f"usuario{i}", "Estado": "A",
+        })
+        for i in range(n)
+    ]
+
+
+def filas_clientes(n: int):
+    return [
+        ClientePublic(
+            CodCliente=f"C{i:06d}", nombres=f"Nombre{i} Apellido{i}", tipo="DNI",
+            documento=f"{i:08d}", email=f"c{i}@ficti.bank", telefono="999888777",
+            estado="A", CodUsu=f"U{i:06d}",
+        )
+        for i in range(n)
+    ]
+
+
+def filas_historial(n: int):
+    hoy = date.today()
+    return [
+        MovimientoHistorial(
+            NroCta="CA-0000001", NroOperNumber=n - i, Fech_Ope=hoy - timedelta(days=i // 100),
+            TipoCta="AC", TipoMov="DE" if i % 2 else "RE", MonOpe=Decimal("12.50"),
+            CodUsu="U000001", Estado="A",
+        )
+        for i in range(n)
+    ]
+
+
+def ruta_generica(filas) -> bytes:
+    respuesta = APIResponse(mensaje="ok", codigo="LIST-OK", status_code=200, result=filas, cursor_siguiente="abc")
+    contenido = asyncio.run(serialize_response(field=CAMPO_RESPUESTA, response_content=respuesta, is_coroutine=True))
+    return JSONResponse(contenido).body
+
+
+def ruta_rapida(tipo, filas) -> bytes:
+    return respuesta_lista(
+        tipo, mensaje="ok", codigo="LIST-OK", status_code=200, result=filas, cursor_siguiente="abc"
+    ).body
+
+
+def medir(fn, repeticiones: int) -> dict:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000.0)
+    return {"p50_ms": round(percentile(tiempos, 50), 2), "max_ms": round(max(tiempos), 2)}
+
+
+def main(args) -> int:
+    escenarios = [
+        ("cuentas", CuentaDetailsDTO, filas_cuentas),
+        ("clientes", ClientePublic, filas_clientes),
+        ("historial", MovimientoHistorial, filas_historial),
+    ]
+    distintos = 0
+    for nombre, tipo, generar in escenarios:
+        filas = generar(args.filas)
+        iguales = ruta_generica(filas) == ruta_rapida(tipo, filas)
+        distintos += not iguales
+
+        antes = medir(lambda: ruta_generica(filas), args.repeticiones)
+        despues = medir(lambda: ruta_rapida(tipo, filas), args.repeticiones)
+        print(json.dumps({
+            "escenario": nombre,
+            "filas": args.filas,
+            "generica": antes,
+            "type_adapter": despues,
+            "aceleracion": round(antes["p50_ms"] / max(despues["p50_ms"], 1e-6), 1),
+            "cuerpos_iguales": iguales,
+        }))
+    return 1 if distintos else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10_000)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+# benchmarks/bench_transfer_batch.py
+"""
+Throughput de 10k transferencias: una a una (TransferenciaService.realizar_transferencia)
+frente al lote por bloques (realizar_transferencias_batch).
+
+    python -m benchmarks.bench_transfer_batch --total 10000 --chunk 500
+"""
+
+import argparse
+import json
+import random
+import time
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from benchmarks.db import crear_engine_bench, sembrar_cuentas
+from app.schemas.transferencias_schema import TransferenciaRequest
+from app.services.transferencias_service import TransferenciaService
+
+
+def generar(nros, total: int, semilla: int = 7):
+    rnd = random.Random(semilla)
+    return [
+        TransferenciaRequest(
+            cuenta_origen=o, cuenta_destino=d,
+            monto=round(rnd.uniform(1, 100), 2), cod_usuario="BENCH",
+        )
+        for o, d in (rnd.sample(nros, 2) for _ in range(total))
+    ]
+
+
+def main(args) -> None:
+    for modo in ("uno_a_uno", "batch"):
+        engine = crear_engine_bench(args.db_url, f"bench_transfer_batch_{modo}.db")
+        nros = sembrar_cuentas(engine, [f"B{i:05d}" for i in range(args.cuentas)], Decimal("10000000"))
+        items = generar(nros, args.total)
+
+        inicio = time.perf_counter()
+        with Session(engine) as session:
+            if modo == "batch":
+                r = TransferenciaService.realizar_transferencias_batch(session, items, args.chunk)
+                exitosas = r["exitosas"]
+            else:
+                exitosas = 0
+                for item in items:
+                    TransferenciaService.realizar_transferencia(session, item)
+                    exitosas += 1
+        duracion = time.perf_counter() - inicio
+
+        print(json.dumps({
+            "modo": modo,
+            "total": args.total,
+            "chunk": args.chunk if modo == "batch" else 1,
+            "exitosas": exitosas,
+            "duracion_s": round(duracion, 3),
+            "transferencias_por_s": round(exitosas / duracion, 1),
+        }))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="Por defecto SQLite temporal.")
+    parser.add_argument("--total", type=int, default=10000)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--cuentas", type=int, default=1000)
+    main(parser.parse_args())
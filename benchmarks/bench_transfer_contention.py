@@ -0,0 +1,110 @@
+# benchmarks/bench_transfer_contention.py
+"""
+Benchmark de concurrencia del motor de transferencias: N hilos transfieren
+montos aleatorios entre un conjunto pequeño de cuentas (alta contención,
+incluidos pares A→B / B→A simultáneos).
+
+Al terminar verifica que el dinero se conserva (suma de saldos inicial ==
+final), que hay exactamente dos movimientos por transferencia exitosa y
+que t_resumen_diario cuadra con t_movimientos (por cuenta y en total).
+Reporta transferencias/s, errores y reintentos por deadlock.
+
+    python -m benchmarks.bench_transfer_contention --hilos 16 --cuentas 4
+    python -m benchmarks.bench_transfer_contention --db-url mysql+pymysql://...
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from benchmarks.db import crear_engine_bench, sembrar_cuentas
+from app.db import retry
+from app.models.account import Cuenta, Movimiento, ResumenDiario
+from app.schemas.transferencias_schema import TransferenciaRequest
+from app.services.transferencias_service import TransferenciaService
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_transfer_contention.db")
+    nros = sembrar_cuentas(
+        engine, [f"BENCH{i:04d}" for i in range(args.cuentas)], Decimal("1000000.00")
+    )
+
+    with Session(engine) as s:
+        saldo_inicial = s.execute(select(func.sum(Cuenta.SaldAct)).where(Cuenta.NroCta.in_(nros))).scalar_one()
+
+    exitos = 0
+    errores = 0
+    reintentos = 0
+    lock = threading.Lock()
+
+    def worker(semilla: int):
+        nonlocal exitos, errores, reintentos
+        rnd = random.Random(semilla)
+        with Session(engine) as session:
+            for _ in range(args.transferencias):
+                origen, destino = rnd.sample(nros, 2)
+                try:
+                    r = TransferenciaService.realizar_transferencia(session, TransferenciaRequest(
+                        cuenta_origen=origen, cuenta_destino=destino,
+                        monto=round(rnd.uniform(0.01, 50.0), 2), cod_usuario="BENCH",
+                    ))
+                    with lock:
+                        exitos += 1
+                        reintentos += r["reintentos"]
+                except Exception:
+                    with lock:
+                        errores += 1
+
+    hilos = [threading.Thread(target=worker, args=(i,)) for i in range(args.hilos)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    duracion = time.perf_counter() - inicio
+
+    with Session(engine) as s:
+        saldo_final = s.execute(select(func.sum(Cuenta.SaldAct)).where(Cuenta.NroCta.in_(nros))).scalar_one()
+        movimientos = s.execute(select(func.count()).select_from(Movimiento).where(Movimiento.NroCta.in_(nros))).scalar_one()
+        resumen_cuentas = s.execute(
+            select(func.sum(ResumenDiario.Cantidad)).where(ResumenDiario.NroCta.in_(nros))
+        ).scalar_one() or 0
+        resumen_global = s.execute(
+            select(func.sum(ResumenDiario.Cantidad)).where(ResumenDiario.NroCta.like("*%"))
+        ).scalar_one() or 0
+
+    resultado = {
+        "hilos": args.hilos,
+        "cuentas": args.cuentas,
+        "exitos": exitos,
+        "errores": errores,
+        "reintentos": reintentos,
+        "reintentos_agotados": retry.reintentos_agotados.value,
+        "transferencias_por_s": round(exitos / duracion, 2),
+        "saldo_inicial": str(saldo_inicial),
+        "saldo_final": str(saldo_final),
+        "movimientos": movimientos,
+        "resumen_cuentas": resumen_cuentas,
+        "resumen_global": resumen_global,
+    }
+    print(json.dumps(resultado))
+
+    assert saldo_inicial == saldo_final, "¡El dinero no se conserva!"
+    assert movimientos == 2 * exitos, "Movimientos no cuadran con transferencias exitosas"
+    assert resumen_cuentas == resumen_global == movimientos, "El resumen diario no cuadra con los movimientos"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="Por defecto SQLite temporal.")
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--cuentas", type=int, default=4)
+    parser.add_argument("--transferencias", type=int, default=200, help="Por hilo.")
+    main(parser.parse_args())
@@ -0,0 +1,91 @@
+# benchmarks/bench_ubigeo_autocomplete.py
+"""
+Latencia del autocompletado de ubigeo sobre el índice de prefijos en
+memoria. Siembra un t_ubigeo sintético (--departamentos x --provincias x
+--distritos, por defecto ~2.000 distritos como el real), carga los
+catálogos y consulta todos los prefijos de 1 a 3 letras, como haría un
+formulario pulsación a pulsación. Cuenta también las sentencias SQL de
+las búsquedas (deben ser 0).
+
+    python -m benchmarks.bench_ubigeo_autocomplete
+"""
+
+import argparse
+import itertools
+import json
+import string
+import time
+
+from sqlmodel import Session
+
+from benchmarks.common import percentile
+from benchmarks.db import crear_engine_bench
+from app.db.query_stats import QueryCounter
+from app.models.common import Ubigeo
+from app.services.catalogos_service import cargar_catalogos
+
+SILABAS = ["Án", "ca", "lu", "ri", "ñe", "to", "sa", "mí", "ga", "ra", "hua", "chí", "pa", "qui", "ma"]
+
+
+def nombre(semilla: int, silabas: int = 3) -> str:
+    partes = [SILABAS[(semilla // len(SILABAS) ** i + i) % len(SILABAS)] for i in range(silabas)]
+    return "".join(partes).capitalize() + (" de " + SILABAS[semilla % len(SILABAS)].capitalize() if semilla % 7 == 0 else "")
+
+
+def sembrar(engine, departamentos: int, provincias: int, distritos: int) -> int:
+    filas = []
+    for d in range(1, departamentos + 1):
+        for p in range(1, provincias + 1):
+            for t in range(1, distritos + 1):
+                filas.append(Ubigeo(
+                    CodUbigeo=f"{d:02d}{p:02d}{t:02d}", Depart=nombre(d),
+                    Provin=nombre(d * 100 + p), Distrit=nombre(d * 10000 + p * 100 + t),
+                ))
+    with Session(engine) as session:
+        session.add_all(filas)
+        session.commit()
+    return len(filas)
+
+
+def main(args) -> None:
+    engine = crear_engine_bench(args.db_url, "bench_ubigeo_autocomplete.db", bloqueo_escritura=False)
+    total = sembrar(engine, args.departamentos, args.provincias, args.distritos)
+
+    with Session(engine) as session:
+        inicio = time.perf_counter()
+        catalogos = cargar_catalogos(session)
+        carga_ms = (time.perf_counter() - inicio) * 1000.0
+
+    letras = string.ascii_lowercase
+    prefijos = [
+        "".join(p) for n in (1, 2, 3) for p in itertools.product(letras, repeat=n)
+    ]
+
+    latencias = []
+    sugerencias = 0
+    with QueryCounter(engine) as qc:
+        for prefijo in prefijos:
+            inicio = time.perf_counter()
+            sugerencias += len(catalogos.buscar_ubigeo(prefijo, limite=args.limite))
+            latencias.append((time.perf_counter() - inicio) * 1e6)
+
+    print(json.dumps({
+        "ubigeos": total,
+        "carga_e_indexado_ms": round(carga_ms, 1),
+        "busquedas": len(prefijos),
+        "sugerencias_media": round(sugerencias / len(prefijos), 2),
+        "p50_us": round(percentile(latencias, 50), 1),
+        "p99_us": round(percentile(latencias, 99), 1),
+        "max_us": round(max(latencias), 1),
+        "sentencias_sql": qc.total,
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="URL SQLAlchemy (por defecto SQLite temporal).")
+    parser.add_argument("--departamentos", type=int, default=25)
+    parser.add_argument("--provincias", type=int, default=8)
+    parser.add_argument("--distritos", type=int, default=10)
+    parser.add_argument("--limite", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,206 @@
+# benchmarks/check_query_budget.py
+"""
+Presupuesto de sentencias SQL por endpoint. Recorre los endpoints
+principales con TestClient (login, depósito, retiro, transferencia, su
+reintento con Idempotency-Key, listados e historial) sobre una BD SQLite
+sembrada con bastantes filas para que un N+1 se note, y falla (exit 1) si
+alguno ejecuta más sentencias que su presupuesto:
+
+    python -m benchmarks.check_query_budget
+
+Cada endpoint se llama una vez para calentar cachés (catálogos, usuario,
+idempotencia) y se mide en las --repeticiones siguientes. Se comprueba
+también que la cabecera X-DB-Statements (DEBUG_DB_HEADERS) cuadra con el
+conteo del engine.
+
+Los endpoints que llaman a procedimientos almacenados entran con la
+emulación de benchmarks/procedures_sqlite.py: en SQLite se cuentan las
+sentencias de la emulación, no un único CALL. Con --db-url se mide contra
+un MySQL de pruebas con los procedimientos instalados (su esquema se
+recrea: nunca una BD con datos reales); ahí el login pasa por el CALL
+multi-sentencia, que debe contarse como una sentencia:
+
+    python -m benchmarks.check_query_budget --db-url mysql+pymysql://...
+
+Un escenario con presupuesto que no cuenta ninguna sentencia también
+falla: señal de que algo se ejecutó fuera del conteo.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import uuid
+from decimal import Decimal
+
+# Antes de importar la app: BD (--db-url o SQLite temporal), cabeceras de
+# consumo y bcrypt en el propio proceso (aquí solo interesan las sentencias)
+_previo = argparse.ArgumentParser(add_help=False)
+_previo.add_argument("--db-url", default=None)
+_DB = os.path.join(tempfile.gettempdir(), "check_query_budget.db")
+os.environ["DATABASE_URL"] = _previo.parse_known_args()[0].db_url or f"sqlite:///{_DB}"
+os.environ.pop("READ_DATABASE_URL", None)
+os.environ["DEBUG_DB_HEADERS"] = "true"
+os.environ.setdefault("HASH_POOL_ENABLED", "false")
+os.environ.setdefault("SECRET_KEY", "check-query-budget")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import SQLModel, Session  # noqa: E402
+
+from benchmarks.db import sembrar_cuentas, sembrar_historial, sentencias_sp  # noqa: E402
+from benchmarks.procedures_sqlite import registrar_emulacion  # noqa: E402
+from benchmarks.seed import sembrar_catalogos  # noqa: E402
+from app.api.v1 import deps  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db import session as db_session  # noqa: E402
+from app.db.query_stats import PresupuestoSQLExcedido, presupuesto_sql  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.account import Cuenta  # noqa: E402
+from app.models.client import Cliente  # noqa: E402
+from app.models.user import Usuario  # noqa: E402
+
+PASSWORD = "secreto123"
+ORIGEN, DESTINO = "1000000001", "1000000002"
+API = "/api/v1"
+
+
+def sembrar(engine, cuentas: int, movimientos: int) -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    sembrar_catalogos(engine)
+    with Session(engine) as session:
+        session.add(Usuario(
+            CodUsu="U0001", Usuario="admin", Rol="A", Estado="A",
+            HashedPassword=get_password_hash(PASSWORD), IntentosFallidos=0,
+        ))
+        session.add_all([
+            Cliente(
+                CodCliente=f"C{i:04d}", DNI=f"{40_000_000 + i:08d}", Nombres="Juan",
+                Apellidos=f"Pérez {i:04d}", e_mail=f"cliente{i}@ficti.bank", Estado="A",
+                CodUsu="U0001" if i == 0 else None,
+            )
+            for i in range(cuentas)
+        ])
+        session.commit()
+
+    nros = [f"{1_000_000_001 + i}" for i in range(cuentas)]
+    sembrar_cuentas(engine, nros, Decimal("100000.00"))
+    with Session(engine) as session:
+        for i, nro in enumerate(nros):
+            cuenta = session.get(Cuenta, nro)
+            cuenta.CodCliente, cuenta.CodUsu = f"C{i:04d}", "U0001"
+        session.commit()
+    sembrar_historial(engine, ORIGEN, movimientos, por_dia=50, tipos_mov=("DE", "RE", "TR"))
+
+
+def escenarios(engine):
+    """
+    (nombre, método, ruta, kwargs de TestClient, presupuesto[, mínimo]).
+    Sin mínimo, un presupuesto > 0 exige al menos una sentencia contada.
+    """
+    clave_fija = str(uuid.uuid4())
+    # t_usuario + sp_ValidateUserLogin + @p_Out_Message, y el UPDATE del
+    # intento; en MySQL con multi-statement, un solo CALL + el UPDATE. Es
+    # exacto: si el CALL no se contara, faltaría una sentencia
+    login = sentencias_sp(engine, previa=True) + 1
+    transferencia = {"cuenta_origen": ORIGEN, "cuenta_destino": DESTINO, "monto": 1.0, "cod_usuario": "U0001"}
+    return [
+        ("login", "POST", "/auth/token",
+         lambda: {"data": {"username": "admin", "password": PASSWORD}}, login, login),
+        ("deposito", "POST", "/account/deposito",
+         lambda: {"json": {"Cuenta": ORIGEN, "Monto": 10.0, "Moneda": "PEN"}}, 6),
+        ("retiro", "POST", "/account/retiro",
+         lambda: {"json": {"Cuenta": ORIGEN, "Monto": 5.0}}, 6),
+        ("transferencia", "POST", "/transferencias/",
+         lambda: {"json": transferencia}, 8),
+        ("transferencia_idempotente", "POST", "/transferencias/",
+         lambda: {"json": transferencia, "headers": {"Idempotency-Key": str(uuid.uuid4())}}, 10),
+        # Reintento con la misma clave: respuesta guardada en la caché del worker
+        ("transferencia_reintento", "POST", "/transferencias/",
+         lambda: {"json": transferencia, "headers": {"Idempotency-Key": clave_fija}}, 0),
+        ("listar_cuentas", "GET", "/account/getCuentasBancarias",
+         lambda: {"params": {"limite": 100}}, 1),
+        ("listar_clientes", "GET", "/clients/getClientes",
+         lambda: {"params": {"limite": 100}}, 1),
+        ("buscar_clientes", "GET", "/clients/buscar",
+         lambda: {"params": {"q": "Pérez", "limite": 50}}, 1),
+        ("historial", "GET", "/movements/historial",
+         lambda: {"params": {"nro_cuenta": ORIGEN, "limite": 200}}, 1),
+        ("resumen_del_dia", "GET", "/movements/getResumenDelDia", lambda: {}, 1),
+        ("catalogo_estados", "GET", "/catalogos/estados", lambda: {}, 0),
+        # Procedimientos almacenados (emulados en SQLite)
+        ("sp_cuentas_usuario", "GET", "/account/getCuentasBancarias",
+         lambda: {"params": {"cod_usu": "U0001"}}, 1),
+        ("sp_clientes_usuario", "GET", "/clients/getClientes",
+         lambda: {"params": {"cod_usu": "U0001"}}, 1),
+        ("sp_movimientos_del_dia", "GET", "/movements/getMovimientosDelDia",
+         lambda: {"params": {"Cod_usu": "U0001", "rol": "A"}}, 1),
+        ("sp_ultimos_movimientos", "GET", "/movements/getLastMovimientosByCuenta",
+         lambda: {"params": {"nro_cuenta": ORIGEN}}, 1),
+        ("sp_embargos_cuenta", "GET", f"/embargos/listarEmbargos/{ORIGEN}", lambda: {}, 1),
+        ("sp_administradores", "GET", "/users/admins", lambda: {}, 1),
+        ("sp_empleados", "GET", "/users/employees", lambda: {}, 1),
+    ]
+
+
+def medir(client: TestClient, engine, metodo, ruta, kwargs, presupuesto, minimo, repeticiones) -> dict:
+    client.request(metodo, API + ruta, **kwargs())   # calentamiento
+    sentencias, detalle = 0, None
+    for _ in range(repeticiones):
+        try:
+            with presupuesto_sql(engine, presupuesto, f"{metodo} {ruta}") as qc:
+                r = client.request(metodo, API + ruta, **kwargs())
+        except PresupuestoSQLExcedido as e:
+            sentencias, detalle = qc.total, str(e)
+            break
+        sentencias = max(sentencias, qc.total)
+        if qc.total < minimo:
+            detalle = f"{qc.total} sentencias contadas, se esperaban al menos {minimo}"
+            break
+        if r.status_code >= 400:
+            detalle = f"HTTP {r.status_code}: {r.text[:300]}"
+            break
+        if r.headers.get("x-db-statements") != str(qc.total):
+            detalle = f"X-DB-Statements={r.headers.get('x-db-statements')}, engine={qc.total}"
+            break
+    return {
+        "sentencias": sentencias,
+        "presupuesto": presupuesto,
+        "ok": detalle is None,
+        "filas": r.headers.get("x-db-rows"),
+        "bd_ms": r.headers.get("x-db-time-ms"),
+        "detalle": detalle,
+    }
+
+
+def main(args) -> int:
+    registrar_emulacion()
+    engine = db_session.engine
+    sembrar(engine, args.cuentas, args.movimientos)
+
+    # Solo la autenticación se simula; el resto del camino es el real
+    with Session(engine) as session:
+        admin = session.get(Usuario, "U0001")
+        session.expunge(admin)
+    app.dependency_overrides[deps.get_current_user] = lambda: admin
+
+    fallos = 0
+    with TestClient(app) as client:
+        for nombre, metodo, ruta, kwargs, presupuesto, *minimo in escenarios(engine):
+            minimo = minimo[0] if minimo else min(presupuesto, 1)
+            fila = medir(client, engine, metodo, ruta, kwargs, presupuesto, minimo, args.repeticiones)
+            fallos += not fila["ok"]
+            print(json.dumps({"endpoint": nombre, "ruta": f"{metodo} {ruta}", **fila}, ensure_ascii=False))
+
+    app.dependency_overrides.clear()
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cuentas", type=int, default=200, help="Cuentas (y clientes) sembradas.")
+    parser.add_argument("--movimientos", type=int, default=2000, help="Movimientos en el historial de la cuenta origen.")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--db-url", default=None, help="MySQL de pruebas (por defecto SQLite temporal).")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+# benchmarks/common.py
+"""
+Utilidades compartidas por los benchmarks: generador de carga concurrente
+sobre httpx y cálculo de percentiles.
+"""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+
+
+def percentile(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano (p en 0..100)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    idx = max(0, min(len(ordenados) - 1, math.ceil(p / 100.0 * len(ordenados)) - 1))
+    return ordenados[idx]
+
+
+@dataclass
+class LoadResult:
+    escenario: str
+    peticiones: int
+    errores: int
+    duracion_s: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def tasa_error(self) -> float:
+        return round(self.errores / self.peticiones, 4) if self.peticiones else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "tasa_error": self.tasa_error}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+async def run_load(
+    escenario: str,
+    client: httpx.AsyncClient,
+    hacer_peticion: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+    concurrencia: int,
+    duracion_s: Optional[float] = None,
+    total: Optional[int] = None,
+) -> LoadResult:
+    """
+    Lanza `concurrencia` workers que repiten `hacer_peticion` hasta agotar
+    `duracion_s` segundos o `total` peticiones. Cuenta como error cualquier
+    excepción o respuesta >= 400.
+    """
+    if duracion_s is None and total is None:
+        raise ValueError("Indique duracion_s o total.")
+
+    latencias: List[float] = []
+    errores = 0
+    emitidas = 0
+    inicio = time.perf_counter()
+    fin = inicio + duracion_s if duracion_s is not None else None
+
+    async def worker():
+        nonlocal errores, emitidas
+        while True:
+            if fin is not None and time.perf_counter() >= fin:
+                return
+            if total is not None:
+                if emitidas >= total:
+                    return
+                emitidas += 1
+            t0 = time.perf_counter()
+            try:
+                resp = await hacer_peticion(client)
+                if resp.status_code >= 400:
+                    errores += 1
+            except Exception:
+                errores += 1
+            latencias.append((time.perf_counter() - t0) * 1000.0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrencia)))
+    duracion = time.perf_counter() - inicio
+
+    return LoadResult(
+        escenario=escenario,
+        peticiones=len(latencias),
+        errores=errores,
+        duracion_s=round(duracion, 3),
+        rps=round(len(latencias) / duracion, 2) if duracion > 0 else 0.0,
+        p50_ms=round(percentile(latencias, 50), 2),
+        p95_ms=round(percentile(latencias, 95), 2),
+        p99_ms=round(percentile(latencias, 99), 2),
+    )
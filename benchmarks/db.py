@@ -0,0 +1,122 @@
+# benchmarks/db.py
+"""
+Base de datos de pruebas para los benchmarks. Por defecto un fichero SQLite
+temporal con el esquema de los modelos; con --db-url se puede apuntar a un
+MySQL local ya migrado.
+"""
+
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel, Session, create_engine
+
+# Los servicios importan app.db.session, que necesita una URL válida.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import models  # noqa: E402  (registra todas las tablas en el metadata)
+from app.models.account import Cuenta, Movimiento  # noqa: E402
+
+
+def url_por_defecto(nombre: str) -> str:
+    return f"sqlite:///{os.path.join(tempfile.gettempdir(), nombre)}"
+
+
+def crear_engine_bench(
+    url: Optional[str], nombre: str, recrear: bool = True, bloqueo_escritura: bool = True
+) -> Engine:
+    """
+    Engine de benchmark; en SQLite recrea el esquema desde los modelos.
+    `bloqueo_escritura=False` omite la emulación de bloqueos de fila (útil
+    cuando se cuentan sentencias y el BEGIN IMMEDIATE sería ruido).
+    """
+    url = url or url_por_defecto(nombre)
+    connect_args = {"check_same_thread": False, "timeout": 30} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args, pool_size=32, max_overflow=32)
+    if url.startswith("sqlite") and bloqueo_escritura:
+        sqlite_begin_immediate(engine)
+    if url.startswith("sqlite") and recrear:
+        SQLModel.metadata.drop_all(engine)
+        SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def sentencias_sp(engine: Engine, out: bool = True, previa: bool = False) -> int:
+    """
+    Sentencias que cuenta QueryCounter por una llamada autonomo=True a
+    ejecutar_sp: una con el engine de procedimientos (MySQL con
+    DB_SP_MULTI_STATEMENTS); si no, la consulta previa, el CALL y el
+    SELECT de las variables OUT por separado. En SQLite el CALL es el
+    SELECT de la emulación.
+    """
+    # Aquí y no arriba: la suite fija DATABASE_URL antes de cargar la configuración
+    from app.db.session import engine_procedimientos
+
+    if engine.dialect.name == "mysql" and engine_procedimientos(False) is not None and (out or previa):
+        return 1
+    llamada = 1 if engine.dialect.name == "sqlite" else 1 + out
+    return previa + llamada
+
+
+def sembrar_cuentas(
+    engine: Engine, nros: Iterable[str], saldo: Decimal, tipo_cta: str = "AC"
+) -> List[str]:
+    nros = list(nros)
+    with Session(engine) as session:
+        for nro in nros:
+            session.add(Cuenta(
+                NroCta=nro, TipoCta=tipo_cta, Moneda="SO", Fech_Apert=date.today(),
+                Saldoni=saldo, SaldAct=saldo, SaldoPro=saldo, Estado="A",
+            ))
+        session.commit()
+    return nros
+
+
+def sembrar_historial(
+    engine: Engine, nro_cta: str, cantidad: int, tipo_cta: str = "AC", lote: int = 50_000,
+    por_dia: int = 0, tipos_mov: Sequence[str] = ("DE",),
+) -> None:
+    """
+    Inserta `cantidad` movimientos antiguos (NroOperNumber 1..cantidad).
+    Con `por_dia` > 0 las fechas retroceden un día cada `por_dia`
+    operaciones (la última es de hoy); los TipoMov se alternan.
+    """
+    hoy = date.today()
+
+    def fecha(n: int) -> date:
+        return hoy - timedelta(days=(cantidad - n) // por_dia) if por_dia else hoy
+
+    with engine.begin() as conn:
+        for inicio in range(1, cantidad + 1, lote):
+            filas = [
+                {
+                    "TipoCta": tipo_cta, "NroCta": nro_cta, "NroOperNumber": n,
+                    "Fech_Ope": fecha(n), "CodUsu": None, "TipoMov": tipos_mov[n % len(tipos_mov)],
+                    "MonOpe": Decimal("1.00"), "Estado": "A",
+                }
+                for n in range(inicio, min(inicio + lote, cantidad + 1))
+            ]
+            conn.execute(insert(Movimiento.__table__), filas)
+
+
+def sqlite_begin_immediate(engine: Engine, activo: Callable[[], bool] = lambda: True) -> None:
+    """
+    SQLite ignora SELECT ... FOR UPDATE y pysqlite no abre la transacción
+    hasta el primer DML. Abrir cada transacción con BEGIN IMMEDIATE toma el
+    bloqueo de escritura desde la primera lectura, que es lo más parecido a
+    los bloqueos de fila de InnoDB (a costa de serializar las escrituras).
+    Mientras `activo()` sea falso no se abre transacción: cada sentencia
+    se confirma sola y no retiene bloqueos, como una lectura de InnoDB.
+    """
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _record):
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        if activo():
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
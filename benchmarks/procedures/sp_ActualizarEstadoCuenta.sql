@@ -0,0 +1,39 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ActualizarEstadoCuenta: cambia t_cuentas.Estado
+-- (app/services/account_service.actualizar_estado_cuenta_sp). El servicio
+-- ya validó p_NuevoEstado contra t_estado. p_Out_Message empieza por
+-- 'Éxito:' o 'Error:'. Confirma él mismo: el servicio no hace commit.
+
+DELIMITER $$
+CREATE PROCEDURE sp_ActualizarEstadoCuenta(
+    IN  p_NroCta          VARCHAR(20),
+    IN  p_NuevoEstado     CHAR(1),
+    IN  p_CodUsuModifica  VARCHAR(10),
+    OUT p_Out_Message     VARCHAR(255)
+)
+BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    START TRANSACTION;
+
+    UPDATE t_cuentas
+    SET Estado = p_NuevoEstado
+    WHERE NroCta = p_NroCta;
+
+    IF ROW_COUNT() = 0 AND NOT EXISTS (SELECT 1 FROM t_cuentas WHERE NroCta = p_NroCta) THEN
+        SET p_Out_Message = CONCAT('Error: La cuenta ', p_NroCta, ' no existe.');
+    ELSE
+        SET p_Out_Message = CONCAT('Éxito: Cuenta ', p_NroCta, ' actualizada al estado ', p_NuevoEstado, '.');
+    END IF;
+
+    COMMIT;
+END $$
+DELIMITER ;
@@ -0,0 +1,36 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_GetLastMovements: los 20 últimos movimientos de la cuenta, del más
+-- reciente al más antiguo; recorre ix_mov_cta_oper hacia atrás
+-- (app/services/movimientos_service.listar_ultimos_movimientos_sp).
+-- Columnas de MovimientoDelDia.
+
+DELIMITER $$
+CREATE PROCEDURE sp_GetLastMovements(
+    IN p_NroCta VARCHAR(20)
+)
+BEGIN
+    SELECT
+        m.Fech_Ope,
+        m.NroCta,
+        m.NroOperNumber,
+        COALESCE(u.Usuario, '')                           AS Usuario,
+        TRIM(CONCAT_WS(' ', cl.Nombres, cl.Apellidos))    AS nombres,
+        COALESCE(tc.Descripcion, m.TipoCta)               AS TipoCuenta,
+        COALESCE(tm.Descrip, m.TipoMov)                   AS TipoMovimiento,
+        m.MonOpe                                          AS Monto,
+        m.Estado                                          AS EstadoMovimiento
+    FROM t_movimientos m
+    JOIN t_cuentas c ON c.NroCta = m.NroCta
+    LEFT JOIN t_usuario u ON u.CodUsu = m.CodUsu
+    LEFT JOIN t_cliente cl ON cl.CodCliente = c.CodCliente
+    LEFT JOIN t_tipocuentas tc ON tc.TipoCta = m.TipoCta
+    LEFT JOIN t_tipomovi tm ON tm.TipoMov = m.TipoMov
+    WHERE m.NroCta = p_NroCta
+    ORDER BY m.NroOperNumber DESC
+    LIMIT 20;
+END $$
+DELIMITER ;
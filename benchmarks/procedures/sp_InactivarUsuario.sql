@@ -0,0 +1,22 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_InactivarUsuario: pone el usuario en Estado 'I'
+-- (app/services/user_service.inactivar_usuario_sp, que confirma).
+
+DELIMITER $$
+CREATE PROCEDURE sp_InactivarUsuario(
+    IN  cod VARCHAR(10),
+    OUT msg VARCHAR(255)
+)
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM t_usuario WHERE CodUsu = cod) THEN
+        SET msg = CONCAT('Error: El usuario ', cod, ' no existe.');
+    ELSE
+        UPDATE t_usuario SET Estado = 'I' WHERE CodUsu = cod;
+        SET msg = CONCAT('Usuario ', cod, ' inactivado correctamente.');
+    END IF;
+END $$
+DELIMITER ;
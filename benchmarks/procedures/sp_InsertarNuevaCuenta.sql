@@ -0,0 +1,63 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_InsertarNuevaCuenta: abre una cuenta para el cliente del usuario
+-- p_CodUsu (app/services/account_service.insertar_nueva_cuenta_sp).
+-- NroCta es el siguiente número de 10 dígitos. p_Out_Message empieza por
+-- 'Éxito:' o 'Error:'. Confirma él mismo: el servicio no hace commit.
+
+DELIMITER $$
+CREATE PROCEDURE sp_InsertarNuevaCuenta(
+    IN  p_TipoCta       VARCHAR(2),
+    IN  p_Moneda        VARCHAR(2),
+    IN  p_Saldoni       DECIMAL(10, 2),
+    IN  p_CodUsu        VARCHAR(10),
+    OUT p_Out_NroCta    VARCHAR(20),
+    OUT p_Out_Message   VARCHAR(255)
+)
+proc: BEGIN
+    DECLARE v_CodCliente VARCHAR(10);
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET p_Out_NroCta = NULL;
+
+    SELECT CodCliente INTO v_CodCliente
+    FROM t_cliente
+    WHERE CodUsu = p_CodUsu
+    LIMIT 1;
+
+    IF v_CodCliente IS NULL THEN
+        SET p_Out_Message = 'Error: El usuario no tiene un cliente asociado.';
+        LEAVE proc;
+    END IF;
+
+    IF p_Saldoni IS NULL OR p_Saldoni < 0 THEN
+        SET p_Out_Message = 'Error: El saldo inicial no puede ser negativo.';
+        LEAVE proc;
+    END IF;
+
+    START TRANSACTION;
+
+    -- FOR UPDATE: dos altas simultáneas no reciben el mismo número
+    SELECT LPAD(COALESCE(MAX(CAST(NroCta AS UNSIGNED)), 0) + 1, 10, '0') INTO p_Out_NroCta
+    FROM t_cuentas
+    FOR UPDATE;
+
+    INSERT INTO t_cuentas (
+        NroCta, TipoCta, CodCliente, Moneda, Fech_Apert,
+        Saldoni, SaldAct, SaldoPro, MontoEmbargado, EmbargoTotal, CodUsu, Estado
+    ) VALUES (
+        p_Out_NroCta, p_TipoCta, v_CodCliente, p_Moneda, CURDATE(),
+        p_Saldoni, p_Saldoni, p_Saldoni, 0, FALSE, p_CodUsu, 'A'
+    );
+
+    COMMIT;
+    SET p_Out_Message = CONCAT('Éxito: Cuenta ', p_Out_NroCta, ' creada.');
+END $$
+DELIMITER ;
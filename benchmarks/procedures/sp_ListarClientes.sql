@@ -0,0 +1,28 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ListarClientes: clientes del usuario p_CodUsu, o todos si es NULL
+-- (app/services/clients_service.listar_clientes_sp). Columnas de
+-- ClientePublic; listar_clientes_pagina arma las mismas en Python.
+
+DELIMITER $$
+CREATE PROCEDURE sp_ListarClientes(
+    IN p_CodUsu VARCHAR(10)
+)
+BEGIN
+    SELECT
+        CodCliente,
+        TRIM(CONCAT_WS(' ', Nombres, Apellidos)) AS nombres,
+        'DNI'                                    AS tipo,
+        DNI                                      AS documento,
+        e_mail                                   AS email,
+        Telefonos                                AS telefono,
+        Estado                                   AS estado,
+        CodUsu
+    FROM t_cliente
+    WHERE p_CodUsu IS NULL OR CodUsu = p_CodUsu
+    ORDER BY CodCliente;
+END $$
+DELIMITER ;
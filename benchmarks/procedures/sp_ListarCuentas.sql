@@ -0,0 +1,33 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ListarCuentas: cuentas del usuario p_CodUsu, o todas si es NULL
+-- (app/services/account_service.listar_cuentas_sp). Las columnas son las
+-- de CuentaDetailsDTO; listar_cuentas_pagina repite este SELECT paginado.
+
+DELIMITER $$
+CREATE PROCEDURE sp_ListarCuentas(
+    IN p_CodUsu VARCHAR(10)
+)
+BEGIN
+    SELECT
+        c.NroCta,
+        c.TipoCta,
+        tc.Descripcion AS TipoCuenta,
+        c.CodCliente,
+        c.Moneda,
+        c.Fech_Apert   AS FechaApertura,
+        c.SaldAct      AS SaldoActual,
+        c.SaldoPro     AS SaldoPromedio,
+        c.CodUsu,
+        u.Usuario      AS UsuarioPropietario,
+        c.Estado
+    FROM t_cuentas c
+    LEFT JOIN t_usuario u ON u.CodUsu = c.CodUsu
+    LEFT JOIN t_tipocuentas tc ON tc.TipoCta = c.TipoCta
+    WHERE p_CodUsu IS NULL OR c.CodUsu = p_CodUsu
+    ORDER BY c.NroCta;
+END $$
+DELIMITER ;
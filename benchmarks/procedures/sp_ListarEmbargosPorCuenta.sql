@@ -0,0 +1,23 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ListarEmbargosPorCuenta: embargos de la cuenta, activos y levantados,
+-- del más reciente al más antiguo
+-- (app/services/embargos_service.listar_embargos_por_cuenta_sp).
+-- El parámetro se llama como la columna: dentro del SP `nrocta` es el
+-- parámetro, así que la columna va cualificada (e.NroCta).
+
+DELIMITER $$
+CREATE PROCEDURE sp_ListarEmbargosPorCuenta(
+    IN nrocta VARCHAR(20)
+)
+BEGIN
+    SELECT e.IdEmbargo, e.NroCta, e.TipoEmbargo, e.MontoEmbargado, e.Observaciones,
+           e.FechaRegistro, e.UsrRegistro, e.Estado
+    FROM t_embargos e
+    WHERE e.NroCta = nrocta
+    ORDER BY e.IdEmbargo DESC;
+END $$
+DELIMITER ;
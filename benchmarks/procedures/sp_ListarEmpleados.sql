@@ -0,0 +1,17 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ListarEmpleados: personal del banco (Rol 'A' o 'E'); el servicio se
+-- queda con los 'E' (app/services/user_service.listar_empleados).
+
+DELIMITER $$
+CREATE PROCEDURE sp_ListarEmpleados()
+BEGIN
+    SELECT CodUsu, Usuario, Rol, Estado
+    FROM t_usuario
+    WHERE Rol IN ('A', 'E')
+    ORDER BY CodUsu;
+END $$
+DELIMITER ;
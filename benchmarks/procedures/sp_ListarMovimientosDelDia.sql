@@ -0,0 +1,37 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ListarMovimientosDelDia: movimientos de hoy; el administrador
+-- (p_Rol = 'A') ve los de todo el banco y el resto solo los de sus cuentas
+-- (app/services/movimientos_service.listar_movimientos_del_dia_sp).
+-- Columnas de MovimientoDelDia.
+
+DELIMITER $$
+CREATE PROCEDURE sp_ListarMovimientosDelDia(
+    IN p_CodUsu VARCHAR(10),
+    IN p_Rol    CHAR(1)
+)
+BEGIN
+    SELECT
+        m.Fech_Ope,
+        m.NroCta,
+        m.NroOperNumber,
+        COALESCE(u.Usuario, '')                           AS Usuario,
+        TRIM(CONCAT_WS(' ', cl.Nombres, cl.Apellidos))    AS nombres,
+        COALESCE(tc.Descripcion, m.TipoCta)               AS TipoCuenta,
+        COALESCE(tm.Descrip, m.TipoMov)                   AS TipoMovimiento,
+        m.MonOpe                                          AS Monto,
+        m.Estado                                          AS EstadoMovimiento
+    FROM t_movimientos m
+    JOIN t_cuentas c ON c.NroCta = m.NroCta
+    LEFT JOIN t_usuario u ON u.CodUsu = m.CodUsu
+    LEFT JOIN t_cliente cl ON cl.CodCliente = c.CodCliente
+    LEFT JOIN t_tipocuentas tc ON tc.TipoCta = m.TipoCta
+    LEFT JOIN t_tipomovi tm ON tm.TipoMov = m.TipoMov
+    WHERE m.Fech_Ope = CURDATE()
+      AND (p_Rol = 'A' OR c.CodUsu = p_CodUsu)
+    ORDER BY m.NroCta, m.NroOperNumber;
+END $$
+DELIMITER ;
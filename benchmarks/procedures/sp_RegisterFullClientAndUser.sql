@@ -0,0 +1,78 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_RegisterFullClientAndUser: alta de usuario y cliente en una sola
+-- transacción (app/services/registration_service._registrar_cliente_sp).
+-- p_Password llega ya hasheado con bcrypt. CodUsu y CodCliente son
+-- 'U' / 'C' seguidos de 9 dígitos. p_Out_Message es 'OK' o el error.
+-- Confirma él mismo: el servicio no hace commit.
+
+DELIMITER $$
+CREATE PROCEDURE sp_RegisterFullClientAndUser(
+    IN  p_Usuario           VARCHAR(100),
+    IN  p_Password          VARCHAR(255),
+    IN  p_Rol               CHAR(1),
+    IN  p_Nombres           VARCHAR(100),
+    IN  p_Apellidos         VARCHAR(100),
+    IN  p_DNI               VARCHAR(8),
+    IN  p_Email             VARCHAR(50),
+    IN  p_FechaNac          DATE,
+    IN  p_Direccion         VARCHAR(100),
+    IN  p_CodUbigeo         VARCHAR(6),
+    IN  p_Telefonos         VARCHAR(9),
+    IN  p_Movil             VARCHAR(11),
+    OUT p_Out_CodUsu        VARCHAR(10),
+    OUT p_Out_CodCliente    VARCHAR(10),
+    OUT p_Out_Message       VARCHAR(255)
+)
+proc: BEGIN
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+
+    SET p_Out_CodUsu = NULL, p_Out_CodCliente = NULL;
+
+    IF EXISTS (SELECT 1 FROM t_usuario WHERE Usuario = p_Usuario) THEN
+        SET p_Out_Message = CONCAT('El usuario ''', p_Usuario, ''' ya existe.');
+        LEAVE proc;
+    END IF;
+
+    IF p_DNI IS NOT NULL AND EXISTS (SELECT 1 FROM t_cliente WHERE DNI = p_DNI) THEN
+        SET p_Out_Message = CONCAT('El DNI ', p_DNI, ' ya está registrado.');
+        LEAVE proc;
+    END IF;
+
+    START TRANSACTION;
+
+    -- FOR UPDATE: dos registros simultáneos no reciben el mismo código
+    SELECT CONCAT('U', LPAD(COALESCE(MAX(CAST(SUBSTRING(CodUsu, 2) AS UNSIGNED)), 0) + 1, 9, '0'))
+    INTO p_Out_CodUsu
+    FROM t_usuario
+    WHERE CodUsu REGEXP '^U[0-9]+$'
+    FOR UPDATE;
+
+    SELECT CONCAT('C', LPAD(COALESCE(MAX(CAST(SUBSTRING(CodCliente, 2) AS UNSIGNED)), 0) + 1, 9, '0'))
+    INTO p_Out_CodCliente
+    FROM t_cliente
+    WHERE CodCliente REGEXP '^C[0-9]+$'
+    FOR UPDATE;
+
+    INSERT INTO t_usuario (CodUsu, Usuario, Rol, Estado, HashedPassword, IntentosFallidos)
+    VALUES (p_Out_CodUsu, p_Usuario, p_Rol, 'A', p_Password, 0);
+
+    INSERT INTO t_cliente (
+        CodCliente, Apellidos, Nombres, DNI, Fecha_Nac, Direccion, CodUbigeo,
+        Telefonos, Movil, e_mail, Fech_reg, Estado, CodUsu
+    ) VALUES (
+        p_Out_CodCliente, p_Apellidos, p_Nombres, p_DNI, p_FechaNac, p_Direccion, p_CodUbigeo,
+        p_Telefonos, p_Movil, p_Email, CURDATE(), 'A', p_Out_CodUsu
+    );
+
+    COMMIT;
+    SET p_Out_Message = 'OK';
+END $$
+DELIMITER ;
@@ -0,0 +1,39 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_RegistrarEmbargo: registra un embargo activo sobre la cuenta
+-- (app/services/embargos_service.registrar_embargo_sp). El servicio
+-- recalcula después t_cuentas.MontoEmbargado / EmbargoTotal en la misma
+-- transacción. p_Out_Message empieza por 'Éxito:' o 'Error:'.
+
+DELIMITER $$
+CREATE PROCEDURE sp_RegistrarEmbargo(
+    IN  p_NroCta          VARCHAR(20),
+    IN  p_TipoEmbargo     CHAR(1),
+    IN  p_MontoEmbargado  DECIMAL(10, 2),
+    IN  p_UsrRegistro     VARCHAR(10),
+    OUT p_Out_IdEmbargo   INT,
+    OUT p_Out_Message     VARCHAR(255)
+)
+proc: BEGIN
+    SET p_Out_IdEmbargo = NULL;
+
+    IF NOT EXISTS (SELECT 1 FROM t_cuentas WHERE NroCta = p_NroCta) THEN
+        SET p_Out_Message = CONCAT('Error: La cuenta ', p_NroCta, ' no existe.');
+        LEAVE proc;
+    END IF;
+
+    IF p_TipoEmbargo NOT IN ('T', 'P') THEN
+        SET p_Out_Message = 'Error: El tipo de embargo debe ser T (total) o P (parcial).';
+        LEAVE proc;
+    END IF;
+
+    INSERT INTO t_embargos (NroCta, TipoEmbargo, MontoEmbargado, FechaRegistro, UsrRegistro, Estado)
+    VALUES (p_NroCta, p_TipoEmbargo, p_MontoEmbargado, NOW(), p_UsrRegistro, 'A');
+
+    SET p_Out_IdEmbargo = LAST_INSERT_ID();
+    SET p_Out_Message = CONCAT('Éxito: Embargo ', p_Out_IdEmbargo, ' registrado.');
+END $$
+DELIMITER ;
@@ -0,0 +1,39 @@
+-- SOLO BENCHMARKS: reconstrucción del SP a partir de lo que la aplicación
+-- le pide (parámetros, columnas, mensajes); no es la definición de
+-- producción y no debe aplicarse a ninguna BD con datos reales. Se instala
+-- en el MySQL vacío de los benchmarks (solo CREATE: falla si ya existe).
+--
+-- sp_ValidateUserLogin: datos de login de p_Username
+-- (app/services/user_service._cargar_datos_login). Las columnas son las de
+-- UserFromDB; email, codcliente y nombre_completo salen del cliente del
+-- usuario si lo tiene. p_Out_Message es 'OK' o empieza por 'Error:' (el
+-- servicio rechaza el login). Solo lee: el intento lo registra el servicio.
+
+DELIMITER $$
+CREATE PROCEDURE sp_ValidateUserLogin(
+    IN  p_Username      VARCHAR(100),
+    OUT p_Out_Message   VARCHAR(255)
+)
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM t_usuario WHERE Usuario = p_Username) THEN
+        SET p_Out_Message = CONCAT('Error: El usuario ''', p_Username, ''' no existe.');
+    ELSE
+        SET p_Out_Message = 'OK';
+    END IF;
+
+    SELECT
+        u.CodUsu,
+        u.Usuario,
+        u.HashedPassword,
+        u.Rol,
+        u.Estado,
+        COALESCE(c.e_mail, '')      AS email,
+        COALESCE(c.CodCliente, '')  AS codcliente,
+        TRIM(CONCAT(COALESCE(c.Nombres, ''), ' ', COALESCE(c.Apellidos, ''))) AS nombre_completo
+    FROM t_usuario u
+    LEFT JOIN t_cliente c ON c.CodUsu = u.CodUsu
+    WHERE u.Usuario = p_Username
+    ORDER BY c.CodCliente
+    LIMIT 1;
+END $$
+DELIMITER ;
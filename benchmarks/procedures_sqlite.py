@@ -0,0 +1,287 @@
+# benchmarks/procedures_sqlite.py
+"""
+Emulación de los procedimientos almacenados para SQLite (benchmarks y
+profiling sin MySQL). La aplicación no la carga: cada benchmark la
+registra con registrar_emulacion() como backend "sqlite" de ejecutar_sp
+(uvicorn, con benchmarks.asgi:app), así que los servicios no cambian:
+llaman al SP por su nombre y reciben las mismas filas y variables OUT.
+
+Cada función replica el SP de benchmarks/procedures/<nombre>.sql con consultas
+SQLAlchemy sobre la sesión. Los SP que confirman ellos mismos (START
+TRANSACTION ... COMMIT) se registran con confirma=True y la emulación hace
+session.commit(); el resto queda en la transacción del servicio. Si se
+cambia un SP hay que cambiar aquí su emulación.
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Integer, cast, func, insert, literal, select, update
+from sqlmodel import Session
+
+from app.db.procedures import ProcedureResult, registrar_backend
+from app.models.account import Cuenta, Movimiento
+from app.models.client import Cliente
+from app.models.common import TipoCuenta, TipoMovimiento
+from app.models.embargo import Embargo
+from app.models.user import Usuario
+from app.services.account_service import select_cuentas_detalle
+from app.services.clients_service import COLUMNAS_LISTAR_CLIENTES
+
+# fn(session, params) -> (filas, variables OUT)
+Emulacion = Callable[[Session, Dict[str, Any]], Tuple[List[Dict[str, Any]], Dict[str, Any]]]
+_EMULACIONES: Dict[str, Tuple[Emulacion, bool]] = {}
+
+
+def _sp(nombre: str, confirma: bool = False):
+    def registrar(fn: Emulacion) -> Emulacion:
+        _EMULACIONES[nombre] = (fn, confirma)
+        return fn
+    return registrar
+
+
+def ejecutar_emulado(
+    session: Session, nombre: str, params: Dict[str, Any], out: Sequence[str]
+) -> ProcedureResult:
+    if nombre not in _EMULACIONES:
+        raise NotImplementedError(f"{nombre}: no tiene emulación en SQLite (benchmarks/procedures_sqlite.py).")
+    emulacion, confirma = _EMULACIONES[nombre]
+    filas, valores = emulacion(session, params)
+    if confirma:
+        session.commit()
+    return ProcedureResult(nombre, filas, {o: valores.get(o) for o in out})
+
+
+def registrar_emulacion() -> None:
+    """Registra la emulación como backend "sqlite" de ejecutar_sp."""
+    registrar_backend("sqlite", ejecutar_emulado)
+
+
+def _filas(session: Session, statement) -> List[Dict[str, Any]]:
+    return [dict(f) for f in session.execute(statement).mappings().all()]
+
+
+def _siguiente_codigo(session: Session, columna, prefijo: str, digitos: int) -> str:
+    """prefijo + (mayor sufijo numérico + 1), como los MAX ... FOR UPDATE de los SP."""
+    ultimo = session.execute(
+        select(func.max(cast(func.substr(columna, len(prefijo) + 1), Integer)))
+        .where(columna.like(f"{prefijo}%"))
+    ).scalar()
+    return f"{prefijo}{(ultimo or 0) + 1:0{digitos}d}"
+
+
+# ============================================================
+# CUENTAS
+# ============================================================
+
+@_sp("sp_InsertarNuevaCuenta", confirma=True)
+def _insertar_nueva_cuenta(session: Session, p: Dict[str, Any]):
+    cod_cliente = session.execute(
+        select(Cliente.CodCliente).where(Cliente.CodUsu == p["p_CodUsu"]).limit(1)
+    ).scalar()
+    if cod_cliente is None:
+        return [], {"p_Out_Message": "Error: El usuario no tiene un cliente asociado."}
+    if p["p_Saldoni"] is None or p["p_Saldoni"] < 0:
+        return [], {"p_Out_Message": "Error: El saldo inicial no puede ser negativo."}
+
+    ultima = session.execute(select(func.max(cast(Cuenta.NroCta, Integer)))).scalar()
+    nro_cta = f"{(ultima or 0) + 1:010d}"
+    session.execute(insert(Cuenta.__table__).values(
+        NroCta=nro_cta, TipoCta=p["p_TipoCta"], CodCliente=cod_cliente, Moneda=p["p_Moneda"],
+        Fech_Apert=date.today(), Saldoni=p["p_Saldoni"], SaldAct=p["p_Saldoni"],
+        SaldoPro=p["p_Saldoni"], MontoEmbargado=0, EmbargoTotal=False,
+        CodUsu=p["p_CodUsu"], Estado="A",
+    ))
+    return [], {"p_Out_NroCta": nro_cta, "p_Out_Message": f"Éxito: Cuenta {nro_cta} creada."}
+
+
+@_sp("sp_ListarCuentas")
+def _listar_cuentas(session: Session, p: Dict[str, Any]):
+    statement = select_cuentas_detalle().order_by(Cuenta.NroCta)
+    if p["p_CodUsu"] is not None:
+        statement = statement.where(Cuenta.CodUsu == p["p_CodUsu"])
+    return _filas(session, statement), {}
+
+
+@_sp("sp_ActualizarEstadoCuenta", confirma=True)
+def _actualizar_estado_cuenta(session: Session, p: Dict[str, Any]):
+    nro_cta, estado = p["p_NroCta"], p["p_NuevoEstado"]
+    existe = session.execute(select(Cuenta.NroCta).where(Cuenta.NroCta == nro_cta)).first()
+    if existe is None:
+        return [], {"p_Out_Message": f"Error: La cuenta {nro_cta} no existe."}
+    session.execute(update(Cuenta.__table__).where(Cuenta.NroCta == nro_cta).values(Estado=estado))
+    return [], {"p_Out_Message": f"Éxito: Cuenta {nro_cta} actualizada al estado {estado}."}
+
+
+# ============================================================
+# EMBARGOS
+# ============================================================
+
+@_sp("sp_RegistrarEmbargo")
+def _registrar_embargo(session: Session, p: Dict[str, Any]):
+    nro_cta = p["p_NroCta"]
+    if session.execute(select(Cuenta.NroCta).where(Cuenta.NroCta == nro_cta)).first() is None:
+        return [], {"p_Out_Message": f"Error: La cuenta {nro_cta} no existe."}
+    if p["p_TipoEmbargo"] not in ("T", "P"):
+        return [], {"p_Out_Message": "Error: El tipo de embargo debe ser T (total) o P (parcial)."}
+
+    resultado = session.execute(insert(Embargo.__table__).values(
+        NroCta=nro_cta, TipoEmbargo=p["p_TipoEmbargo"], MontoEmbargado=p["p_MontoEmbargado"],
+        FechaRegistro=datetime.now(), UsrRegistro=p["p_UsrRegistro"], Estado="A",
+    ))
+    id_embargo = resultado.inserted_primary_key[0]
+    return [], {"p_Out_IdEmbargo": id_embargo, "p_Out_Message": f"Éxito: Embargo {id_embargo} registrado."}
+
+
+@_sp("sp_ListarEmbargosPorCuenta")
+def _listar_embargos_por_cuenta(session: Session, p: Dict[str, Any]):
+    statement = (
+        select(
+            Embargo.IdEmbargo, Embargo.NroCta, Embargo.TipoEmbargo, Embargo.MontoEmbargado,
+            Embargo.Observaciones, Embargo.FechaRegistro, Embargo.UsrRegistro, Embargo.Estado,
+        )
+        .where(Embargo.NroCta == p["nrocta"])
+        .order_by(Embargo.IdEmbargo.desc())
+    )
+    return _filas(session, statement), {}
+
+
+# ============================================================
+# MOVIMIENTOS
+# ============================================================
+
+def _select_movimientos():
+    """SELECT común de sp_ListarMovimientosDelDia y sp_GetLastMovements."""
+    return (
+        select(
+            Movimiento.Fech_Ope,
+            Movimiento.NroCta,
+            Movimiento.NroOperNumber,
+            func.coalesce(Usuario.Usuario, "").label("Usuario"),
+            func.trim(
+                func.coalesce(Cliente.Nombres, "") + literal(" ") + func.coalesce(Cliente.Apellidos, "")
+            ).label("nombres"),
+            func.coalesce(TipoCuenta.Descripcion, Movimiento.TipoCta).label("TipoCuenta"),
+            func.coalesce(TipoMovimiento.Descrip, Movimiento.TipoMov).label("TipoMovimiento"),
+            Movimiento.MonOpe.label("Monto"),
+            Movimiento.Estado.label("EstadoMovimiento"),
+        )
+        .join(Cuenta, Cuenta.NroCta == Movimiento.NroCta)
+        .outerjoin(Usuario, Usuario.CodUsu == Movimiento.CodUsu)
+        .outerjoin(Cliente, Cliente.CodCliente == Cuenta.CodCliente)
+        .outerjoin(TipoCuenta, TipoCuenta.TipoCta == Movimiento.TipoCta)
+        .outerjoin(TipoMovimiento, TipoMovimiento.TipoMov == Movimiento.TipoMov)
+    )
+
+
+@_sp("sp_ListarMovimientosDelDia")
+def _listar_movimientos_del_dia(session: Session, p: Dict[str, Any]):
+    statement = (
+        _select_movimientos()
+        .where(Movimiento.Fech_Ope == date.today())
+        .order_by(Movimiento.NroCta, Movimiento.NroOperNumber)
+    )
+    if p["p_Rol"] != "A":
+        statement = statement.where(Cuenta.CodUsu == p["p_CodUsu"])
+    return _filas(session, statement), {}
+
+
+@_sp("sp_GetLastMovements")
+def _ultimos_movimientos(session: Session, p: Dict[str, Any]):
+    statement = (
+        _select_movimientos()
+        .where(Movimiento.NroCta == p["p_NroCta"])
+        .order_by(Movimiento.NroOperNumber.desc())
+        .limit(20)
+    )
+    return _filas(session, statement), {}
+
+
+# ============================================================
+# CLIENTES Y USUARIOS
+# ============================================================
+
+@_sp("sp_ListarClientes")
+def _listar_clientes(session: Session, p: Dict[str, Any]):
+    statement = select(*COLUMNAS_LISTAR_CLIENTES).order_by(Cliente.CodCliente)
+    if p["p_CodUsu"] is not None:
+        statement = statement.where(Cliente.CodUsu == p["p_CodUsu"])
+    return _filas(session, statement), {}
+
+
+@_sp("sp_ValidateUserLogin")
+def _validar_login(session: Session, p: Dict[str, Any]):
+    statement = (
+        select(
+            Usuario.CodUsu,
+            Usuario.Usuario,
+            Usuario.HashedPassword,
+            Usuario.Rol,
+            Usuario.Estado,
+            func.coalesce(Cliente.e_mail, "").label("email"),
+            func.coalesce(Cliente.CodCliente, "").label("codcliente"),
+            func.trim(
+                func.coalesce(Cliente.Nombres, "") + literal(" ") + func.coalesce(Cliente.Apellidos, "")
+            ).label("nombre_completo"),
+        )
+        .outerjoin(Cliente, Cliente.CodUsu == Usuario.CodUsu)
+        .where(Usuario.Usuario == p["p_Username"])
+        .order_by(Cliente.CodCliente)
+        .limit(1)
+    )
+    filas = _filas(session, statement)
+    if not filas:
+        return [], {"p_Out_Message": f"Error: El usuario '{p['p_Username']}' no existe."}
+    return filas, {"p_Out_Message": "OK"}
+
+
+def _listar_usuarios(session: Session, roles: Tuple[str, ...]):
+    statement = (
+        select(Usuario.CodUsu, Usuario.Usuario, Usuario.Rol, Usuario.Estado)
+        .where(Usuario.Rol.in_(roles))
+        .order_by(Usuario.CodUsu)
+    )
+    return _filas(session, statement), {}
+
+
+@_sp("sp_ListarAdministradores")
+def _listar_administradores(session: Session, p: Dict[str, Any]):
+    return _listar_usuarios(session, ("A",))
+
+
+@_sp("sp_ListarEmpleados")
+def _listar_empleados(session: Session, p: Dict[str, Any]):
+    return _listar_usuarios(session, ("A", "E"))
+
+
+@_sp("sp_InactivarUsuario")
+def _inactivar_usuario(session: Session, p: Dict[str, Any]):
+    cod = p["cod"]
+    if session.execute(select(Usuario.CodUsu).where(Usuario.CodUsu == cod)).first() is None:
+        return [], {"msg": f"Error: El usuario {cod} no existe."}
+    session.execute(update(Usuario.__table__).where(Usuario.CodUsu == cod).values(Estado="I"))
+    return [], {"msg": f"Usuario {cod} inactivado correctamente."}
+
+
+@_sp("sp_RegisterFullClientAndUser", confirma=True)
+def _registrar_cliente_y_usuario(session: Session, p: Dict[str, Any]):
+    if session.execute(select(Usuario.CodUsu).where(Usuario.Usuario == p["p_Usuario"])).first():
+        return [], {"p_Out_Message": f"El usuario '{p['p_Usuario']}' ya existe."}
+    if p["p_DNI"] is not None and session.execute(
+        select(Cliente.CodCliente).where(Cliente.DNI == p["p_DNI"])
+    ).first():
+        return [], {"p_Out_Message": f"El DNI {p['p_DNI']} ya está registrado."}
+
+    cod_usu = _siguiente_codigo(session, Usuario.CodUsu, "U", 9)
+    cod_cliente = _siguiente_codigo(session, Cliente.CodCliente, "C", 9)
+    session.execute(insert(Usuario.__table__).values(
+        CodUsu=cod_usu, Usuario=p["p_Usuario"], Rol=p["p_Rol"], Estado="A",
+        HashedPassword=p["p_Password"], IntentosFallidos=0,
+    ))
+    session.execute(insert(Cliente.__table__).values(
+        CodCliente=cod_cliente, Apellidos=p["p_Apellidos"], Nombres=p["p_Nombres"], DNI=p["p_DNI"],
+        Fecha_Nac=p["p_FechaNac"], Direccion=p["p_Direccion"], CodUbigeo=p["p_CodUbigeo"],
+        Telefonos=p["p_Telefonos"], Movil=p["p_Movil"], e_mail=p["p_Email"],
+        Fech_reg=date.today(), Estado="A", CodUsu=cod_usu,
+    ))
+    return [], {"p_Out_CodUsu": cod_usu, "p_Out_CodCliente": cod_cliente, "p_Out_Message": "OK"}
@@ -0,0 +1,17 @@
+-- Contador de NroOperNumber por cuenta (ver app/services/secuencia_service.py).
+-- Sustituye el "ORDER BY NroOperNumber DESC LIMIT 1" sobre t_movimientos.
+
+CREATE TABLE IF NOT EXISTS t_secuencia_oper (
+    NroCta      VARCHAR(20) NOT NULL,
+    UltNroOper  INT         NOT NULL DEFAULT 0,
+    PRIMARY KEY (NroCta),
+    CONSTRAINT fk_secuencia_oper_cuenta FOREIGN KEY (NroCta) REFERENCES t_cuentas (NroCta)
+) ENGINE = InnoDB;
+
+-- Carga inicial con el último número usado por cada cuenta.
+INSERT INTO t_secuencia_oper (NroCta, UltNroOper)
+SELECT c.NroCta, COALESCE(MAX(m.NroOperNumber), 0)
+FROM t_cuentas c
+LEFT JOIN t_movimientos m ON m.NroCta = c.NroCta
+GROUP BY c.NroCta
+ON DUPLICATE KEY UPDATE UltNroOper = GREATEST(UltNroOper, VALUES(UltNroOper));
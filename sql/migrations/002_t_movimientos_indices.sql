@@ -0,0 +1,14 @@
+-- Índices del historial paginado de movimientos (ver movimientos_service.listar_historial).
+-- La PK (TipoCta, NroCta, NroOperNumber) no sirve para "WHERE NroCta = ?"
+-- porque empieza por TipoCta; estos índices hacen de cada página un
+-- range scan sobre la cuenta, sin importar lo profundo del historial.
+
+-- Sin filtros: WHERE NroCta = ? AND NroOperNumber < ? ORDER BY NroOperNumber DESC
+CREATE INDEX ix_mov_cta_oper ON t_movimientos (NroCta, NroOperNumber);
+
+-- Rango de fechas: WHERE NroCta = ? AND Fech_Ope BETWEEN ? AND ?
+--                  ORDER BY Fech_Ope DESC, NroOperNumber DESC
+CREATE INDEX ix_mov_cta_fecha_oper ON t_movimientos (NroCta, Fech_Ope, NroOperNumber);
+
+-- Tipo de movimiento: WHERE NroCta = ? AND TipoMov = ? AND NroOperNumber < ?
+CREATE INDEX ix_mov_cta_tipo_oper ON t_movimientos (NroCta, TipoMov, NroOperNumber);
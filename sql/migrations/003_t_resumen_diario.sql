@@ -0,0 +1,29 @@
+-- Resumen diario de movimientos (ver app/services/resumen_service.py).
+-- Se acumula en la misma transacción que inserta en t_movimientos.
+-- Las filas NroCta = '*0'..'*15' son el total del banco en RESUMEN_SHARDS
+-- (16) fragmentos: CRC32(NroCta) % 16, igual que fragmento_global().
+
+CREATE TABLE IF NOT EXISTS t_resumen_diario (
+    Fecha     DATE           NOT NULL,
+    NroCta    VARCHAR(20)    NOT NULL,
+    TipoMov   VARCHAR(2)     NOT NULL,
+    Cantidad  INT            NOT NULL DEFAULT 0,
+    Total     DECIMAL(14, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (Fecha, NroCta, TipoMov)
+) ENGINE = InnoDB;
+
+-- Carga inicial desde el historial existente: por cuenta...
+INSERT INTO t_resumen_diario (Fecha, NroCta, TipoMov, Cantidad, Total)
+SELECT Fech_Ope, NroCta, TipoMov, COUNT(*), COALESCE(SUM(MonOpe), 0)
+FROM t_movimientos
+WHERE Fech_Ope IS NOT NULL AND TipoMov IS NOT NULL
+GROUP BY Fech_Ope, NroCta, TipoMov
+ON DUPLICATE KEY UPDATE Cantidad = VALUES(Cantidad), Total = VALUES(Total);
+
+-- ...y fragmentos del total del banco.
+INSERT INTO t_resumen_diario (Fecha, NroCta, TipoMov, Cantidad, Total)
+SELECT Fech_Ope, CONCAT('*', CRC32(NroCta) % 16), TipoMov, COUNT(*), COALESCE(SUM(MonOpe), 0)
+FROM t_movimientos
+WHERE Fech_Ope IS NOT NULL AND TipoMov IS NOT NULL
+GROUP BY Fech_Ope, CONCAT('*', CRC32(NroCta) % 16), TipoMov
+ON DUPLICATE KEY UPDATE Cantidad = VALUES(Cantidad), Total = VALUES(Total);
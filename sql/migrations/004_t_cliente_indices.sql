@@ -0,0 +1,10 @@
+-- Índices de la búsqueda de clientes (ver clients_service.buscar_clientes).
+-- Cada búsqueda es "WHERE col = ?" o "WHERE col LIKE 'texto%'" ordenada por
+-- (col, CodCliente): un range scan sobre el índice que se corta en LIMIT.
+-- Con la collation por defecto (utf8mb4_0900_ai_ci / _general_ci) la
+-- comparación ya ignora mayúsculas y tildes y el LIKE por prefijo usa el índice.
+
+CREATE INDEX ix_cli_dni       ON t_cliente (DNI, CodCliente);
+CREATE INDEX ix_cli_apellidos ON t_cliente (Apellidos, CodCliente);
+CREATE INDEX ix_cli_nombres   ON t_cliente (Nombres, CodCliente);
+CREATE INDEX ix_cli_email     ON t_cliente (e_mail, CodCliente);
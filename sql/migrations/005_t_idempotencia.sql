@@ -0,0 +1,20 @@
+-- Respuestas guardadas por Idempotency-Key (ver app/services/idempotencia_service.py).
+-- StatusCode NULL = operación en curso con esa clave.
+
+CREATE TABLE IF NOT EXISTS t_idempotencia (
+    Endpoint       VARCHAR(30)  NOT NULL,
+    Clave          VARCHAR(100) NOT NULL,
+    HashPeticion   CHAR(64)     NOT NULL,
+    StatusCode     INT          NULL,
+    Respuesta      TEXT         NULL,
+    FechaCreacion  DATETIME     NOT NULL,
+    PRIMARY KEY (Endpoint, Clave),
+    KEY ix_idem_fecha (FechaCreacion)
+) ENGINE = InnoDB;
+
+-- Las claves vencidas (IDEMPOTENCY_TTL, 24 h por defecto) se reutilizan al
+-- llegar de nuevo; esta purga solo acota el tamaño de la tabla.
+-- Requiere event_scheduler = ON.
+CREATE EVENT IF NOT EXISTS ev_purgar_idempotencia
+    ON SCHEDULE EVERY 1 HOUR
+    DO DELETE FROM t_idempotencia WHERE FechaCreacion < NOW() - INTERVAL 2 DAY;
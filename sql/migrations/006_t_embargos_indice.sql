@@ -0,0 +1,4 @@
+-- Embargos activos de una cuenta (ver embargos_service.recalcular_embargo_cuenta):
+-- índice por (NroCta, Estado) para no recorrer t_embargos.
+
+CREATE INDEX ix_emb_cta_estado ON t_embargos (NroCta, Estado);
@@ -0,0 +1,22 @@
+-- Embargos activos agregados en la propia cuenta (ver
+-- embargos_service.recalcular_embargo_cuenta): depósitos, retiros y
+-- transferencias leen MontoEmbargado/EmbargoTotal de la fila que ya
+-- bloquean en vez de sumar t_embargos en cada operación.
+-- La API los recalcula al registrar o levantar un embargo; un cambio en
+-- t_embargos hecho fuera de ella debe repetir el UPDATE de abajo.
+
+ALTER TABLE t_cuentas
+    ADD COLUMN MontoEmbargado DECIMAL(12,2) NOT NULL DEFAULT 0,
+    ADD COLUMN EmbargoTotal   TINYINT(1)    NOT NULL DEFAULT 0;
+
+UPDATE t_cuentas c
+SET c.MontoEmbargado = (
+        SELECT COALESCE(SUM(e.MontoEmbargado), 0)
+        FROM t_embargos e
+        WHERE e.NroCta = c.NroCta AND e.Estado = 'A' AND e.TipoEmbargo = 'P'
+    ),
+    c.EmbargoTotal = EXISTS (
+        SELECT 1
+        FROM t_embargos e
+        WHERE e.NroCta = c.NroCta AND e.Estado = 'A' AND e.TipoEmbargo = 'T'
+    );
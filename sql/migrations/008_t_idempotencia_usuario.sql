@@ -0,0 +1,10 @@
+-- Idempotency-Key por usuario (ver app/services/idempotencia_service.py):
+-- la misma clave enviada por dos usuarios son dos operaciones distintas, y
+-- nadie puede repetir ni bloquear la respuesta guardada de otro.
+-- Las filas anteriores quedan con CodUsu '' y no coinciden con ninguna
+-- petición nueva: se reutilizan o purgan como claves vencidas.
+
+ALTER TABLE t_idempotencia
+    ADD COLUMN CodUsu VARCHAR(10) NOT NULL DEFAULT '' AFTER Endpoint,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (Endpoint, CodUsu, Clave);